@@ -24,6 +24,13 @@ if config.config_file_name is not None:
 target_metadata = ThunderboltModel.metadata
 config.set_main_option("sqlalchemy.url", get_sync_db_uri_from_env())
 
+# Postgres only objects managed by hand written migrations, not by the models
+UNMAPPED_OBJECTS = {'search_vector', 'ix_post_search_vector', 'ix_thread_search_vector'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in UNMAPPED_OBJECTS)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +55,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -69,7 +77,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,24 @@
+"""Add user token version
+
+Revision ID: 5f2a9c1d7e34
+Revises: c39dc812b7bb
+Create Date: 2026-10-18 10:12:41.208733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2a9c1d7e34'
+down_revision = 'c39dc812b7bb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'token_version')
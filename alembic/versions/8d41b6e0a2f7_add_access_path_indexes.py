@@ -0,0 +1,39 @@
+"""Add access path indexes
+
+Revision ID: 8d41b6e0a2f7
+Revises: 5f2a9c1d7e34
+Create Date: 2026-10-18 11:02:17.530114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e0a2f7'
+down_revision = '5f2a9c1d7e34'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_thread_topic_id_created_at_id', 'thread', ['topic_id', 'created_at', 'id']),
+    ('ix_post_thread_id_created_at_id', 'post', ['thread_id', 'created_at', 'id']),
+    ('ix_post_user_id_created_at_id', 'post', ['user_id', 'created_at', 'id']),
+    ('ix_shop_details_seller_id', 'shop_details', ['seller_id']),
+    ('ix_product_shop_id_created_at_id', 'product', ['shop_id', 'created_at', 'id']),
+    ('ix_product_cart_user_id_product_id', 'product_cart', ['user_id', 'product_id']),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so the forum stays writable while large tables are indexed
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,52 @@
+"""Add tags
+
+Revision ID: a7c2e9f41b86
+Revises: c4e1b8a96d23
+Create Date: 2026-10-18 19:14:08.312547
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c2e9f41b86'
+down_revision = 'c4e1b8a96d23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('tag',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('post_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index('ix_tag_name', 'tag', ['name'], unique=True)
+    op.create_index('ix_tag_post_count_id', 'tag', ['post_count', 'id'], unique=False)
+    op.create_table('post_tags',
+    sa.Column('post_id', sa.UUID(), nullable=False),
+    sa.Column('tag_id', sa.UUID(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], ),
+    sa.ForeignKeyConstraint(['tag_id'], ['tag.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index('ix_post_tags_tag_id_post_id', 'post_tags', ['tag_id', 'post_id'], unique=True)
+    op.create_index('ix_post_tags_post_id_tag_id', 'post_tags', ['post_id', 'tag_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_tags_post_id_tag_id', table_name='post_tags')
+    op.drop_index('ix_post_tags_tag_id_post_id', table_name='post_tags')
+    op.drop_table('post_tags')
+    op.drop_index('ix_tag_post_count_id', table_name='tag')
+    op.drop_index('ix_tag_name', table_name='tag')
+    op.drop_table('tag')
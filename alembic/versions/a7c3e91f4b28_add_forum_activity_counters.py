@@ -0,0 +1,81 @@
+"""Add forum activity counters
+
+Revision ID: a7c3e91f4b28
+Revises: 8d41b6e0a2f7
+Create Date: 2026-10-18 11:48:05.914372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91f4b28'
+down_revision = '8d41b6e0a2f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ('topic', 'thread'):
+        op.add_column(table, sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('last_post_id', sa.UUID(), nullable=True))
+    op.add_column('topic', sa.Column('last_post_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('thread', sa.Column('last_post_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+
+    op.execute("""
+        UPDATE thread SET
+            post_count = stats.post_count,
+            last_post_at = stats.last_post_at,
+            last_post_id = stats.last_post_id
+        FROM (
+            SELECT DISTINCT ON (thread_id)
+                thread_id,
+                count(*) OVER (PARTITION BY thread_id) AS post_count,
+                created_at AS last_post_at,
+                id AS last_post_id
+            FROM post
+            ORDER BY thread_id, created_at DESC, id DESC
+        ) AS stats
+        WHERE thread.id = stats.thread_id
+    """)
+    op.execute("UPDATE thread SET last_post_at = coalesce(created_at, now()) WHERE last_post_at IS NULL")
+    op.alter_column('thread', 'last_post_at', nullable=False)
+
+    op.execute("""
+        UPDATE topic SET
+            post_count = stats.post_count,
+            last_post_at = stats.last_post_at,
+            last_post_id = stats.last_post_id
+        FROM (
+            SELECT DISTINCT ON (topic_id)
+                topic_id,
+                sum(post_count) OVER (PARTITION BY topic_id) AS post_count,
+                last_post_at,
+                last_post_id
+            FROM thread
+            WHERE last_post_id IS NOT NULL
+            ORDER BY topic_id, last_post_at DESC, id DESC
+        ) AS stats
+        WHERE topic.id = stats.topic_id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_thread_topic_id_last_post_at_id', 'thread', ['topic_id', 'last_post_at', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_thread_last_post_at_id', 'thread', ['last_post_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_thread_last_post_at_id', table_name='thread', postgresql_concurrently=True)
+        op.drop_index('ix_thread_topic_id_last_post_at_id', table_name='thread', postgresql_concurrently=True)
+    for table in ('thread', 'topic'):
+        op.drop_column(table, 'last_post_at')
+        op.drop_column(table, 'last_post_id')
+        op.drop_column(table, 'post_count')
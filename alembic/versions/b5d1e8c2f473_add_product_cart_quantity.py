@@ -0,0 +1,47 @@
+"""Add product cart quantity
+
+Revision ID: b5d1e8c2f473
+Revises: e2b7d4a93c10
+Create Date: 2026-10-18 15:10:42.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d1e8c2f473'
+down_revision = 'e2b7d4a93c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('product_cart', sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+
+    # A product added several times was stored as several rows, merge them
+    op.execute("""
+        UPDATE product_cart SET quantity = duplicates.quantity
+        FROM (
+            SELECT min(id::text)::uuid AS id, count(*) AS quantity
+            FROM product_cart
+            GROUP BY user_id, product_id
+            HAVING count(*) > 1
+        ) AS duplicates
+        WHERE product_cart.id = duplicates.id
+    """)
+    op.execute("""
+        DELETE FROM product_cart
+        WHERE id NOT IN (SELECT min(id::text)::uuid FROM product_cart GROUP BY user_id, product_id)
+    """)
+
+    op.drop_index('ix_product_cart_user_id_product_id', table_name='product_cart')
+    op.create_index('ix_product_cart_user_id_product_id', 'product_cart', ['user_id', 'product_id'], unique=True)
+    op.create_check_constraint('ck_product_cart_quantity_positive', 'product_cart', 'quantity > 0')
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_product_cart_quantity_positive', 'product_cart', type_='check')
+    op.drop_index('ix_product_cart_user_id_product_id', table_name='product_cart')
+    op.create_index('ix_product_cart_user_id_product_id', 'product_cart', ['user_id', 'product_id'])
+    op.drop_column('product_cart', 'quantity')
@@ -0,0 +1,55 @@
+"""Add forum search vectors
+
+Revision ID: c4e8f2a61d95
+Revises: a7c3e91f4b28
+Create Date: 2026-10-18 12:21:43.208516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8f2a61d95'
+down_revision = 'a7c3e91f4b28'
+branch_labels = None
+depends_on = None
+
+
+# The text search configuration must match `SEARCH_CONFIG` in
+# thunderbolt/forum/repository/search.py
+SEARCH_VECTORS = (
+    ('post', 'title', 'content'),
+    ('thread', 'title', 'description'),
+)
+
+
+def upgrade() -> None:
+    for table, title, body in SEARCH_VECTORS:
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                f"setweight(to_tsvector('simple'::regconfig, coalesce({title}, '')), 'A') || "
+                f"setweight(to_tsvector('simple'::regconfig, coalesce({body}, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ))
+
+    # Built concurrently so the forum stays writable while large tables are indexed
+    with op.get_context().autocommit_block():
+        for table, _, _ in SEARCH_VECTORS:
+            op.create_index(
+                f'ix_{table}_search_vector', table, ['search_vector'],
+                postgresql_using='gin', postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, _, _ in reversed(SEARCH_VECTORS):
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_concurrently=True)
+    for table, _, _ in reversed(SEARCH_VECTORS):
+        op.drop_column(table, 'search_vector')
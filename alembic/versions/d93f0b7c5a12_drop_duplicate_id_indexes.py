@@ -0,0 +1,49 @@
+"""Drop duplicate id indexes
+
+Revision ID: d93f0b7c5a12
+Revises: a7c2e9f41b86
+Create Date: 2026-10-18 20:03:51.904216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd93f0b7c5a12'
+down_revision = 'a7c2e9f41b86'
+branch_labels = None
+depends_on = None
+
+
+# Every table of a ThunderboltModel had a unique constraint on id next to its
+# primary key, that is a second index maintained on every insert. Existing
+# ids are kept as they are: they are still valid UUIDs, new rows get UUIDv7
+# ids from the application, see thunderbolt/core/ids.py
+TABLES = (
+    'admin_group',
+    'currency',
+    'group',
+    'job',
+    'payment',
+    'post',
+    'post_tags',
+    'product',
+    'product_cart',
+    'shop_details',
+    'tag',
+    'thread',
+    'topic',
+    'user',
+)
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # Tables created outside of migrations may not have the constraint
+        op.execute(sa.text(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{table}_id_key"'))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.create_unique_constraint(f'{table}_id_key', table, ['id'])
@@ -0,0 +1,36 @@
+"""Add product catalogue indexes
+
+Revision ID: e2b7d4a93c10
+Revises: c4e8f2a61d95
+Create Date: 2026-10-18 14:02:17.531846
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7d4a93c10'
+down_revision = 'c4e8f2a61d95'
+branch_labels = None
+depends_on = None
+
+
+CATALOGUE_INDEXES = (
+    ('ix_product_shop_id_price_id', ['shop_id', 'price', 'id']),
+    ('ix_product_price_id', ['price', 'id']),
+    ('ix_product_created_at_id', ['created_at', 'id']),
+    ('ix_product_currency_id', ['currency_id']),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so the catalogue stays writable while it is indexed
+    with op.get_context().autocommit_block():
+        for name, columns in CATALOGUE_INDEXES:
+            op.create_index(name, 'product', columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(CATALOGUE_INDEXES):
+            op.drop_index(name, table_name='product', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""Add payment
+
+Revision ID: f81a3c6d2e57
+Revises: b5d1e8c2f473
+Create Date: 2026-10-18 18:02:37.554190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f81a3c6d2e57'
+down_revision = 'b5d1e8c2f473'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('payment',
+    sa.Column('provider_payment_id', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('paid', sa.Boolean(), nullable=False),
+    sa.Column('amount', sa.DECIMAL(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index('ix_payment_provider_payment_id', 'payment', ['provider_payment_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_provider_payment_id', table_name='payment')
+    op.drop_table('payment')
@@ -0,0 +1,3 @@
+"""
+Benchmarks of the API hot paths, see `benchmarks.run`.
+"""
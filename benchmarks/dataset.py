@@ -0,0 +1,220 @@
+
+"""
+Deterministic synthetic dataset.
+
+The same scale and seed always produce the same rows, ids included, so runs of
+the benchmark against different revisions read identical data. At scale 1:
+
+- 2 000 users, all with the password `PASSWORD`
+- 20 topics and 4 000 threads
+- about 100 000 posts, spread over threads and users along a Pareto
+  distribution: a few hot threads hold most posts, most threads a handful
+- 3 currencies, 200 shops and 50 000 products, shop sizes skewed the same way
+
+Rows are written through the bulk repository operations, so the activity
+counters of threads and topics are consistent with the posts.
+"""
+
+import uuid
+import random
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from werkzeug.security import generate_password_hash
+
+from thunderbolt.core.ids import uuid7_at
+from thunderbolt.core.settings import get_settings
+from thunderbolt.models import Currency, Post, Product, Thread, Topic, User
+from thunderbolt.forum.repository.post import PostRepository
+from thunderbolt.forum.repository.thread import ThreadRepository
+from thunderbolt.forum.repository.topic import TopicRepository
+from thunderbolt.market.repository.product import ProductRepository
+from thunderbolt.market.repository.shop import ShopDetailsRepository
+from thunderbolt.users.repository import UserRepository
+
+
+settings = get_settings()
+
+PASSWORD = 'benchmark'
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+# Row counts at scale 1
+USERS = 2_000
+TOPICS = 20
+THREADS = 4_000
+POSTS = 100_000
+SHOPS = 200
+PRODUCTS = 50_000
+CURRENCIES = (('RUB', '₽'), ('USD', '$'), ('EUR', '€'))
+
+
+@dataclass
+class Dataset:
+    """
+    Ids of the generated rows the benchmark scenarios draw from.
+
+    Threads and shops are ordered from the largest to the smallest.
+    """
+    usernames: list[str] = field(default_factory=list)
+    topic_ids: list[uuid.UUID] = field(default_factory=list)
+    thread_ids: list[uuid.UUID] = field(default_factory=list)
+    shop_ids: list[uuid.UUID] = field(default_factory=list)
+    currency_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+class _Generator:
+
+    def __init__(self, scale: float, seed: int) -> None:
+        self.scale = scale
+        self.rng = random.Random(seed)
+
+    def count(self, base: int) -> int:
+        return max(1, round(base * self.scale))
+
+    def uuid(self, created_at: datetime) -> uuid.UUID:
+        # Time ordered like the ids the application creates
+        return uuid7_at(created_at, self.rng.getrandbits(74))
+
+    def timestamp(self) -> datetime:
+        return EPOCH + timedelta(seconds=self.rng.randrange(365 * 24 * 3600))
+
+    def skewed_weights(self, n: int) -> list[float]:
+        # Pareto weights, sorted so the first items are the hottest
+        return sorted((self.rng.paretovariate(1.2) for _ in range(n)), reverse=True)
+
+    def text(self, words: int) -> str:
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+
+WORDS = (
+    'aileron', 'altitude', 'bank', 'cockpit', 'drag', 'engine', 'flap', 'fuselage', 'glide', 'hangar',
+    'landing', 'lift', 'pitch', 'propeller', 'radar', 'roll', 'rudder', 'runway', 'stall', 'throttle',
+    'thrust', 'turbine', 'wing', 'yaw', 'canopy', 'squadron', 'sortie', 'escort', 'bomber', 'fighter',
+)
+
+
+def _row(generator: _Generator, **values) -> dict:
+    created_at = generator.timestamp()
+    return {'id': generator.uuid(created_at), 'created_at': created_at, 'updated_at': created_at, **values}
+
+
+async def generate_dataset(session: AsyncSession, scale: float = 1.0, seed: int = 0) -> Dataset:
+    """
+    Write the dataset and commit it.
+
+    Args:
+        session (AsyncSession): Session of the target database, with the schema created.
+        scale (float): Multiplier of every row count.
+        seed (int): Seed of the generator.
+
+    Returns:
+        Dataset: Ids of the generated rows, see `load_dataset`.
+    """
+    generator = _Generator(scale, seed)
+
+    # Hashing once keeps generation fast, logins still verify a real hash
+    hashed_password = generate_password_hash(PASSWORD, method=settings.HASH_METHOD, salt_length=settings.SALT_LENGTH)
+    users = [
+        _row(
+            generator,
+            username=f'user{i}',
+            email=f'user{i}@thunderbolt.test',
+            name=f'User {i}',
+            hashed_password=hashed_password,
+        )
+        for i in range(generator.count(USERS))
+    ]
+    await UserRepository(session).add_many(users)
+
+    topics = [
+        _row(generator, symbol=f'T{i:02d}', title=f'Topic {i}', description=generator.text(12))
+        for i in range(min(generator.count(TOPICS), 100))
+    ]
+    await TopicRepository(session).add_many(topics)
+    topic_ids = [topic['id'] for topic in topics]
+
+    threads = [
+        _row(
+            generator,
+            topic_id=generator.rng.choice(topic_ids),
+            title=generator.text(5),
+            description=generator.text(20),
+        )
+        for _ in range(generator.count(THREADS))
+    ]
+    await ThreadRepository(session).add_many(threads)
+    thread_ids = [thread['id'] for thread in threads]
+
+    user_ids = [user['id'] for user in users]
+    posters = generator.rng.choices(user_ids, weights=generator.skewed_weights(len(user_ids)), k=generator.count(POSTS))
+    post_threads = generator.rng.choices(
+        thread_ids, weights=generator.skewed_weights(len(thread_ids)), k=len(posters),
+    )
+    posts = [
+        _row(generator, thread_id=thread_id, user_id=user_id, title=generator.text(6), content=generator.text(60))
+        for thread_id, user_id in zip(post_threads, posters)
+    ]
+    await PostRepository(session).add_many(posts)
+
+    currencies = [_row(generator, name=name, symbol=symbol) for name, symbol in CURRENCIES]
+    await session.execute(insert(Currency), currencies)
+    currency_ids = [currency['id'] for currency in currencies]
+
+    shops = [
+        _row(generator, seller_id=generator.rng.choice(user_ids), name=f'Shop {i}', description=generator.text(12))
+        for i in range(generator.count(SHOPS))
+    ]
+    await ShopDetailsRepository(session).add_many(shops)
+    shop_ids = [shop['id'] for shop in shops]
+
+    product_shops = generator.rng.choices(
+        shop_ids, weights=generator.skewed_weights(len(shop_ids)), k=generator.count(PRODUCTS),
+    )
+    products = [
+        _row(
+            generator,
+            shop_id=shop_id,
+            name=generator.text(3),
+            image_url=f'https://cdn.thunderbolt.test/products/{i}.png',
+            description=generator.text(30),
+            price=Decimal(generator.rng.randrange(100, 1_000_000)) / 100,
+            currency_id=generator.rng.choice(currency_ids),
+        )
+        for i, shop_id in enumerate(product_shops)
+    ]
+    await ProductRepository(session).add_many(products)
+
+    await session.commit()
+    return await load_dataset(session)
+
+
+async def load_dataset(session: AsyncSession) -> Dataset:
+    """
+    Read the ids of an already generated dataset.
+
+    Args:
+        session (AsyncSession): Session of the target database.
+
+    Returns:
+        Dataset: Ids of the rows, empty if nothing was generated.
+    """
+    dataset = Dataset()
+    dataset.usernames = list((await session.execute(select(User.username).order_by(User.username))).scalars())
+    dataset.topic_ids = list((await session.execute(select(Topic.id).order_by(Topic.symbol))).scalars())
+    dataset.thread_ids = list((await session.execute(
+        select(Thread.id).order_by(Thread.post_count.desc(), Thread.id)
+    )).scalars())
+    dataset.shop_ids = list((await session.execute(
+        select(Product.shop_id).group_by(Product.shop_id).order_by(func.count().desc(), Product.shop_id)
+    )).scalars())
+    dataset.currency_ids = list((await session.execute(select(Currency.id).order_by(Currency.name))).scalars())
+    return dataset
+
+
+async def is_generated(session: AsyncSession) -> bool:
+    result = await session.execute(select(Post.id).limit(1))
+    return result.first() is not None
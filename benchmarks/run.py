@@ -0,0 +1,301 @@
+
+"""
+Benchmark of the API hot paths.
+
+Drives the real `thunderbolt.main.app` against a generated dataset, see
+`benchmarks.dataset`, either in-process through the ASGI interface, measuring
+the application alone, or through a local uvicorn server, adding the HTTP
+stack:
+
+    python -m benchmarks.run --database-uri sqlite+aiosqlite:///./bench.db --scale 0.1
+    python -m benchmarks.run --mode http --concurrency 32 --output after.json --baseline before.json
+
+The dataset is generated on the first run and reused afterwards. Every
+scenario reports latency percentiles and throughput; results are saved as JSON
+and, given a baseline, compared with it. The run fails when the p95 latency or
+the throughput of a scenario regressed by more than the tolerance. The load is
+generated by the same process as the server in http mode, compare runs of the
+same mode only.
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+
+from pathlib import Path
+from datetime import datetime, timezone
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+# Add the thunderbolt package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import uvicorn
+
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from thunderbolt.core.session import create_engine_from_settings, get_session
+from thunderbolt.core.settings import get_settings
+from thunderbolt.main import app
+from thunderbolt.models.base import ThunderboltModel
+
+from benchmarks.dataset import PASSWORD, Dataset, generate_dataset, is_generated, load_dataset
+
+
+settings = get_settings()
+
+# A request of a scenario: method, url and httpx keyword arguments
+Request = tuple[str, str, dict]
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[Dataset, random.Random], Request]
+
+
+def _skewed(rng: random.Random, items: list) -> Any:
+    # Readers favor the largest threads and shops, as writers do
+    return items[min(int(rng.paretovariate(1.2)) - 1, len(items) - 1)]
+
+
+SCENARIOS = (
+    Scenario('token', lambda dataset, rng: (
+        'POST', '/token', {'data': {'username': rng.choice(dataset.usernames), 'password': PASSWORD}},
+    )),
+    Scenario('thread_listing', lambda dataset, rng: (
+        'GET', '/forum/threads/active', {'params': {'topic_id': str(rng.choice(dataset.topic_ids))}},
+    )),
+    Scenario('post_listing', lambda dataset, rng: (
+        'GET', f'/forum/topics/threads/{_skewed(rng, dataset.thread_ids)}/posts', {},
+    )),
+    Scenario('product_listing', lambda dataset, rng: (
+        'GET', '/market/products', {'params': {'shop_id': str(_skewed(rng, dataset.shop_ids)), 'sort': 'price'}},
+    )),
+)
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    seed: int,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> ScenarioResult:
+    """
+    Send the requests of a scenario from `concurrency` concurrent workers.
+
+    Returns:
+        ScenarioResult: Latency percentiles of the successful requests and throughput.
+    """
+    rng = random.Random(f'{seed}:{scenario.name}')
+    planned = [scenario.build(dataset, rng) for _ in range(warmup + requests)]
+    for method, url, kwargs in planned[:warmup]:
+        await client.request(method, url, **kwargs)
+
+    queue = iter(planned[warmup:])
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for method, url, kwargs in queue:
+            started_at = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - started_at
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started_at
+
+    latencies.sort()
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        mean_ms=round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        throughput_rps=round(requests / wall, 1),
+    )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    Find the scenarios that regressed against a baseline run.
+
+    Args:
+        baseline (dict): Results of the baseline run.
+        current (dict): Results of this run.
+        tolerance (float): Allowed relative regression, e.g. 0.1 for 10%.
+
+    Returns:
+        list[str]: Descriptions of the regressions.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {result['throughput_rps']} req/s")
+    return regressions
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def prepare(engine: AsyncEngine, scale: float, seed: int) -> Dataset:
+    async with engine.begin() as conn:
+        await conn.run_sync(ThunderboltModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        if await is_generated(session):
+            return await load_dataset(session)
+        print(f'Generating the dataset at scale {scale}...', file=sys.stderr)
+        return await generate_dataset(session, scale, seed)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    engine = create_engine_from_settings(settings, args.database_uri)
+    dataset = await prepare(engine, args.scale, args.seed)
+
+    # Routes read and write the benchmark database, whatever the settings say
+    BenchmarkSession = sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def get_benchmark_session() -> AsyncSession:
+        async with BenchmarkSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_benchmark_session
+
+    server = None
+    if args.mode == 'asgi':
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://benchmark')
+    else:
+        port = _free_port()
+        config = uvicorn.Config(app, host='127.0.0.1', port=port, lifespan='off', log_level='warning', access_log=False)
+        server = uvicorn.Server(config)
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', limits=limits)
+
+    selected = [scenario for scenario in SCENARIOS if not args.scenario or scenario.name in args.scenario]
+    results = {}
+    try:
+        for scenario in selected:
+            result = await run_scenario(
+                client, scenario, dataset, args.seed, args.requests, args.concurrency, args.warmup,
+            )
+            results[scenario.name] = asdict(result)
+            print(
+                f'{scenario.name:<16} p50 {result.p50_ms:>9.3f}ms  p95 {result.p95_ms:>9.3f}ms  '
+                f'p99 {result.p99_ms:>9.3f}ms  {result.throughput_rps:>8.1f} req/s  {result.errors} errors',
+                file=sys.stderr,
+            )
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.should_exit = True
+            await server_task
+        app.dependency_overrides.pop(get_session, None)
+        await engine.dispose()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'database': engine.dialect.name,
+            'mode': args.mode,
+            'scale': args.scale,
+            'seed': args.seed,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+        },
+        'scenarios': results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the API hot paths.')
+    parser.add_argument('--database-uri', default=settings.DATABASE_URI, help='Database to generate the dataset into')
+    parser.add_argument('--scale', type=float, default=1.0, help='Dataset size multiplier')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the dataset and of the requests')
+    parser.add_argument('--mode', choices=('asgi', 'http'), default='asgi', help='Drive the app in-process or over HTTP')
+    parser.add_argument('--requests', type=int, default=1000, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=50, help='Unmeasured requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS])
+    parser.add_argument('--output', type=Path, help='Save the results as JSON')
+    parser.add_argument('--baseline', type=Path, help='Results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(json.loads(args.baseline.read_text()), results, args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,31 @@
 
-from .transactions import test_user_repo
+from .transactions import test_user_repo, test_post_repo, test_search_repo, test_bulk_repo, test_product_repo, test_cart_repo, test_payment_repo, test_tag_repo
+from .core import test_pagination, test_cache, test_hashing, test_pool, test_session_routing, test_checks, test_yookassa_client, test_search, test_serialization, test_http_cache, test_broadcast, test_dataloader, test_metrics, test_diagnostics, test_pricing, test_jobs, test_ids
 
 __all__ = (
     'test_user_repo',
+    'test_post_repo',
+    'test_search_repo',
+    'test_bulk_repo',
+    'test_product_repo',
+    'test_cart_repo',
+    'test_payment_repo',
+    'test_tag_repo',
+    'test_pagination',
+    'test_cache',
+    'test_hashing',
+    'test_pool',
+    'test_session_routing',
+    'test_checks',
+    'test_yookassa_client',
+    'test_search',
+    'test_serialization',
+    'test_http_cache',
+    'test_broadcast',
+    'test_dataloader',
+    'test_metrics',
+    'test_diagnostics',
+    'test_pricing',
+    'test_jobs',
+    'test_ids',
 )
@@ -0,0 +1,125 @@
+import sys
+import json
+import asyncio
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.broadcast import Broadcaster, SlowConsumerError, publish_on_commit, settings, sse_stream
+
+from tests.fixtures.db import mock_session
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_subscribers():
+    broadcaster = Broadcaster()
+
+    async with broadcaster.subscribe('thread:1') as first, broadcaster.subscribe('thread:1') as second:
+        async with broadcaster.subscribe('thread:2') as other:
+            await broadcaster.publish('thread:1', {'type': 'post_created'})
+
+            assert json.loads(await first.get(timeout=1)) == {'type': 'post_created'}
+            assert json.loads(await second.get(timeout=1)) == {'type': 'post_created'}
+            assert await other.get(timeout=0.01) is None
+
+    assert broadcaster.subscriber_count('thread:1') == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted():
+    broadcaster = Broadcaster()
+
+    async with broadcaster.subscribe('thread:1', max_queue=2) as subscription:
+        for i in range(3):
+            await broadcaster.publish('thread:1', i)
+
+        assert subscription.evicted
+        with pytest.raises(SlowConsumerError):
+            await subscription.get(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_heartbeat_and_messages(monkeypatch):
+    monkeypatch.setattr(settings, 'BROADCAST_HEARTBEAT_INTERVAL', 0.01)
+    broadcaster = Broadcaster()
+    stream = sse_stream(broadcaster, 'thread:1')
+
+    assert (await stream.__anext__()).startswith('retry:')
+    assert await stream.__anext__() == ': ping\n\n'
+
+    next_chunk = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    await broadcaster.publish('thread:1', {'type': 'post_deleted'})
+    chunk = await next_chunk
+    if chunk == ': ping\n\n':
+        chunk = await stream.__anext__()
+
+    assert chunk == 'data: {"type":"post_deleted"}\n\n'
+    await stream.aclose()
+    assert broadcaster.subscriber_count('thread:1') == 0
+
+
+@pytest.mark.asyncio
+async def test_messages_are_published_once_committed(mock_session):
+    broadcaster = Broadcaster()
+
+    async with mock_session() as session, broadcaster.subscribe('thread:1') as subscription:
+        publish_on_commit(session, broadcaster, 'thread:1', {'type': 'post_created'})
+        await asyncio.sleep(0)
+        assert await subscription.get(timeout=0.01) is None
+
+        await session.commit()
+        assert json.loads(await subscription.get(timeout=1)) == {'type': 'post_created'}
+
+        publish_on_commit(session, broadcaster, 'thread:1', {'type': 'post_deleted'})
+        await session.rollback()
+        assert await subscription.get(timeout=0.01) is None
+
+
+class FlakyPubSub:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.channels: list[str] = []
+
+    async def subscribe(self, channel: str) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Connection refused")
+        self.channels.append(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.channels.remove(channel)
+
+    async def get_message(self, timeout: float):
+        await asyncio.sleep(timeout)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FlakyRedis:
+    def __init__(self, failures: int) -> None:
+        self.pubsub_connection = FlakyPubSub(failures)
+
+    def pubsub(self, **kwargs) -> FlakyPubSub:
+        return self.pubsub_connection
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_is_retried(monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_RETRY_INTERVAL', 0.01)
+    redis = FlakyRedis(failures=2)
+    broadcaster = Broadcaster(redis)
+
+    async with broadcaster.subscribe('thread:1'):
+        assert redis.pubsub_connection.channels == []
+        for _ in range(100):
+            if redis.pubsub_connection.channels:
+                break
+            await asyncio.sleep(0.01)
+        assert redis.pubsub_connection.channels == ['thunderbolt:broadcast:thread:1']
+
+    assert redis.pubsub_connection.channels == []
+    await broadcaster.close()
@@ -0,0 +1,76 @@
+import sys
+import asyncio
+import pytest
+
+from pathlib import Path
+
+from redis.exceptions import ConnectionError
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.cache import Cache
+from thunderbolt.models import Topic
+from thunderbolt.forum.repository.topic import CachedTopicRepository
+
+from tests.fixtures.db import mock_session
+
+
+class UnavailableRedis:
+    async def get(self, *args, **kwargs):
+        raise ConnectionError("Connection refused")
+
+    set = incr = get
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_loads_once():
+    cache = Cache(redis=None)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return [{'symbol': 'GEN'}]
+
+    assert await cache.get_or_set('topics', 'all', loader) == [{'symbol': 'GEN'}]
+    assert await cache.get_or_set('topics', 'all', loader) == [{'symbol': 'GEN'}]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version():
+    cache = Cache(redis=None)
+
+    await cache.set('topics', 'all', [1])
+    await cache.invalidate('topics')
+
+    assert await cache.get('topics', 'all') is None
+
+
+@pytest.mark.asyncio
+async def test_fallback_when_redis_is_down():
+    cache = Cache(redis=UnavailableRedis())
+
+    await cache.set('threads', 'all', [1, 2])
+
+    assert await cache.get('threads', 'all') == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_once_committed(mock_session):
+    cache = Cache(redis=None)
+    async with mock_session() as session:
+        topic_repo = CachedTopicRepository(session, cache)
+
+        await cache.set('topics', 'all', [1])
+        await topic_repo.add(Topic(symbol='GEN', title='General'))
+        assert await cache.get('topics', 'all') == [1]
+
+        await session.commit()
+        await asyncio.sleep(0)
+        assert await cache.get('topics', 'all') is None
+
+        await cache.set('topics', 'all', [2])
+        await topic_repo.add(Topic(symbol='SRV', title='Servers'))
+        await session.rollback()
+        await asyncio.sleep(0)
+        assert await cache.get('topics', 'all') == [2]
@@ -0,0 +1,40 @@
+import sys
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.checks import find_unindexed_filters
+
+
+def test_repository_filters_are_indexed():
+    problems = find_unindexed_filters()
+
+    assert not problems, '\n'.join(str(problem) for problem in problems)
+
+
+def test_reports_unindexed_filter(tmp_path):
+    source = tmp_path / 'repository.py'
+    source.write_text(
+        'stmt = select(Post).where(Post.title == title, Post.thread_id == thread_id)\n'
+        'stmt = select(Product).where(Product.user_id == user_id)\n'
+    )
+
+    problems = find_unindexed_filters([source])
+
+    assert [(p.model, p.column, p.reason) for p in problems] == [
+        ('Post', 'title', 'has no index'),
+        ('Product', 'user_id', 'is not a column'),
+    ]
+
+
+def test_composite_index_needs_its_prefix(tmp_path):
+    source = tmp_path / 'repository.py'
+    source.write_text(
+        'stmt = select(Job).where(Job.status == status, Job.run_at <= now)\n'
+        'stmt = select(Job).where(Job.run_at <= now)\n'
+    )
+
+    problems = find_unindexed_filters([source])
+
+    assert [(p.lineno, p.model, p.column) for p in problems] == [(2, 'Job', 'run_at')]
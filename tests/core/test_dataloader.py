@@ -0,0 +1,52 @@
+import sys
+import asyncio
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.dataloader import DataLoader
+
+
+def _recording_loader(fail: bool = False) -> tuple[DataLoader, list]:
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(list(keys))
+        if fail:
+            raise RuntimeError('unavailable')
+        return {key: key * 10 for key in keys if key != 0}
+
+    return DataLoader(batch_load), batches
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_are_batched():
+    loader, batches = _recording_loader()
+
+    values = await asyncio.gather(*(loader.load(key) for key in (1, 2, 3, 2, 0)))
+
+    assert values == [10, 20, 30, 20, None]
+    assert batches == [[1, 2, 3, 0]]
+
+
+@pytest.mark.asyncio
+async def test_values_are_memoized():
+    loader, batches = _recording_loader()
+    loader.prime(4, 40)
+
+    assert await loader.load_many([1, 4]) == [10, 40]
+    assert await loader.load_many([1, 2]) == [10, 20]
+    assert batches == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_failed_keys_are_retried():
+    loader, batches = _recording_loader(fail=True)
+
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert batches == [[1], [1]]
@@ -0,0 +1,79 @@
+import sys
+import json
+import httpx
+import logging
+import pytest
+
+from pathlib import Path
+
+from fastapi import FastAPI
+from sqlalchemy import select, text
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.diagnostics import DiagnosticsMiddleware, capture_queries, install_query_hooks, statement_shape
+from thunderbolt.models import Thread, Topic
+
+from tests.fixtures.db import mock_session
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape('SELECT *\n  FROM post WHERE id IN (?, ?, ?)') == 'SELECT * FROM post WHERE id IN (...)'
+    assert statement_shape('SELECT * FROM post WHERE id IN ($1, $2)') == statement_shape('SELECT * FROM post WHERE id IN ($7)')
+
+
+async def _load_topics_one_by_one(session, threads):
+    for thread in threads:
+        await session.execute(select(Topic).where(Topic.id == thread.topic_id))
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_reported(mock_session):
+    async with mock_session() as session:
+        install_query_hooks(session.bind.engine)
+        threads = [Thread(topic=Topic(symbol=f'T{i}', title=f'Topic {i}'), title=f'Thread {i}') for i in range(3)]
+        session.add_all(threads)
+        await session.flush()
+
+        with capture_queries() as recorder:
+            await _load_topics_one_by_one(session, threads)
+            await session.execute(select(Thread))
+
+        repeated = recorder.repeated_statements()
+        assert recorder.count == 4
+        assert len(repeated) == 1
+        assert repeated[0]['count'] == 3
+        assert repeated[0]['statement'].startswith('SELECT topic.')
+        assert any('in _load_topics_one_by_one' in frame for frame in repeated[0]['stacks'][0])
+        assert 'repeated_statements' in recorder.report()['violations']
+
+
+@pytest.mark.asyncio
+async def test_middleware_logs_offending_requests(mock_session, caplog):
+    async with mock_session() as session:
+        install_query_hooks(session.bind.engine)
+        app = FastAPI()
+        app.add_middleware(DiagnosticsMiddleware)
+
+        @app.get('/few')
+        async def few() -> dict:
+            await session.execute(text('SELECT 1'))
+            return {}
+
+        @app.get('/many')
+        async def many() -> dict:
+            for _ in range(3):
+                await session.execute(text('SELECT 1'))
+            return {}
+
+        with caplog.at_level(logging.WARNING, logger='thunderbolt.core.diagnostics'):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+                few_response = await client.get('/few')
+                many_response = await client.get('/many')
+
+        assert few_response.headers['x-db-query-count'] == '1'
+        assert many_response.headers['x-db-query-count'] == '3'
+        reports = [json.loads(record.getMessage().split(': ', 1)[1]) for record in caplog.records]
+        assert [report['path'] for report in reports] == ['/many']
+        assert reports[0]['route'] == '/many'
+        assert reports[0]['violations'] == ['repeated_statements']
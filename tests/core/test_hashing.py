@@ -0,0 +1,35 @@
+import sys
+import asyncio
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.hashing import PasswordHasher, HasherOverloadedError
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify():
+    hasher = PasswordHasher(max_workers=1, max_pending=4, executor='thread')
+
+    hashed_password = await hasher.hash('test_password')
+
+    assert await hasher.verify(hashed_password, 'test_password')
+    assert not await hasher.verify(hashed_password, 'wrong_password')
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_overloaded():
+    hasher = PasswordHasher(max_workers=1, max_pending=1, executor='thread')
+
+    first = asyncio.ensure_future(hasher.hash('test_password'))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HasherOverloadedError):
+        await hasher.hash('test_password')
+
+    await first
+    assert hasher.pending == 0
+    hasher.shutdown()
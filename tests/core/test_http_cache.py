@@ -0,0 +1,105 @@
+import sys
+import httpx
+import pytest
+
+from pathlib import Path
+from typing import Annotated
+from datetime import datetime, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
+
+from thunderbolt.core.http_cache import HTTPCache, HTTPCacheMiddleware, collection_etag, entity_etag, http_cache
+
+
+UPDATED_AT = datetime(2023, 6, 22, 12, 39, 29, 625984, tzinfo=timezone.utc)
+calls = []
+things = [1, 2]
+
+app = FastAPI()
+app.add_middleware(HTTPCacheMiddleware)
+
+
+@app.get('/things/1')
+async def get_thing(cache: Annotated[HTTPCache, Depends(http_cache(max_age=10))]):
+    cache.validate(entity_etag(1, UPDATED_AT), UPDATED_AT)
+    calls.append(1)
+    return ORJSONResponse({'id': 1})
+
+
+@app.get('/things')
+async def get_things(cache: Annotated[HTTPCache, Depends(http_cache(max_age=10))]):
+    cache.validate(collection_etag((thing, UPDATED_AT) for thing in things))
+    return ORJSONResponse(things)
+
+
+@app.get('/private')
+async def get_private(cache: Annotated[HTTPCache, Depends(http_cache(private=True))]):
+    return {'ok': True}
+
+
+async def get(url: str, headers: dict = None) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        return await client.get(url, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_validators_and_cache_control():
+    response = await get('/things/1')
+
+    assert response.status_code == 200
+    assert response.headers['etag'] == entity_etag(1, UPDATED_AT)
+    assert response.headers['last-modified'] == 'Thu, 22 Jun 2023 12:39:29 GMT'
+    assert response.headers['cache-control'] == 'public, max-age=10'
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304_without_body():
+    etag = (await get('/things/1')).headers['etag']
+    calls.clear()
+
+    response = await get('/things/1', headers={'If-None-Match': f'"other", W/{etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+    assert calls == []
+    assert (await get('/things/1', headers={'If-None-Match': '"other"'})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_if_modified_since():
+    assert (await get('/things/1', headers={'If-Modified-Since': 'Thu, 22 Jun 2023 12:39:29 GMT'})).status_code == 304
+    assert (await get('/things/1', headers={'If-Modified-Since': 'Thu, 22 Jun 2023 12:39:28 GMT'})).status_code == 200
+    assert (await get('/things/1', headers={'If-Modified-Since': 'garbage'})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_takes_precedence():
+    headers = {'If-None-Match': '"other"', 'If-Modified-Since': 'Thu, 22 Jun 2023 12:39:29 GMT'}
+    assert (await get('/things/1', headers=headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_private_revalidate_policy():
+    response = await get('/private')
+
+    assert response.headers['cache-control'] == 'private, max-age=0, must-revalidate'
+
+
+@pytest.mark.asyncio
+async def test_collection_is_revalidated_after_a_delete():
+    etag = (await get('/things')).headers['etag']
+    things.remove(2)
+    try:
+        response = await get('/things', headers={'If-None-Match': etag})
+        since = await get('/things', headers={'If-Modified-Since': 'Thu, 22 Jun 2023 12:39:29 GMT'})
+    finally:
+        things.append(2)
+
+    assert response.status_code == 200
+    assert response.json() == [1]
+    assert 'last-modified' not in response.headers
+    assert since.status_code == 200
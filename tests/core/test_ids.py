@@ -0,0 +1,47 @@
+import sys
+import uuid
+
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core import ids
+from thunderbolt.core.ids import uuid7, uuid7_at, uuid7_floor, uuid7_time
+from thunderbolt.models import Post
+
+
+def test_uuid7_is_a_time_ordered_uuid():
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    values = [uuid7() for _ in range(10_000)]
+    after = datetime.now(timezone.utc) + timedelta(milliseconds=2)
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in values)
+    assert before <= uuid7_time(values[0]) <= uuid7_time(values[-1]) <= after
+
+
+def test_uuid7_borrows_the_next_millisecond_on_counter_overflow(monkeypatch):
+    monkeypatch.setattr(ids.time, 'time_ns', lambda: 1_700_000_000_000_000_000)
+    values = [uuid7() for _ in range(ids._COUNTER_MAX + 2)]
+
+    assert values == sorted(values)
+    assert uuid7_time(values[-1]) - uuid7_time(values[0]) == timedelta(milliseconds=1)
+
+
+def test_uuid7_bounds_ids_by_time():
+    moment = datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc)
+    value = uuid7_at(moment, random_bits=0)
+
+    assert uuid7_time(value) == moment
+    assert uuid7_floor(moment) <= value < uuid7_floor(moment + timedelta(milliseconds=1))
+    assert uuid7_at(moment.replace(tzinfo=None), random_bits=0) == value
+
+
+def test_models_default_to_uuid7_without_a_duplicate_unique_index():
+    id_column = Post.__table__.c.id
+
+    assert id_column.default.arg.__name__ == 'uuid7'
+    assert not id_column.unique
+    assert not any(index.columns.keys() == ['id'] for index in Post.__table__.indexes)
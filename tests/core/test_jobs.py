@@ -0,0 +1,99 @@
+import sys
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from sqlalchemy import select
+
+from thunderbolt.core import jobs
+from thunderbolt.core.jobs import enqueue, purge_dead_jobs, requeue_dead_jobs, run_due_jobs
+from thunderbolt.models import Job
+
+from tests.fixtures.db import mock_session
+
+
+calls = []
+
+
+async def record(session, value):
+    calls.append(value)
+    if value == 'fail':
+        raise RuntimeError('failed')
+
+
+@pytest.fixture(autouse=True)
+def register_record(monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(jobs, 'JOBS', {})
+    monkeypatch.setattr(jobs, 'retry_delay', lambda attempts: 0)
+    jobs.job('tests.record', max_attempts=2)(record)
+
+
+@pytest.mark.asyncio
+async def test_done_jobs_are_deleted(mock_session):
+    async with mock_session() as session:
+        await enqueue(session, record, value='ok')
+        await enqueue(session, 'tests.record', value='later', delay=3600)
+
+        assert calls == []
+        assert await run_due_jobs(session) == 1
+        assert calls == ['ok']
+
+        names = (await session.execute(select(Job.payload))).scalars().all()
+        assert names == ['{"value":"later"}']
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_then_dead(mock_session):
+    async with mock_session() as session:
+        await enqueue(session, record, value='fail')
+
+        assert await run_due_jobs(session) == 1
+        failed = (await session.execute(select(Job.status, Job.attempts))).one()
+        assert tuple(failed) == ('pending', 1)
+
+        assert await run_due_jobs(session) == 1
+        dead = (await session.execute(select(Job.status, Job.attempts, Job.last_error))).one()
+        assert tuple(dead[:2]) == ('dead', 2)
+        assert 'RuntimeError: failed' in dead[2]
+
+        assert await run_due_jobs(session) == 0
+        assert calls == ['fail', 'fail']
+
+
+@pytest.mark.asyncio
+async def test_dead_jobs_are_requeued_or_purged(mock_session):
+    async with mock_session() as session:
+        await enqueue(session, record, value='fail')
+        await enqueue(session, record, value='later', delay=3600)
+        for _ in range(2):
+            await run_due_jobs(session)
+
+        assert await requeue_dead_jobs(session) == 1
+        statuses = (await session.execute(select(Job.status, Job.attempts))).all()
+        assert sorted(map(tuple, statuses)) == [('pending', 0), ('pending', 0)]
+
+        for _ in range(2):
+            await run_due_jobs(session)
+        assert calls == ['fail'] * 4
+
+        assert await purge_dead_jobs(session) == 1
+        remaining = (await session.execute(select(Job.payload))).scalars().all()
+        assert remaining == ['{"value":"later"}']
+
+
+@pytest.mark.asyncio
+async def test_inline_jobs_run_in_enqueue(mock_session, monkeypatch):
+    monkeypatch.setattr(jobs.settings, 'JOBS_INLINE', True)
+    async with mock_session() as session:
+        await enqueue(session, record, value='inline')
+
+        assert calls == ['inline']
+        assert (await session.execute(select(Job.id))).first() is None
+
+
+def test_unknown_jobs_are_rejected():
+    with pytest.raises(ValueError):
+        jobs._get_handler('tests.unknown')
@@ -0,0 +1,80 @@
+import sys
+import httpx
+import pytest
+
+from pathlib import Path
+
+from fastapi import FastAPI
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.metrics import (
+    MetricsMiddleware, MetricsRegistry, instrument_engine, query_duration, query_rows, request_duration,
+)
+from thunderbolt.core.routes import metrics_router
+from thunderbolt.models import Post, Thread, Topic, User
+from thunderbolt.forum.repository.post import PostRepository
+
+from tests.fixtures.db import mock_session
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+    histogram.observe(0.05, '/a"b')
+    histogram.observe(0.5, '/a"b')
+    histogram.observe(5.0, '/a"b')
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ['# HELP latency_seconds Latency.', '# TYPE latency_seconds histogram']
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a\\"b"} 5.55' in lines
+    assert 'latency_seconds_count{route="/a\\"b"} 3' in lines
+
+
+@pytest.mark.asyncio
+async def test_queries_are_attributed_to_repository_methods(mock_session):
+    async with mock_session() as session:
+        instrument_engine(session.bind.engine)
+        user = User(username='poster', email='poster@gmail.com', name='Poster')
+        user.password = 'password'
+        thread = Thread(topic=Topic(symbol='GEN', title='General'), title='Hello world')
+        session.add_all([user, thread])
+        await session.flush()
+        session.add_all([Post(thread_id=thread.id, user_id=user.id, title=f'post{i}', content='content') for i in range(3)])
+        await session.flush()
+
+        queries = query_duration.count('PostRepository.get_by_user')
+        rows = query_rows.value('PostRepository.get_by_user')
+        await PostRepository(session).get_by_user(user.id)
+
+        # The posts, then their threads and users, then the topics
+        assert query_duration.count('PostRepository.get_by_user') == queries + 4
+        assert query_rows.value('PostRepository.get_by_user') == rows + 3 + 1 + 1 + 1
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, sample_rate=0.0)
+    app.include_router(metrics_router)
+
+    @app.get('/items/{item_id}')
+    async def get_item(item_id: int) -> dict:
+        return {'id': item_id}
+
+    requests = request_duration.count('GET', '/items/{item_id}')
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        await client.get('/items/1')
+        await client.get('/items/2')
+        await client.get('/missing')
+        response = await client.get('/metrics')
+
+    assert request_duration.count('GET', '/items/{item_id}') == requests + 2
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'thunderbolt_http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+    assert 'thunderbolt_db_pool_wait_seconds_count' in response.text
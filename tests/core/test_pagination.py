@@ -0,0 +1,51 @@
+import sys
+import uuid
+import pytest
+
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.pagination import (
+    InvalidCursorError,
+    build_page,
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+    settings,
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2023, 6, 22, 12, 39, 29, 625984, tzinfo=timezone.utc)
+    post_id = uuid.uuid4()
+
+    token = encode_cursor(created_at, post_id)
+
+    assert '=' not in token
+    assert decode_cursor(token, datetime, uuid.UUID) == (created_at, post_id)
+
+
+@pytest.mark.parametrize('token', ['', 'not-a-cursor', encode_cursor('only-one')])
+def test_decode_invalid_cursor(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, datetime, uuid.UUID)
+
+
+def test_clamp_page_size():
+    assert clamp_page_size(None) == settings.PAGE_SIZE_DEFAULT
+    assert clamp_page_size(-5) == 1
+    assert clamp_page_size(settings.PAGE_SIZE_MAX + 1) == settings.PAGE_SIZE_MAX
+
+
+def test_build_page():
+    rows = list(range(6))
+
+    page = build_page(rows, 5, key=lambda row: (row,))
+    assert page.items == [0, 1, 2, 3, 4]
+    assert decode_cursor(page.next_cursor, int) == (4,)
+
+    last_page = build_page(rows[:3], 5, key=lambda row: (row,))
+    assert last_page.items == [0, 1, 2]
+    assert last_page.next_cursor is None
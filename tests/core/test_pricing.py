@@ -0,0 +1,72 @@
+import sys
+
+from pathlib import Path
+from decimal import Decimal
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.payments import PricingEngine, ProductList, YookassaPaymentSystem
+from thunderbolt.core.payments.yookassa.schema import CustomerDetails
+
+
+def _receipt_total(items) -> Decimal:
+    return sum((item.price * item.quantity for item in items), Decimal(0))
+
+
+def test_large_cart_is_priced_without_drift():
+    engine = PricingEngine('RUB')
+    lines = 5000
+
+    cart = engine.price(['item'] * lines, [Decimal('0.10')] * lines, [3] * lines)
+
+    assert cart.total == 150000
+    assert cart.to_decimal(cart.total) == Decimal('1500.00')
+    assert cart.amount().value == _receipt_total(cart.receipt_items())
+
+
+def test_discount_is_allocated_exactly():
+    engine = PricingEngine('RUB', tax_rate=Decimal('0.2'), vat_code=4)
+
+    cart = engine.price(
+        ['a', 'b', 'c'],
+        [Decimal('0.99'), Decimal('10.01'), Decimal('3.33')],
+        [3, 1, 7],
+        discount=Decimal('0.15'),
+    )
+
+    assert cart.subtotal == 297 + 1001 + 2331
+    assert cart.discount == 544
+    assert cart.total == cart.subtotal - cart.discount
+    assert cart.taxes == [round(line_total / 6) for line_total in cart.line_totals]
+
+    items = cart.receipt_items()
+    assert _receipt_total(items) == cart.to_decimal(cart.total)
+    assert sum(item.quantity for item in items) == 11
+    assert {item.vat_code for item in items} == {4}
+
+
+def test_prices_are_converted_to_the_cart_currency():
+    engine = PricingEngine('RUB', rates={'USD': Decimal('91.2345')})
+
+    cart = engine.price(['a', 'b'], [Decimal('1.99'), Decimal('100')], [2, 1], ['USD', 'RUB'])
+
+    # 199 * 91.2345 = 18155.6655 kopecks, rounded half up
+    assert cart.unit_prices == [18156, 10000]
+    assert cart.total == 2 * 18156 + 10000
+
+
+def test_payment_details_are_built_from_the_priced_cart():
+    class Line:
+        def __init__(self, name, price, quantity):
+            self.name, self.price, self.quantity = name, price, quantity
+
+    payment_system = YookassaPaymentSystem(
+        CustomerDetails(full_name='Ivan Ivanov', email='example@mail.ru', phone=79999999999, inn=123456789012),
+        confirmation_url='https://example.com/return',
+    )
+    product_cart = ProductList([Line('a', Decimal('157.99'), 2), Line('b', Decimal('0.01'), 1)])
+
+    details = payment_system._build_payment_details(product_cart)
+
+    assert details.amount.value == product_cart.total() == Decimal('315.99')
+    assert '"value": "315.99"' in details.json()
@@ -0,0 +1,55 @@
+import sys
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.search import InvertedIndex, highlight, tokenize
+
+
+def test_tokenize():
+    assert tokenize('Hello, World! Привет') == ['hello', 'world', 'привет']
+    assert tokenize(None) == []
+
+
+def test_search_requires_every_term_and_ranks_title_first():
+    index = InvertedIndex()
+    index.add(1, ('redis cache', 1.0), ('warm up', 0.4))
+    index.add(2, ('pool', 1.0), ('redis cache metrics', 0.4))
+    index.add(3, ('redis', 1.0), ('pool', 0.4))
+
+    hits = index.search('Redis cache')
+
+    assert [doc_id for doc_id, _ in hits] == [1, 2]
+    assert hits[0][1] > hits[1][1]
+    assert index.search('redis missing') == []
+
+
+def test_add_replaces_and_remove_forgets():
+    index = InvertedIndex()
+    index.add(1, ('old title', 1.0))
+    index.add(1, ('new title', 1.0))
+
+    assert index.search('old') == []
+    assert [doc_id for doc_id, _ in index.search('new')] == [1]
+
+    index.remove(1)
+    assert index.search('new') == []
+    assert len(index) == 0
+
+
+def test_highlight():
+    text = ' '.join(f'word{i}' for i in range(100)) + ' needle tail'
+
+    snippet = highlight(text, ['needle'], max_words=10)
+
+    assert '<mark>needle</mark>' in snippet
+    assert len(snippet.split()) == 10
+
+
+def test_highlight_escapes_html():
+    snippet = highlight('Try <script>alert("needle")</script> & needle', ['needle'])
+
+    assert snippet == (
+        'Try &lt;script&gt;alert(&quot;<mark>needle</mark>&quot;)&lt;/script&gt; &amp; <mark>needle</mark>'
+    )
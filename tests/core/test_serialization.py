@@ -0,0 +1,81 @@
+import sys
+import json
+import uuid
+import pytest
+
+from pathlib import Path
+from decimal import Decimal
+from types import SimpleNamespace
+from datetime import date, datetime, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from thunderbolt.core.pagination import Page
+from thunderbolt.core.serialization import compile_serializer, orjson_response
+from thunderbolt.forum.repository.projection import PostInfo, ThreadInfo, TopicInfo, UserInfo
+from thunderbolt.forum.schema.post import PostInfoResponse, PostPageResponse
+from thunderbolt.forum.schema.thread import ThreadInfoWithRelatedResponse
+from thunderbolt.market.schema import Product
+
+
+def _post(i: int) -> PostInfo:
+    return PostInfo(
+        id=uuid.uuid4(),
+        title=f'post{i}',
+        created_at=datetime(2023, 6, 22, 12, 39, i, 625984, tzinfo=timezone.utc),
+        updated_at=None,
+        thread=ThreadInfo(
+            'Hello world',
+            None if i % 2 else 'Say hello',
+            TopicInfo('GEN', 'General', 'General discussion', i, datetime(2023, 6, 22, tzinfo=timezone.utc), None),
+        ),
+        user=UserInfo(uuid.uuid4(), 'poster', 'poster@gmail.com', 'Poster', None, 'other', date(2000, 1, 1)),
+    )
+
+
+def _pydantic_json(schema, content) -> object:
+    return json.loads(json.dumps(jsonable_encoder(parse_obj_as(schema, content))))
+
+
+def _orjson_json(schema, content) -> object:
+    return json.loads(orjson_response(schema, content).body)
+
+
+def test_post_page_parity():
+    page = Page(items=[_post(i) for i in range(4)], next_cursor='abc')
+    page.items[1].thread.description = 'Described'
+
+    assert _orjson_json(PostPageResponse, page) == _pydantic_json(PostPageResponse, page)
+
+
+def test_list_parity_with_orm_like_objects():
+    threads = [
+        SimpleNamespace(
+            title='Hello world',
+            description='Say hello',
+            topic=SimpleNamespace(symbol='GEN', title='General', description='General discussion'),
+        )
+    ]
+    products = [
+        SimpleNamespace(
+            id=uuid.uuid4(), shop_id=uuid.uuid4(), currency_id=uuid.uuid4(),
+            name='Book', image_url='https://example.com/book.png', description=None, price=price,
+        )
+        for price in (Decimal('157.99'), Decimal('10'))
+    ]
+
+    schema = list[ThreadInfoWithRelatedResponse]
+    assert _orjson_json(schema, threads) == _pydantic_json(schema, threads)
+    assert _orjson_json(list[Product], products) == _pydantic_json(list[Product], products)
+
+
+def test_serializer_is_cached():
+    assert compile_serializer(list[PostInfoResponse]) is compile_serializer(list[PostInfoResponse])
+
+
+def test_unsupported_schema():
+    with pytest.raises(TypeError):
+        compile_serializer(dict)
@@ -0,0 +1,75 @@
+import sys
+import pytest
+import pytest_asyncio
+
+from pathlib import Path
+
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core import session as db_session
+from thunderbolt.core.session import RoutingSession, use_primary
+
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = 'note'
+
+    id = Column(Integer, primary_key=True)
+    origin = Column(String(16), nullable=False)
+
+
+@pytest_asyncio.fixture
+async def routing_session(tmp_path, monkeypatch):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine, origin in ((primary, 'primary'), (replica, 'replica')):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(Note.__table__.insert().values(id=1, origin=origin))
+
+    monkeypatch.setattr(db_session, 'engine', primary)
+    monkeypatch.setattr(db_session, 'replica_engines', [replica])
+
+    SessionLocal = sessionmaker(class_=AsyncSession, sync_session_class=RoutingSession)
+    async with SessionLocal() as session:
+        yield session
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def _origin(session: AsyncSession) -> str:
+    result = await session.execute(select(Note.origin).where(Note.id == 1))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(routing_session):
+    assert await _origin(routing_session) == 'replica'
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_flush(routing_session):
+    routing_session.add(Note(id=2, origin='primary'))
+    await routing_session.flush()
+
+    assert await _origin(routing_session) == 'primary'
+
+
+@pytest.mark.asyncio
+async def test_locking_reads_go_to_primary(routing_session):
+    result = await routing_session.execute(select(Note.origin).where(Note.id == 1).with_for_update())
+    assert result.scalar_one() == 'primary'
+
+
+@pytest.mark.asyncio
+async def test_use_primary(routing_session):
+    use_primary(routing_session)
+
+    assert await _origin(routing_session) == 'primary'
@@ -0,0 +1,154 @@
+import sys
+import httpx
+import asyncio
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.core.payments import (
+    AsyncYookassaClient,
+    CircuitBreaker,
+    PaymentProviderUnavailable,
+    PaymentRejected,
+)
+from thunderbolt.core.payments.yookassa.schema import (
+    Amount,
+    Confirmation,
+    CustomerDetails,
+    Item,
+    PaymentDetails,
+    Reciept,
+)
+from tests.fixtures.yookassa import create_fake_yookassa
+
+
+payment_details = PaymentDetails(
+    amount=Amount(value=157.99, currency='RUB'),
+    confirmation=Confirmation(return_url='https://example.com/return'),
+    receipt=Reciept(
+        customer=CustomerDetails(
+            full_name='Ivan Ivanov',
+            email='example@mail.ru',
+            phone=79999999999,
+            inn=123456789012,
+        ),
+        items=[Item(price=157.99, description='Item description')],
+    ),
+)
+
+
+def make_client(provider, **kwargs) -> AsyncYookassaClient:
+    return AsyncYookassaClient(
+        account_id='test',
+        secret_key='test',
+        base_url='http://yookassa.test',
+        retry_backoff=0.001,
+        transport=httpx.ASGITransport(app=provider),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_payment():
+    provider = create_fake_yookassa()
+    client = make_client(provider)
+
+    payment = await client.create_payment(payment_details)
+    fetched = await client.get_payment(payment.id)
+
+    assert payment.status == 'pending'
+    assert payment.confirmation.confirmation_url
+    assert fetched.id == payment.id
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retries_reuse_idempotency_key():
+    provider = create_fake_yookassa(fail_times=2)
+    client = make_client(provider, max_retries=3)
+
+    first = await client.create_payment(payment_details, idempotency_key='order-1')
+    second = await client.create_payment(payment_details, idempotency_key='order-1')
+
+    assert provider.state.calls == 4
+    assert first.id == second.id
+    assert len(provider.state.payments) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_retried():
+    provider = create_fake_yookassa(fail_times=1, fail_status_code=400)
+    client = make_client(provider, max_retries=3)
+
+    with pytest.raises(PaymentRejected) as exc_info:
+        await client.create_payment(payment_details)
+
+    assert exc_info.value.status_code == 400
+    assert provider.state.calls == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_failures():
+    provider = create_fake_yookassa(fail_times=10)
+    client = make_client(provider, max_retries=1, breaker=CircuitBreaker(threshold=2, cooldown=60))
+
+    with pytest.raises(PaymentProviderUnavailable):
+        await client.create_payment(payment_details)
+    with pytest.raises(PaymentProviderUnavailable):
+        await client.create_payment(payment_details)
+
+    assert provider.state.calls == 2
+    await client.aclose()
+
+
+class HangingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    async def handle_async_request(self, request):
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+class BrokenTransport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request):
+        raise httpx.DecodingError("Malformed response")
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+    return breaker
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_half_open_circuit():
+    breaker = half_open_breaker()
+    transport = HangingTransport()
+    client = AsyncYookassaClient(account_id='test', secret_key='test', breaker=breaker, transport=transport)
+
+    trial = asyncio.create_task(client.get_payment('payment'))
+    await transport.started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unexpected_trial_error_is_a_failure():
+    breaker = half_open_breaker()
+    client = AsyncYookassaClient(account_id='test', secret_key='test', breaker=breaker, transport=BrokenTransport())
+
+    with pytest.raises(httpx.DecodingError):
+        await client.get_payment('payment')
+
+    breaker.before_call()
+    await client.aclose()
@@ -1,10 +1,11 @@
 import pytest
+import pytest_asyncio
 
 from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from thunderbolt.core.settings import get_test_settings
 from thunderbolt.models.base import ThunderboltModel
@@ -19,6 +20,7 @@ def mock_session():
     async def session() -> AsyncSession:
         engine = create_async_engine(settings.DATABASE_URI, future=True)
         async with engine.begin() as conn:
+            await conn.run_sync(ThunderboltModel.metadata.create_all)
             SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=conn, class_=AsyncSession)
             session: AsyncSession = SessionLocal()
 
@@ -29,3 +31,16 @@ def mock_session():
             await session.rollback()
         await engine.dispose()
     return session
+
+
+@pytest_asyncio.fixture(scope='function')
+async def session_factory(tmp_path):
+    """
+    Sessions of a fresh database, one per request like in production, so only
+    committed changes outlive a session.
+    """
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "test.db"}', future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(ThunderboltModel.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
@@ -0,0 +1,63 @@
+"""
+Fake YooKassa API for tests.
+
+Implements payment creation with idempotency keys and payment lookup, and can
+be told to fail a number of calls first. Use it in-process through
+`httpx.ASGITransport(app=create_fake_yookassa())`, or run it as a local server:
+
+    uvicorn tests.fixtures.yookassa:app --port 8090
+"""
+
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_fake_yookassa(fail_times: int = 0, fail_status_code: int = 503) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.fail_times = fail_times
+    app.state.payments = {}
+    app.state.idempotency_keys = {}
+
+    @app.post('/payments')
+    async def create_payment(request: Request):
+        app.state.calls += 1
+        if app.state.fail_times > 0:
+            app.state.fail_times -= 1
+            return JSONResponse({'type': 'error', 'code': 'internal_server_error'}, fail_status_code)
+
+        idempotency_key = request.headers.get('Idempotence-Key')
+        if not idempotency_key:
+            return JSONResponse({'type': 'error', 'code': 'invalid_request'}, 400)
+        if idempotency_key in app.state.idempotency_keys:
+            return app.state.payments[app.state.idempotency_keys[idempotency_key]]
+
+        body = await request.json()
+        payment_id = str(uuid.uuid4())
+        payment = {
+            'id': payment_id,
+            'status': 'pending',
+            'paid': False,
+            'amount': body['amount'],
+            'confirmation': {
+                'type': 'redirect',
+                'confirmation_url': f'https://yoomoney.ru/checkout/payments/v2/contract?orderId={payment_id}',
+            },
+        }
+        app.state.payments[payment_id] = payment
+        app.state.idempotency_keys[idempotency_key] = payment_id
+        return payment
+
+    @app.get('/payments/{payment_id}')
+    async def get_payment(payment_id: str):
+        app.state.calls += 1
+        if payment_id not in app.state.payments:
+            return JSONResponse({'type': 'error', 'code': 'not_found'}, 404)
+        return app.state.payments[payment_id]
+
+    return app
+
+
+app = create_fake_yookassa()
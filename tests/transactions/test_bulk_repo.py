@@ -0,0 +1,119 @@
+import sys
+import json
+import uuid
+import pytest
+
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+
+from thunderbolt.importer import import_jsonl
+from thunderbolt.models import Post, Thread, Topic, User
+from thunderbolt.forum.repository.post import PostRepository
+
+from tests.fixtures.db import mock_session
+
+
+async def _create_thread(session) -> tuple[User, Topic, Thread]:
+    user = User(username='importer', email='importer@gmail.com', name='Importer')
+    user.password = 'password'
+    topic = Topic(symbol='GEN', title='General')
+    thread = Thread(topic=topic, title='Imported')
+    session.add_all([user, topic, thread])
+    await session.flush()
+    return user, topic, thread
+
+
+def _rows(user: User, thread: Thread, count: int) -> list[dict]:
+    started = datetime(2023, 6, 22, tzinfo=timezone.utc)
+    return [
+        {
+            'id': uuid.uuid4(),
+            'thread_id': thread.id,
+            'user_id': user.id,
+            'title': f'post{i}',
+            'content': 'content',
+            'created_at': started + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_add_upsert_and_delete_many(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, topic, thread = await _create_thread(session)
+        rows = _rows(user, thread, 7)
+
+        assert await post_repo.add_many(rows, chunk_size=3) == 7
+
+        await session.refresh(thread)
+        await session.refresh(topic)
+        assert thread.post_count == 7
+        assert thread.last_post_id == rows[-1]['id']
+        assert topic.post_count == 7
+
+        updated = [{'id': row['id'], 'thread_id': thread.id, 'user_id': user.id, 'title': 'edited', 'content': 'new'} for row in rows[:2]]
+        assert await post_repo.upsert_many(updated) == 2
+
+        titles = (await session.execute(select(Post.title).where(Post.title == 'edited'))).scalars().all()
+        assert len(titles) == 2
+
+        assert await post_repo.delete_many([row['id'] for row in rows[-2:]]) == 2
+
+        await session.refresh(thread)
+        await session.refresh(topic)
+        assert thread.post_count == 5
+        assert thread.last_post_id == rows[4]['id']
+        assert topic.post_count == 5
+
+
+@pytest.mark.asyncio
+async def test_import_jsonl(mock_session, tmp_path):
+    async with mock_session() as session:
+        user, _, thread = await _create_thread(session)
+        thread_id = thread.id
+        path = tmp_path / 'posts.jsonl'
+        with path.open('w') as f:
+            for row in _rows(user, thread, 10):
+                f.write(json.dumps(row, default=str) + '\n')
+
+        assert await import_jsonl(session, 'post', str(path), chunk_size=4) == 10
+
+        count = await session.scalar(select(func.count()).select_from(Post).where(Post.thread_id == thread_id))
+        assert count == 10
+
+
+def _sample_repository(*columns) -> PostRepository:
+    table = Table('sample', MetaData(), Column('id', Integer, primary_key=True), *columns)
+
+    class SampleRepository(PostRepository):
+        model = SimpleNamespace(__table__=table)
+
+    return SampleRepository(session=None)
+
+
+def test_rows_get_the_same_columns():
+    repository = _sample_repository(
+        Column('stamp', DateTime, default=func.now()),
+        Column('rank', Integer, server_default='0'),
+    )
+
+    rows = repository._to_rows([{'id': 1}, {'id': 2, 'stamp': None}])
+    assert [set(row) for row in rows] == [{'id', 'stamp'}, {'id', 'stamp'}]
+    assert isinstance(rows[0]['stamp'], datetime)
+
+    with pytest.raises(ValueError, match='rank'):
+        repository._to_rows([{'id': 1, 'rank': 3}, {'id': 2}])
+
+
+def test_rows_reject_unknown_sql_defaults():
+    repository = _sample_repository(Column('code', String, default=func.upper('x')))
+
+    with pytest.raises(ValueError, match='sample.code'):
+        repository._to_rows([{'id': 1}])
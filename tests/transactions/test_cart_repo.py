@@ -0,0 +1,87 @@
+import sys
+import pytest
+
+from pathlib import Path
+from decimal import Decimal
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.models import Currency, Product, ShopDetails, User
+from thunderbolt.market.repository.cart import CartRepository
+
+from tests.fixtures.db import mock_session
+
+
+async def _create_products(session) -> tuple[User, list[Product]]:
+    user = User(username='buyer', email='buyer@gmail.com', name='Buyer')
+    user.password = 'password'
+    currencies = [Currency(name='EUR', symbol='E'), Currency(name='RUB', symbol='R')]
+    session.add_all([user, *currencies])
+    await session.flush()
+
+    shop = ShopDetails(seller_id=user.id, name='shop')
+    session.add(shop)
+    await session.flush()
+
+    products = [
+        Product(
+            shop_id=shop.id,
+            name=f'product{i}',
+            image_url='https://example.com/image.png',
+            price=Decimal(10 * (i + 1)),
+            currency_id=currencies[i % 2].id,
+        )
+        for i in range(3)
+    ]
+    session.add_all(products)
+    await session.flush()
+    return user, products
+
+
+@pytest.mark.asyncio
+async def test_add_items_increments_quantities(mock_session):
+    async with mock_session() as session:
+        cart_repo = CartRepository(session)
+        user, products = await _create_products(session)
+
+        await cart_repo.add_items(user.id, {products[0].id: 1, products[1].id: 2})
+        await cart_repo.add_items(user.id, {products[0].id: 3})
+
+        assert await cart_repo.get_quantities(user.id) == {products[0].id: 4, products[1].id: 2}
+
+
+@pytest.mark.asyncio
+async def test_set_quantities_removes_zero_quantities(mock_session):
+    async with mock_session() as session:
+        cart_repo = CartRepository(session)
+        user, products = await _create_products(session)
+
+        await cart_repo.add_items(user.id, {products[0].id: 1, products[1].id: 2})
+        await cart_repo.set_quantities(user.id, {products[0].id: 5, products[1].id: 0, products[2].id: 1})
+
+        assert await cart_repo.get_quantities(user.id) == {products[0].id: 5, products[2].id: 1}
+
+        await cart_repo.replace(user.id, {products[1].id: 7})
+        assert await cart_repo.get_quantities(user.id) == {products[1].id: 7}
+
+
+@pytest.mark.asyncio
+async def test_totals_are_summed_by_currency(mock_session):
+    async with mock_session() as session:
+        cart_repo = CartRepository(session)
+        user, products = await _create_products(session)
+
+        await cart_repo.add_items(user.id, {products[0].id: 2, products[1].id: 1, products[2].id: 3})
+
+        lines = await cart_repo.get_lines(user.id)
+        assert {line.product_id: line.subtotal for line in lines} == {
+            products[0].id: Decimal(20),
+            products[1].id: Decimal(20),
+            products[2].id: Decimal(90),
+        }
+
+        totals = await cart_repo.get_totals(user.id)
+        assert [(total.currency, total.total, total.quantity) for total in totals] == [
+            ('EUR', Decimal(110), 5),
+            ('RUB', Decimal(20), 1),
+        ]
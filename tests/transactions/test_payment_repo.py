@@ -0,0 +1,90 @@
+import sys
+import httpx
+import pytest
+
+from pathlib import Path
+from decimal import Decimal
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.main import app
+from thunderbolt.core.payments.notifications import PaymentUpdate, get_notification_queue, latest_updates
+from thunderbolt.market.repository.payment import PaymentRepository
+
+from tests.fixtures.db import mock_session
+
+
+def _update(payment_id: str, status: str) -> PaymentUpdate:
+    return PaymentUpdate(payment_id, status, status == 'succeeded', Decimal('157.99'), 'RUB')
+
+
+def test_latest_updates_keeps_the_most_advanced_status():
+    updates = latest_updates([
+        _update('a', 'waiting_for_capture'),
+        _update('b', 'pending'),
+        _update('a', 'pending'),
+        _update('a', 'succeeded'),
+        _update('a', 'canceled'),
+        _update('b', 'refunded'),
+    ])
+
+    assert [(update.provider_payment_id, update.status) for update in updates] == [
+        ('a', 'succeeded'),
+        ('b', 'pending'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_updates_never_moves_a_payment_back(mock_session):
+    async with mock_session() as session:
+        payment_repo = PaymentRepository(session)
+
+        await payment_repo.apply_updates([_update('a', 'pending'), _update('b', 'succeeded')])
+        await payment_repo.apply_updates([_update('a', 'succeeded'), _update('b', 'pending')])
+        await payment_repo.apply_updates([_update('a', 'succeeded'), _update('b', 'canceled')])
+
+        payments = [await payment_repo.get_by_provider_id(payment_id) for payment_id in ('a', 'b')]
+        for payment in payments:
+            await session.refresh(payment)
+        assert [(payment.status, payment.paid) for payment in payments] == [
+            ('succeeded', True),
+            ('succeeded', True),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_notification_webhook_only_enqueues_from_the_provider():
+    class Queue:
+        def __init__(self):
+            self.notifications = []
+
+        async def enqueue(self, notification):
+            self.notifications.append(notification)
+
+    queue = Queue()
+    app.dependency_overrides[get_notification_queue] = lambda: queue
+    payment = {
+        'id': '22e12f66-000f-5000-8000-18db351245c7',
+        'status': 'succeeded',
+        'paid': True,
+        'amount': {'value': '157.99', 'currency': 'RUB'},
+    }
+    notification = {'type': 'notification', 'event': 'payment.succeeded', 'object': payment}
+    provider = httpx.ASGITransport(app=app, client=('185.71.76.1', 443))
+    stranger = httpx.ASGITransport(app=app, client=('127.0.0.1', 443))
+    try:
+        async with httpx.AsyncClient(transport=provider, base_url='http://test') as client:
+            accepted = await client.post('/market/payments/notifications', json=notification)
+            invalid = await client.post('/market/payments/notifications', json={
+                'type': 'notification', 'event': 'payment.succeeded', 'object': {'id': payment['id']},
+            })
+        async with httpx.AsyncClient(transport=stranger, base_url='http://test') as client:
+            forged = await client.post('/market/payments/notifications', json=notification)
+    finally:
+        app.dependency_overrides.pop(get_notification_queue, None)
+
+    assert accepted.status_code == 200
+    assert invalid.status_code == 422
+    assert forged.status_code == 403
+    assert [notification.object.id for notification in queue.notifications] == [payment['id']]
+    assert queue.notifications[0].object.amount.value == Decimal('157.99')
@@ -0,0 +1,186 @@
+import sys
+import pytest
+
+from sqlalchemy import event
+
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.models import Post, Thread, Topic, User
+from thunderbolt.forum.repository.post import PostRepository
+from thunderbolt.forum.repository.thread import ThreadRepository
+from thunderbolt.forum.schema.post import PostPageResponse
+
+from tests.fixtures.db import mock_session
+
+
+async def _create_thread(session) -> tuple[User, Topic, Thread]:
+    user = User(username='poster', email='poster@gmail.com', name='Poster')
+    user.password = 'password'
+    topic = Topic(symbol='GEN', title='General')
+    thread = Thread(topic=topic, title='Hello world')
+    session.add_all([user, topic, thread])
+    await session.flush()
+    return user, topic, thread
+
+
+def _post(user: User, thread: Thread, i: int) -> Post:
+    created_at = datetime(2023, 6, 22, tzinfo=timezone.utc) + timedelta(minutes=i)
+    return Post(thread_id=thread.id, user_id=user.id, title=f'post{i}', content='content', created_at=created_at)
+
+
+@pytest.mark.asyncio
+async def test_get_by_thread_paginates(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, _, thread = await _create_thread(session)
+
+        for i in range(5):
+            await post_repo.add(_post(user, thread, i))
+
+        first_page = await post_repo.get_by_thread(thread.id, limit=3)
+        second_page = await post_repo.get_by_thread(thread.id, cursor=first_page.next_cursor, limit=3)
+
+        assert len(first_page.items) == 3
+        assert len(second_page.items) == 2
+        assert second_page.next_cursor is None
+        assert {post.id for post in first_page.items}.isdisjoint(post.id for post in second_page.items)
+
+
+@pytest.mark.asyncio
+async def test_add_and_delete_maintain_activity(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, topic, thread = await _create_thread(session)
+
+        first = _post(user, thread, 0)
+        second = _post(user, thread, 1)
+        await post_repo.add(first)
+        await post_repo.add(second)
+
+        await session.refresh(thread)
+        await session.refresh(topic)
+        assert thread.post_count == 2
+        assert thread.last_post_id == second.id
+        assert topic.post_count == 2
+        assert topic.last_post_id == second.id
+
+        await post_repo.delete(second)
+
+        await session.refresh(thread)
+        await session.refresh(topic)
+        assert thread.post_count == 1
+        assert thread.last_post_id == first.id
+        assert topic.post_count == 1
+        assert topic.last_post_id == first.id
+
+
+@pytest.mark.asyncio
+async def test_get_by_activity(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        thread_repo = ThreadRepository(session)
+        user, topic, thread = await _create_thread(session)
+        other = Thread(topic_id=topic.id, title='Other')
+        quiet = Thread(topic_id=topic.id, title='Quiet')
+        await thread_repo.add(quiet)
+        await thread_repo.add(other)
+
+        # Posts of the future, so they are newer than the threads, the last
+        # one of `thread` committed after its newer post
+        now = datetime.now(timezone.utc)
+        latest = Post(thread_id=thread.id, user_id=user.id, title='latest', content='content',
+                      created_at=now + timedelta(minutes=3))
+        await post_repo.add(latest)
+        await post_repo.add(Post(thread_id=other.id, user_id=user.id, title='other', content='content',
+                                 created_at=now + timedelta(minutes=2)))
+        await post_repo.add(Post(thread_id=thread.id, user_id=user.id, title='late', content='content',
+                                 created_at=now + timedelta(minutes=1)))
+
+        # The activity columns were updated in SQL, reload the loaded threads
+        for loaded in (thread, other, quiet):
+            await session.refresh(loaded)
+        threads, cursor = [], None
+        for _ in range(3):
+            page = await thread_repo.get_by_activity(topic.id, cursor=cursor, limit=1)
+            threads.extend(page.items)
+            cursor = page.next_cursor
+
+        assert [thread.title for thread in threads] == ['Hello world', 'Other', 'Quiet']
+        assert cursor is None
+        assert thread.last_post_id == latest.id
+
+
+@pytest.mark.asyncio
+async def test_get_info_by_thread_matches_entities(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, topic, thread = await _create_thread(session)
+        topic.description = 'General discussion'
+        thread.description = 'Say hello'
+
+        for i in range(3):
+            await post_repo.add(_post(user, thread, i))
+
+        entities = await post_repo.get_by_thread(thread.id, limit=2)
+        infos = await post_repo.get_info_by_thread(thread.id, limit=2)
+
+        assert [post.id for post in infos.items] == [post.id for post in entities.items]
+        assert infos.next_cursor == entities.next_cursor
+        assert not hasattr(infos.items[0], '__dict__')
+
+        response = PostPageResponse.from_orm(infos)
+        assert response.items[0].user.username == 'poster'
+        assert response.items[0].thread.topic.symbol == 'GEN'
+        assert (await post_repo.get_info(infos.items[0].id)).title == 'post0'
+        assert len(await post_repo.get_info_by_user(user.id)) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_by_user_resolves_relationships(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, topic, thread = await _create_thread(session)
+        for i in range(3):
+            await post_repo.add(_post(user, thread, i))
+        session.expunge_all()
+
+        posts = await post_repo.get_by_user(user.id)
+
+        assert len(posts) == 3
+        for post in posts:
+            # Attached by the loaders, reading them issues no lazy load
+            assert post.__dict__['user'].id == user.id
+            assert post.__dict__['thread'].id == thread.id
+            assert post.thread.__dict__['topic'].id == topic.id
+
+
+@pytest.mark.asyncio
+async def test_listings_resolve_relationships_once_per_entity_type(mock_session):
+    async with mock_session() as session:
+        post_repo = PostRepository(session)
+        user, _, thread = await _create_thread(session)
+        other = User(username='other', email='other@gmail.com', name='Other')
+        other.password = 'password'
+        session.add(other)
+        await session.flush()
+        for i in range(4):
+            await post_repo.add(_post(other if i % 2 else user, thread, i))
+        session.expunge_all()
+
+        statements = []
+        record = statements.append
+        event.listen(session.sync_session, 'do_orm_execute', record)
+        page = await PostRepository(session).get_info_by_thread(thread.id)
+        queries = len(statements)
+        post = await PostRepository(session).get(page.items[0].id)
+        event.remove(session.sync_session, 'do_orm_execute', record)
+
+        # Posts, then threads, users and topics, each with one query
+        assert queries == 4
+        assert [info.user.username for info in page.items] == ['poster', 'other', 'poster', 'other']
+        assert {info.thread.topic.symbol for info in page.items} == {'GEN'}
+        assert len(statements) == 5
+        assert post.id == page.items[0].id
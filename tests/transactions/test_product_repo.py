@@ -0,0 +1,74 @@
+import sys
+import pytest
+
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.models import Currency, Product, ShopDetails, User
+from thunderbolt.market.repository.product import ProductFilter, ProductRepository, ProductSort
+
+from tests.fixtures.db import mock_session
+
+
+async def _create_catalogue(session) -> tuple[ShopDetails, ShopDetails, Currency]:
+    seller = User(username='seller', email='seller@gmail.com', name='Seller')
+    seller.password = 'password'
+    currency = Currency(name='RUB', symbol='R')
+    session.add_all([seller, currency])
+    await session.flush()
+
+    shops = [ShopDetails(seller_id=seller.id, name=f'shop{i}') for i in range(2)]
+    session.add_all(shops)
+    await session.flush()
+
+    created_at = datetime(2023, 6, 22, tzinfo=timezone.utc)
+    session.add_all(
+        Product(
+            shop_id=shops[i % 2].id,
+            name=f'product{i}',
+            image_url='https://example.com/image.png',
+            price=Decimal(10 + i),
+            currency_id=currency.id,
+            created_at=created_at + timedelta(minutes=i),
+        )
+        for i in range(10)
+    )
+    await session.flush()
+    return shops[0], shops[1], currency
+
+
+async def _browse_all(product_repo, filters, sort, limit) -> list[Product]:
+    products, cursor = [], None
+    while True:
+        page = await product_repo.browse(filters, sort, cursor=cursor, limit=limit)
+        products += page.items
+        if page.next_cursor is None:
+            return products
+        cursor = page.next_cursor
+
+
+@pytest.mark.asyncio
+async def test_browse_paginates_in_price_order(mock_session):
+    async with mock_session() as session:
+        product_repo = ProductRepository(session)
+        shop, _, _ = await _create_catalogue(session)
+
+        filters = ProductFilter(shop_id=shop.id, max_price=Decimal(16))
+        products = await _browse_all(product_repo, filters, ProductSort.PRICE_DESC, limit=2)
+
+        assert [product.name for product in products] == ['product6', 'product4', 'product2', 'product0']
+        assert await product_repo.estimate_count(filters) == 4
+
+
+@pytest.mark.asyncio
+async def test_browse_newest_first(mock_session):
+    async with mock_session() as session:
+        product_repo = ProductRepository(session)
+        await _create_catalogue(session)
+
+        products = await _browse_all(product_repo, ProductFilter(min_price=Decimal(17)), ProductSort.NEWEST, limit=1)
+
+        assert [product.name for product in products] == ['product9', 'product8', 'product7']
@@ -0,0 +1,59 @@
+import sys
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from thunderbolt.models import Post, Thread, Topic, User
+from thunderbolt.forum.repository.search import SearchRepository
+
+from tests.fixtures.db import mock_session
+
+
+async def _create_posts(session) -> Thread:
+    user = User(username='searcher', email='searcher@gmail.com', name='Searcher')
+    user.password = 'password'
+    topic = Topic(symbol='GEN', title='General')
+    thread = Thread(topic=topic, title='Connection pooling', description='Tuning the database pool')
+    session.add_all([user, topic, thread])
+    await session.flush()
+
+    session.add_all([
+        Post(thread_id=thread.id, user_id=user.id, title='Pool sizing', content='How large should the pool be?'),
+        Post(thread_id=thread.id, user_id=user.id, title='Timeouts', content='The pool timeout fires under load.'),
+        Post(thread_id=thread.id, user_id=user.id, title='Pool metrics', content='Export pool checkouts.'),
+        Post(thread_id=thread.id, user_id=user.id, title='Caching', content='Redis in front of the database.'),
+    ])
+    await session.flush()
+    return thread
+
+
+@pytest.mark.asyncio
+async def test_search_posts_ranks_and_paginates(mock_session):
+    async with mock_session() as session:
+        search_repo = SearchRepository(session)
+        await _create_posts(session)
+
+        first_page = await search_repo.search_posts('pool', limit=2)
+        second_page = await search_repo.search_posts('pool', cursor=first_page.next_cursor, limit=2)
+
+        hits = first_page.items + second_page.items
+        assert len(hits) == 3
+        assert second_page.next_cursor is None
+        assert hits[-1].title == 'Timeouts'
+        assert [hit.rank for hit in hits] == sorted((hit.rank for hit in hits), reverse=True)
+        assert '<mark>pool</mark>' in hits[-1].snippet
+
+
+@pytest.mark.asyncio
+async def test_search_threads(mock_session):
+    async with mock_session() as session:
+        search_repo = SearchRepository(session)
+        thread = await _create_posts(session)
+
+        page = await search_repo.search_threads('database pooling')
+
+        assert [hit.id for hit in page.items] == [thread.id]
+        assert page.items[0].topic_id == thread.topic_id
+        assert (await search_repo.search_threads('redis')).items == []
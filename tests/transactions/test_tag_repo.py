@@ -0,0 +1,139 @@
+import sys
+import httpx
+import pytest
+
+from pathlib import Path
+
+sys.path.append(str(Path.cwd()))
+
+from sqlalchemy import func, select
+
+from thunderbolt.main import app
+from thunderbolt.core.session import get_session
+from thunderbolt.core.broadcast import Broadcaster, get_broadcaster
+from thunderbolt.models import Job, Post, PostTags, Tag, Thread, Topic, User
+from thunderbolt.forum.repository.tag import TagRepository
+from thunderbolt.users.dependencies import get_user_by_token
+
+from tests.fixtures.db import mock_session, session_factory
+
+
+async def _create_posts(session, count: int) -> list[Post]:
+    user = User(username='tagger', email='tagger@gmail.com', name='Tagger')
+    user.password = 'password'
+    topic = Topic(symbol='GEN', title='General')
+    thread = Thread(topic=topic, title='Tags')
+    session.add_all([user, topic, thread])
+    await session.flush()
+    posts = [Post(thread_id=thread.id, user_id=user.id, title=f'post{i}', content='content') for i in range(count)]
+    session.add_all(posts)
+    await session.flush()
+    return posts
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_many_reuses_tags(mock_session):
+    async with mock_session() as session:
+        tag_repo = TagRepository(session)
+
+        first = await tag_repo.get_or_create_many(['python', 'sql'])
+        second = await tag_repo.get_or_create_many(['sql', 'redis', 'sql'])
+
+        assert sorted(second) == ['redis', 'sql']
+        assert second['sql'] == first['sql']
+
+
+@pytest.mark.asyncio
+async def test_posts_by_tag_paginate(mock_session):
+    async with mock_session() as session:
+        tag_repo = TagRepository(session)
+        posts = await _create_posts(session, 5)
+        tag_ids = await tag_repo.get_or_create_many(['python', 'sql'])
+
+        for post in posts:
+            await tag_repo.assign(post.id, [tag_ids['python']])
+        await tag_repo.assign(posts[0].id, [tag_ids['python'], tag_ids['sql']])
+
+        first_page = await tag_repo.get_post_info_by_tag(tag_ids['python'], limit=3)
+        second_page = await tag_repo.get_post_info_by_tag(tag_ids['python'], cursor=first_page.next_cursor, limit=3)
+
+        ids = [post.id for post in first_page.items + second_page.items]
+        assert ids == sorted((post.id for post in posts), reverse=True)
+        assert second_page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_reads_refreshed_counts(mock_session):
+    async with mock_session() as session:
+        tag_repo = TagRepository(session)
+        posts = await _create_posts(session, 3)
+        tag_ids = await tag_repo.get_or_create_many(['python', 'sql', 'unused'])
+
+        for post in posts:
+            await tag_repo.assign(post.id, [tag_ids['python']])
+        await tag_repo.assign(posts[0].id, [tag_ids['sql']])
+
+        assert await tag_repo.get_leaderboard() == []
+
+        await tag_repo.refresh_post_counts(tag_ids.values())
+        leaderboard = await tag_repo.get_leaderboard()
+        for tag in leaderboard:
+            await session.refresh(tag)
+        assert [(tag.name, tag.post_count) for tag in leaderboard] == [('python', 3), ('sql', 1)]
+
+        removed = await tag_repo.unassign_posts([posts[0].id])
+        assert removed == {tag_ids['python'], tag_ids['sql']}
+        await tag_repo.refresh_post_counts(removed)
+        leaderboard = await tag_repo.get_leaderboard()
+        for tag in leaderboard:
+            await session.refresh(tag)
+        assert [(tag.name, tag.post_count) for tag in leaderboard] == [('python', 2)]
+
+
+@pytest.mark.asyncio
+async def test_create_post_with_tags_over_http(session_factory):
+    async with session_factory() as session:
+        user = User(username='tagger', email='tagger@gmail.com', name='Tagger')
+        user.password = 'password'
+        topic = Topic(symbol='GEN', title='General')
+        thread = Thread(topic=topic, title='Tags')
+        session.add_all([user, topic, thread])
+        await session.commit()
+
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    broadcaster = Broadcaster(redis=None)
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_user_by_token] = lambda: user
+    app.dependency_overrides[get_broadcaster] = lambda: broadcaster
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            async with broadcaster.subscribe(f'thread:{thread.id}') as subscription:
+                response = await client.post('/forum/topics/threads/posts', json={
+                    'thread_id': str(thread.id),
+                    'title': 'Tagged',
+                    'content': 'content',
+                    'tags': ['Python', 'sql', 'python '],
+                })
+                event = await subscription.get(timeout=1)
+    finally:
+        for dependency in (get_session, get_user_by_token, get_broadcaster):
+            app.dependency_overrides.pop(dependency, None)
+
+    assert response.status_code == 200, response.text
+    assert response.json()['title'] == 'Tagged'
+    assert response.json()['user']['username'] == 'tagger'
+    assert '"post_created"' in event
+
+    async with session_factory() as session:
+        posts = (await session.execute(select(Post.id))).scalars().all()
+        tags = (await session.execute(select(Tag.name).order_by(Tag.name))).scalars().all()
+        assigned = (await session.execute(select(func.count()).select_from(PostTags))).scalar_one()
+        jobs = (await session.execute(select(Job.name))).scalars().all()
+
+    assert [str(post_id) for post_id in posts] == [response.json()['id']]
+    assert tags == ['python', 'sql']
+    assert assigned == 2
+    assert jobs == ['forum.refresh_tag_counts']
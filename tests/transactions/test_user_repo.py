@@ -1,4 +1,5 @@
 import sys
+import httpx
 import pytest
 
 from pathlib import Path
@@ -8,10 +9,13 @@ from sqlalchemy import select
 # NOTE: Fucking bullshit 
 sys.path.append(str(Path.cwd()))
 
+from thunderbolt.main import app
+from thunderbolt.core.session import get_session
 from thunderbolt.models.user import User
-from thunderbolt.user.repository import UserRepository
+from thunderbolt.users.repository import UserRepository
+from thunderbolt.users.services import UserService
 
-from tests.fixtures.db import mock_session
+from tests.fixtures.db import mock_session, session_factory
 
 
 @pytest.mark.asyncio
@@ -22,7 +26,8 @@ async def test_user_creation(mock_session):
 
         user = User(
             username=mock_username,
-            email='example@gmail.com'
+            email='example@gmail.com',
+            name='Test User',
         )
         user.password = 'test_password'
 
@@ -39,7 +44,7 @@ async def test_user_creation(mock_session):
 async def test_user_update(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        user = User(username='test', email='test@gmail.com')
+        user = User(username='test', email='test@gmail.com', name='Test')
         user.password = 'password'
 
         await user_repo.add(user)
@@ -58,7 +63,7 @@ async def test_user_update(mock_session):
 async def test_get_user(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        user = User(username='test', email='test@gmail.com')
+        user = User(username='test', email='test@gmail.com', name='Test')
         user.password = 'password'
 
         await user_repo.add(user)
@@ -72,7 +77,7 @@ async def test_get_user(mock_session):
 async def test_get_user_by_username(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        user = User(username='test', email='test@gmail.com')
+        user = User(username='test', email='test@gmail.com', name='Test')
         user.password = 'password'
 
         await user_repo.add(user)
@@ -86,7 +91,7 @@ async def test_get_user_by_username(mock_session):
 async def test_get_user_by_email(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        user = User(username='test', email='test@gmail.com')
+        user = User(username='test', email='test@gmail.com', name='Test')
         user.password = 'password'
 
         await user_repo.add(user)
@@ -100,7 +105,7 @@ async def test_get_user_by_email(mock_session):
 async def test_get_all_users(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        users = [User(username=f'user{i}', email=f'user{i}@gmail.com') for i in range(5)]
+        users = [User(username=f'user{i}', email=f'user{i}@gmail.com', name=f'User {i}') for i in range(5)]
         
         for user in users:
             user.password = 'password'
@@ -115,7 +120,7 @@ async def test_get_all_users(mock_session):
 async def test_delete_user(mock_session):
     async with mock_session() as session:
         user_repo = UserRepository(session)
-        user = User(username='test', email='test@gmail.com')
+        user = User(username='test', email='test@gmail.com', name='Test')
         user.password = 'password'
 
         await user_repo.add(user)
@@ -126,3 +131,33 @@ async def test_delete_user(mock_session):
         deleted_user = result.scalars().first()
 
         assert deleted_user is None
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected(session_factory):
+    async with session_factory() as session:
+        user = User(username='test', email='test@gmail.com', name='Test')
+        user.password = 'password'
+        await UserRepository(session).add(user)
+        await session.commit()
+        token = UserService(UserRepository(session), session).create_token(user).access_token
+
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    headers = {'Authorization': f'Bearer {token}'}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            revoked = await client.post('/token/revoke', headers=headers)
+            replayed = await client.post('/token/revoke', headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+    async with session_factory() as session:
+        token_version = (await session.execute(select(User.token_version))).scalar_one()
+
+    assert revoked.status_code == 204
+    assert replayed.status_code == 401
+    assert token_version == 1
@@ -5,11 +5,12 @@ from pathlib import Path
 # Add the thunderbolt package to the path
 sys.path.append(str(Path.cwd()))
 
-from thunderbolt.core import settings, security, session
+from thunderbolt.core import settings, security, session, cache
 
 
 __all__ = (
     "settings",
     "security",
     "session",
+    "cache",
 )
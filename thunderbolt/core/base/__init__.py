@@ -1,6 +1,6 @@
-
-from .repository import AbstractRepository
+from .repository import AbstractRepository, iter_chunks
 
 __all__ = (
     'AbstractRepository',
+    'iter_chunks',
 )
@@ -1,8 +1,56 @@
-
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, ClassVar, Iterable, Iterator, Mapping, Optional, Sequence
+
+from sqlalchemy import delete, func, inspect, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import functions
+
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.metrics import instrument_methods
+
+
+settings = get_settings()
+
+UPSERT_DIALECTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def iter_chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        iterable (Iterable): The items, consumed lazily.
+        size (int): Chunk size.
+
+    Yields:
+        list: Chunks of items.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 class AbstractRepository(ABC):
+    """
+    Base repository.
+
+    Concrete repositories set `model` and keep their session in `_session` to
+    get the bulk operations `add_many`, `upsert_many` and `delete_many`. These
+    work on the table directly: rows are sent in chunks of
+    `settings.BULK_CHUNK_SIZE`, bypassing the unit of work and the identity map.
+    """
+    model: ClassVar[Optional[type]] = None
+    _session: AsyncSession
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls)
 
     @abstractmethod
     def add(self, entity):
@@ -23,3 +71,163 @@ class AbstractRepository(ABC):
     def delete(self, id):
         """Delete an entity from the repository by its ID."""
         raise NotImplementedError("delete method must be defined in a concrete implementation")
+
+    async def add_many(self, entities: Iterable, chunk_size: Optional[int] = None) -> int:
+        """
+        Insert many entities.
+
+        On Postgres with asyncpg every chunk is streamed with ``COPY``, other
+        databases get one multi-row ``INSERT`` per chunk.
+
+        Args:
+            entities (Iterable): Model instances or mappings of column values.
+            chunk_size (Optional[int]): Rows per round-trip, defaults to `settings.BULK_CHUNK_SIZE`.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        table = self.model.__table__
+        use_copy = settings.BULK_USE_COPY and self._driver_name() == 'asyncpg'
+
+        count = 0
+        for chunk in iter_chunks(entities, chunk_size or settings.BULK_CHUNK_SIZE):
+            rows = self._to_rows(chunk)
+            if use_copy:
+                await self._copy_rows(rows)
+            else:
+                await self._session.execute(insert(table), rows)
+            count += len(rows)
+        return count
+
+    async def upsert_many(
+        self,
+        entities: Iterable,
+        conflict_columns: Sequence[str] = ('id',),
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Insert many entities, updating the rows that already exist.
+
+        Executed as ``INSERT ... ON CONFLICT DO UPDATE`` per chunk. Only the
+        columns present in the first entity of a chunk are updated.
+
+        Args:
+            entities (Iterable): Model instances or mappings of column values.
+            conflict_columns (Sequence[str]): Columns of the unique index identifying a row.
+            chunk_size (Optional[int]): Rows per round-trip, defaults to `settings.BULK_CHUNK_SIZE`.
+
+        Raises:
+            NotImplementedError: If the database has no upsert support.
+
+        Returns:
+            int: Number of inserted or updated rows.
+        """
+        dialect_insert = UPSERT_DIALECTS.get(self._dialect_name())
+        if dialect_insert is None:
+            raise NotImplementedError(f"Upsert is not supported on {self._dialect_name()}")
+
+        table = self.model.__table__
+        count = 0
+        for chunk in iter_chunks(entities, chunk_size or settings.BULK_CHUNK_SIZE):
+            provided = self._entity_values(chunk[0]).keys()
+            rows = self._to_rows(chunk)
+
+            stmt = dialect_insert(table)
+            values = {
+                key: stmt.excluded[key]
+                for key in provided
+                if key not in conflict_columns and key not in ('id', 'created_at')
+            }
+            if 'updated_at' in table.c:
+                values['updated_at'] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=values)
+
+            await self._session.execute(stmt, rows)
+            count += len(rows)
+        return count
+
+    async def delete_many(self, ids: Iterable, chunk_size: Optional[int] = None) -> int:
+        """
+        Delete many entities by id.
+
+        Args:
+            ids (Iterable): Ids of the entities.
+            chunk_size (Optional[int]): Ids per statement, defaults to `settings.BULK_CHUNK_SIZE`.
+
+        Returns:
+            int: Number of deleted rows.
+        """
+        table = self.model.__table__
+        count = 0
+        for chunk in iter_chunks(ids, chunk_size or settings.BULK_CHUNK_SIZE):
+            result = await self._session.execute(delete(table).where(table.c.id.in_(chunk)))
+            count += result.rowcount
+        return count
+
+    def _dialect_name(self) -> str:
+        return self._session.bind.dialect.name
+
+    def _driver_name(self) -> str:
+        return self._session.bind.dialect.driver
+
+    def _entity_values(self, entity: Any) -> dict:
+        columns = self.model.__table__.c
+        if isinstance(entity, Mapping):
+            values = entity
+        else:
+            values = inspect(entity).dict
+        return {key: value for key, value in values.items() if key in columns}
+
+    def _to_rows(self, entities: list) -> list[dict]:
+        # Every row of a chunk must carry the same columns, so client side
+        # defaults are applied here, also for COPY which would skip them.
+        # Columns with only a server default are left to the database, which
+        # needs every row to leave them out.
+        table = self.model.__table__
+        now = datetime.now(timezone.utc)
+        rows = []
+        for entity in entities:
+            row = self._entity_values(entity)
+            for column in table.columns:
+                if column.key in row or column.computed is not None:
+                    continue
+                default = column.default
+                if default is None:
+                    if column.server_default is None:
+                        row[column.key] = None
+                elif default.is_scalar:
+                    row[column.key] = default.arg
+                elif default.is_callable:
+                    row[column.key] = default.arg(None)
+                elif isinstance(default.arg, functions.now):
+                    row[column.key] = now
+                else:
+                    raise ValueError(
+                        f"{table.name}.{column.key} has a SQL expression default, set it on every row"
+                    )
+            rows.append(row)
+
+        keys = set(rows[0]) if rows else set()
+        for row in rows:
+            if row.keys() != keys:
+                missing = sorted(keys.symmetric_difference(row))
+                raise ValueError(f"Rows of {table.name} differ in {', '.join(missing)}, set them on every row")
+        return rows
+
+    async def _copy_rows(self, rows: list[dict]) -> None:
+        table = self.model.__table__
+        connection = await self._session.connection()
+        # The driver opens its transaction lazily, COPY must run inside it
+        await connection.exec_driver_sql('SELECT 1')
+        raw_connection = await connection.get_raw_connection()
+
+        columns = list(rows[0])
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+
+
+# Subclasses are instrumented by __init_subclass__, the bulk operations here
+instrument_methods(AbstractRepository)
@@ -0,0 +1,320 @@
+
+"""
+Publish/subscribe fan-out over Redis.
+
+Every worker holds a single Redis pub/sub connection, subscribed to the
+channels that have at least one local watcher, and a reader task dispatching
+incoming messages to the local subscriptions. A watcher costs one bounded
+queue in memory and nothing in the database, however many there are.
+
+Each subscription queue holds at most `settings.BROADCAST_QUEUE_SIZE`
+messages. A consumer that falls that far behind is evicted instead of making
+the worker buffer without bound; it is expected to reconnect and reload.
+
+Without Redis, or while it is unreachable, messages are only delivered to the
+subscribers of the publishing worker. A channel that failed to subscribe is
+retried every `settings.CACHE_RETRY_INTERVAL` seconds while it has watchers.
+
+Messages about database writes are published with `publish_on_commit`, once
+the transaction is committed, so watchers never see a write that is rolled
+back or not visible yet.
+"""
+
+import asyncio
+import logging
+
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from thunderbolt.core.cache import dumps
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerError(Exception):
+    """
+    Raised to a subscriber that was evicted for not keeping up.
+    """
+
+
+class Subscription:
+    """
+    Bounded queue of the messages of a channel for a single consumer.
+    """
+
+    def __init__(self, channel: str, max_queue: int) -> None:
+        self.channel = channel
+        self.evicted = False
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+
+    def deliver(self, message: str) -> None:
+        if self.evicted:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.evicted = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, None to wait forever.
+
+        Raises:
+            SlowConsumerError: If the subscription was evicted.
+
+        Returns:
+            Optional[str]: The message, None if the timeout expired first.
+        """
+        if self.evicted:
+            raise SlowConsumerError(self.channel)
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broadcaster:
+    """
+    Channel based fan-out to the subscribers of every worker.
+    """
+
+    def __init__(self, redis: Optional[aioredis.Redis] = None, prefix: str = 'thunderbolt:broadcast') -> None:
+        self._redis = redis
+        self._prefix = prefix
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        # Channels with watchers whose Redis subscription failed
+        self._unsubscribed: set[str] = set()
+        self._retrier: Optional[asyncio.Task] = None
+
+    def _key(self, channel: str) -> str:
+        return f'{self._prefix}:{channel}'
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscriptions.get(channel, ()))
+
+    async def publish(self, channel: str, message: Any) -> None:
+        """
+        Publish a message to every subscriber of a channel.
+
+        Args:
+            channel (str): The channel.
+            message (Any): JSON serializable message.
+        """
+        raw = dumps(message)
+        if self._redis is not None:
+            try:
+                await self._redis.publish(self._key(channel), raw)
+                return
+            except (RedisError, OSError) as e:
+                logger.warning("Redis is unavailable, delivering to local subscribers only: %s", e)
+        self._deliver(channel, raw)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str, max_queue: Optional[int] = None) -> AsyncIterator[Subscription]:
+        """
+        Subscribe to a channel for the duration of the context.
+
+        Args:
+            channel (str): The channel.
+            max_queue (Optional[int]): Queue bound, defaults to `settings.BROADCAST_QUEUE_SIZE`.
+
+        Yields:
+            Subscription: The subscription.
+        """
+        subscription = Subscription(channel, max_queue or settings.BROADCAST_QUEUE_SIZE)
+        subscriptions = self._subscriptions[channel]
+        first = not subscriptions
+        subscriptions.add(subscription)
+        try:
+            if first and self._redis is not None:
+                await self._redis_subscribe(channel)
+            yield subscription
+        finally:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(channel, None)
+                self._unsubscribed.discard(channel)
+                if self._pubsub is not None:
+                    try:
+                        await self._pubsub.unsubscribe(self._key(channel))
+                    except (RedisError, OSError) as e:
+                        logger.warning("Failed to unsubscribe from %s: %s", channel, e)
+
+    async def _redis_subscribe(self, channel: str) -> bool:
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await self._pubsub.subscribe(self._key(channel))
+        except (RedisError, OSError) as e:
+            logger.warning("Failed to subscribe to %s, local messages only until retried: %s", channel, e)
+            self._unsubscribed.add(channel)
+            if self._retrier is None or self._retrier.done():
+                self._retrier = asyncio.create_task(self._retry())
+            return False
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        return True
+
+    async def _retry(self) -> None:
+        while self._unsubscribed:
+            await asyncio.sleep(settings.CACHE_RETRY_INTERVAL)
+            for channel in tuple(self._unsubscribed):
+                self._unsubscribed.discard(channel)
+                # Watchers may have left while waiting
+                if self._subscriptions.get(channel) and await self._redis_subscribe(channel):
+                    logger.info("Subscribed to %s", channel)
+
+    async def _read(self) -> None:
+        prefix_length = len(self._prefix) + 1
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except (RedisError, OSError) as e:
+                logger.warning("Redis pub/sub connection failed: %s", e)
+                await asyncio.sleep(settings.CACHE_RETRY_INTERVAL)
+                continue
+            if message is not None and message['type'] == 'message':
+                self._deliver(message['channel'][prefix_length:], message['data'])
+
+    def _deliver(self, channel: str, raw: str) -> None:
+        for subscription in tuple(self._subscriptions.get(channel, ())):
+            subscription.deliver(raw)
+
+    async def close(self) -> None:
+        """
+        Stop the reader and retry tasks and close the pub/sub connection.
+        """
+        for task in (self._reader, self._retrier):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reader = self._retrier = None
+        self._unsubscribed.clear()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+
+# Key of the messages of a session waiting for its commit
+_PENDING_KEY = 'broadcast_messages'
+# Publications scheduled by a commit, referenced until they are done
+_publish_tasks: set[asyncio.Task] = set()
+
+
+def publish_on_commit(session: AsyncSession, broadcaster: Broadcaster, channel: str, message: Any) -> None:
+    """
+    Publish a message once the session commits, not at all if it rolls back.
+
+    Messages are published in the order they were added.
+
+    Args:
+        session (AsyncSession): Session of the write.
+        broadcaster (Broadcaster): The broadcaster.
+        channel (str): The channel.
+        message (Any): JSON serializable message.
+    """
+    pending = session.sync_session.info.setdefault(_PENDING_KEY, [])
+    pending.append((broadcaster, channel, message))
+
+
+async def _publish_all(messages: list[tuple[Broadcaster, str, Any]]) -> None:
+    for broadcaster, channel, message in messages:
+        try:
+            await broadcaster.publish(channel, message)
+        except Exception:
+            logger.exception("Failed to publish to %s", channel)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    task = asyncio.get_running_loop().create_task(_publish_all(pending))
+    _publish_tasks.add(task)
+    task.add_done_callback(_publish_tasks.discard)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_messages(session: Session, transaction) -> None:
+    # Runs after `after_commit`, anything left was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+async def sse_stream(broadcaster: Broadcaster, channel: str) -> AsyncIterator[str]:
+    """
+    Stream the messages of a channel as Server-Sent Events.
+
+    A comment is sent every `settings.BROADCAST_HEARTBEAT_INTERVAL` seconds
+    without messages, so proxies keep the connection open and dead clients
+    are detected. An evicted consumer gets an ``evicted`` event and the stream
+    ends.
+
+    Args:
+        broadcaster (Broadcaster): The broadcaster.
+        channel (str): The channel.
+
+    Yields:
+        str: Event stream chunks.
+    """
+    async with broadcaster.subscribe(channel) as subscription:
+        yield f'retry: {settings.BROADCAST_RETRY_MS}\n\n'
+        while True:
+            try:
+                message = await subscription.get(timeout=settings.BROADCAST_HEARTBEAT_INTERVAL)
+            except SlowConsumerError:
+                yield 'event: evicted\ndata: {}\n\n'
+                return
+            yield ': ping\n\n' if message is None else f'data: {message}\n\n'
+
+
+_broadcaster: Optional[Broadcaster] = None
+
+
+def get_broadcaster() -> Broadcaster:
+    """
+    Get the process wide broadcaster.
+
+    Returns:
+        Broadcaster: The broadcaster instance.
+    """
+    global _broadcaster
+    if _broadcaster is None:
+        redis = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        _broadcaster = Broadcaster(redis)
+    return _broadcaster
+
+
+async def close_broadcaster() -> None:
+    """
+    Close the process wide broadcaster, if it was created.
+    """
+    global _broadcaster
+    if _broadcaster is not None:
+        await _broadcaster.close()
+        _broadcaster = None
@@ -0,0 +1,335 @@
+
+"""
+Read-through cache backed by Redis with an in-process fallback.
+
+Entries live under versioned namespaces: a key is stored as
+``<prefix>:<namespace>:v<version>:<key>``, and invalidating a namespace only bumps
+its version counter, so stale entries are never read again and simply expire by TTL.
+
+When Redis is unreachable the cache switches to a bounded in-process store for
+`settings.CACHE_RETRY_INTERVAL` seconds before trying Redis again. Invalidations
+made by other workers are not visible in that mode, so staleness is bounded by
+`settings.CACHE_TTL`.
+
+Writers invalidate with `invalidate_on_commit`: the versions are bumped once
+the session commits, never before, so a concurrent reader can't cache rows of
+the old transaction under the new version.
+"""
+
+import json
+import time
+import uuid
+import asyncio
+import logging
+
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, default=_default, separators=(',', ':'))
+
+
+def loads(raw: str) -> Any:
+    return json.loads(raw)
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU store with per-entry expiry.
+
+    Used as a fallback when Redis is unavailable, and for short lived
+    per-worker caches.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        value = int(self.get(key) or 0) + 1
+        self.set(key, str(value), settings.CACHE_VERSION_TTL)
+        return value
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class Cache:
+    """
+    Versioned read-through cache.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[aioredis.Redis] = None,
+        prefix: str = 'thunderbolt',
+        ttl: Optional[int] = None,
+    ) -> None:
+        self._redis = redis
+        self._prefix = prefix
+        self._ttl = ttl or settings.CACHE_TTL
+        self._local = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES)
+        self._redis_down_until = 0.0
+
+    @property
+    def _redis_available(self) -> bool:
+        return self._redis is not None and self._redis_down_until <= time.monotonic()
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        logger.warning("Redis is unavailable, using in-process cache: %s", error)
+        self._redis_down_until = time.monotonic() + settings.CACHE_RETRY_INTERVAL
+
+    def _version_key(self, namespace: str) -> str:
+        return f'{self._prefix}:{namespace}:version'
+
+    async def _version(self, namespace: str) -> int:
+        key = self._version_key(namespace)
+        if self._redis_available:
+            try:
+                return int(await self._redis.get(key) or 0)
+            except (RedisError, OSError) as e:
+                self._mark_redis_down(e)
+        return int(self._local.get(key) or 0)
+
+    async def _key(self, namespace: str, key: str) -> str:
+        version = await self._version(namespace)
+        return f'{self._prefix}:{namespace}:v{version}:{key}'
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            namespace (str): Cache namespace.
+            key (str): Key inside the namespace.
+
+        Returns:
+            Optional[Any]: The cached value, None on a miss.
+        """
+        full_key = await self._key(namespace, key)
+        raw = None
+        if self._redis_available:
+            try:
+                raw = await self._redis.get(full_key)
+            except (RedisError, OSError) as e:
+                self._mark_redis_down(e)
+        if raw is None and not self._redis_available:
+            raw = self._local.get(full_key)
+        return loads(raw) if raw is not None else None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            namespace (str): Cache namespace.
+            key (str): Key inside the namespace.
+            value (Any): JSON serializable value.
+            ttl (Optional[int]): Time to live in seconds.
+        """
+        full_key = await self._key(namespace, key)
+        raw = dumps(value)
+        ttl = ttl or self._ttl
+        if self._redis_available:
+            try:
+                await self._redis.set(full_key, raw, ex=ttl)
+                return
+            except (RedisError, OSError) as e:
+                self._mark_redis_down(e)
+        self._local.set(full_key, raw, ttl)
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """
+        Get a cached value, loading and storing it on a miss.
+
+        Args:
+            namespace (str): Cache namespace.
+            key (str): Key inside the namespace.
+            loader (Callable): Coroutine function producing the value.
+            ttl (Optional[int]): Time to live in seconds.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        if not settings.CACHE_ENABLED:
+            return await loader()
+        value = await self.get(namespace, key)
+        if value is None:
+            value = await loader()
+            await self.set(namespace, key, value, ttl)
+        return value
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """
+        Invalidate every entry of the given namespaces.
+
+        Args:
+            *namespaces (str): Namespaces to invalidate.
+        """
+        for namespace in namespaces:
+            key = self._version_key(namespace)
+            self._local.incr(key)
+            if self._redis_available:
+                try:
+                    await self._redis.incr(key)
+                except (RedisError, OSError) as e:
+                    self._mark_redis_down(e)
+
+
+# Key of the invalidations of a session waiting for its commit
+_PENDING_KEY = 'cache_invalidations'
+# Invalidations scheduled by a commit, referenced until they are done
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+def invalidate_on_commit(session: AsyncSession, cache: Cache, *namespaces: str) -> None:
+    """
+    Invalidate namespaces once the session commits, not at all if it rolls back.
+
+    Args:
+        session (AsyncSession): Session of the write.
+        cache (Cache): The cache.
+        *namespaces (str): Namespaces to invalidate.
+    """
+    pending = session.sync_session.info.setdefault(_PENDING_KEY, {})
+    pending.setdefault(cache, set()).update(namespaces)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    loop = asyncio.get_running_loop()
+    for cache, namespaces in pending.items():
+        task = loop.create_task(cache.invalidate(*sorted(namespaces)))
+        _invalidation_tasks.add(task)
+        task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_invalidations(session: Session, transaction) -> None:
+    # Runs after `after_commit`, anything left was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+_cache: Optional[Cache] = None
+
+
+def get_cache() -> Cache:
+    """
+    Get the process wide cache.
+
+    Returns:
+        Cache: The cache instance.
+    """
+    global _cache
+    if _cache is None:
+        redis = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        _cache = Cache(redis)
+    return _cache
+
+
+def entity_to_dict(entity) -> dict:
+    """
+    Dump the column values of an ORM entity.
+
+    Args:
+        entity: ORM entity.
+
+    Returns:
+        dict: Column values by attribute name.
+    """
+    return {column.key: getattr(entity, column.key) for column in entity.__table__.columns}
+
+
+def _load_column(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def entity_from_dict(model, data: dict):
+    """
+    Build a transient ORM entity from `entity_to_dict` output.
+
+    The entity is not attached to any session and must be treated as read-only.
+
+    Args:
+        model: ORM model class.
+        data (dict): Column values.
+
+    Returns:
+        The entity.
+    """
+    columns = model.__table__.columns
+    return model(**{
+        key: _load_column(columns[key], value)
+        for key, value in data.items()
+        if key in columns
+    })
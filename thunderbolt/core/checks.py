@@ -0,0 +1,163 @@
+
+"""
+Static checks of repository queries.
+
+`find_unindexed_filters` parses the package sources and reports every model
+column compared inside a `.where()` or `.filter()` call that is not the leading
+column of an index, a unique constraint or the primary key, so the filter can
+be served by an index range scan. A later column of a composite index counts
+as indexed when the columns before it are filtered in the same call. Run it with:
+
+    python -m thunderbolt.core.checks
+"""
+
+import ast
+import sys
+
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import Table, UniqueConstraint
+
+import thunderbolt.models  # noqa: F401, registers every model
+from thunderbolt.models.base import ThunderboltModel
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+FILTER_METHODS = ('where', 'filter')
+
+
+@dataclass
+class UnindexedFilter:
+    """
+    A filter on a column without a supporting index.
+    """
+    path: Path
+    lineno: int
+    model: str
+    column: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f'{self.path}:{self.lineno}: {self.model}.{self.column} {self.reason}'
+
+
+def get_model_tables() -> dict[str, Table]:
+    """
+    Get the tables of all mapped models by class name.
+
+    Returns:
+        dict[str, Table]: Tables by model class name.
+    """
+    return {
+        mapper.class_.__name__: mapper.local_table
+        for mapper in ThunderboltModel.registry.mappers
+    }
+
+
+def get_index_columns(table: Table) -> list[tuple[str, ...]]:
+    """
+    Get the columns of every index, unique constraint and the primary key.
+
+    Args:
+        table (Table): The table.
+
+    Returns:
+        list[tuple[str, ...]]: Column names, in index order.
+    """
+    keys = [tuple(column.name for column in table.primary_key.columns)]
+    keys.extend(tuple(column.name for column in index.columns) for index in table.indexes)
+    keys.extend(
+        tuple(column.name for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    )
+    return [key for key in keys if key]
+
+
+def get_indexed_columns(table: Table) -> set[str]:
+    """
+    Get the columns that lead an index, a unique constraint or the primary key.
+
+    Args:
+        table (Table): The table.
+
+    Returns:
+        set[str]: Column names.
+    """
+    return {key[0] for key in get_index_columns(table)}
+
+
+def _is_indexed(column: str, filtered: set[str], keys: list[tuple[str, ...]]) -> bool:
+    # Some index has the column after only columns filtered alongside it
+    for key in keys:
+        if column in key and set(key[:key.index(column)]) <= filtered:
+            return True
+    return False
+
+
+def _filtered_attributes(tree: ast.AST) -> Iterable[list[ast.Attribute]]:
+    # Attributes compared in every filter call, grouped by call
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in FILTER_METHODS
+        ):
+            continue
+        attributes = []
+        for arg in node.args:
+            for sub in ast.walk(arg):
+                if not isinstance(sub, ast.Compare):
+                    continue
+                for operand in (sub.left, *sub.comparators):
+                    if isinstance(operand, ast.Attribute) and isinstance(operand.value, ast.Name):
+                        attributes.append(operand)
+        yield attributes
+
+
+def find_unindexed_filters(paths: Optional[Iterable[Path]] = None) -> list[UnindexedFilter]:
+    """
+    Find filtered columns without a supporting index.
+
+    Args:
+        paths (Optional[Iterable[Path]]): Source files, defaults to the whole package.
+
+    Returns:
+        list[UnindexedFilter]: Offending filters.
+    """
+    if paths is None:
+        paths = sorted(PACKAGE_ROOT.rglob('*.py'))
+
+    tables = get_model_tables()
+    keys = {name: get_index_columns(table) for name, table in tables.items()}
+
+    problems = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(), filename=str(path))
+        for attributes in _filtered_attributes(tree):
+            filtered: dict[str, set[str]] = {}
+            for attribute in attributes:
+                filtered.setdefault(attribute.value.id, set()).add(attribute.attr)
+            for attribute in attributes:
+                model = attribute.value.id
+                if model not in tables:
+                    continue
+                column = attribute.attr
+                if column not in tables[model].columns:
+                    problems.append(UnindexedFilter(path, attribute.lineno, model, column, 'is not a column'))
+                elif not _is_indexed(column, filtered[model], keys[model]):
+                    problems.append(UnindexedFilter(path, attribute.lineno, model, column, 'has no index'))
+    return problems
+
+
+def main() -> int:
+    problems = find_unindexed_filters()
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
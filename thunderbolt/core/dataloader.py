@@ -0,0 +1,138 @@
+
+"""
+Request-scoped batching loader.
+
+`DataLoader.load` returns a future instead of querying right away. Every key
+requested during the same event loop iteration is collected and fetched by a
+single call to the batch function on the next iteration, and the result of
+every key is memoized for the life of the loader, i.e. of the request:
+
+    users = DataLoader(load_users_by_id)
+    authors = await asyncio.gather(*(users.load(post.user_id) for post in posts))
+
+issues one query however many posts, and however many of them share an author.
+"""
+
+import asyncio
+
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, Mapping, Optional, TypeVar
+
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import ColumnElement
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+BatchLoad = Callable[[list], Awaitable[Mapping[Any, Any]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batching, memoizing loader of values by key.
+    """
+
+    def __init__(self, batch_load: BatchLoad, lock: Optional[asyncio.Lock] = None) -> None:
+        """
+        Initialize the DataLoader class.
+
+        Args:
+            batch_load (BatchLoad): Coroutine function mapping a list of keys
+                to a mapping of the values found.
+            lock (Optional[asyncio.Lock]): Lock serializing batches of loaders
+                sharing a resource, e.g. a session.
+        """
+        self._batch_load = batch_load
+        self._lock = lock or asyncio.Lock()
+        self._futures: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, key: K) -> Awaitable[Optional[V]]:
+        """
+        Load a value.
+
+        Args:
+            key (K): The key.
+
+        Returns:
+            Awaitable[Optional[V]]: The value, None if the batch did not return it.
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[Optional[V]]:
+        """
+        Load many values, in the order of the keys.
+
+        Args:
+            keys (Iterable[K]): The keys.
+
+        Returns:
+            list[Optional[V]]: The values.
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """
+        Memoize a value already at hand.
+
+        Args:
+            key (K): The key.
+            value (V): The value.
+        """
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: list[K]) -> None:
+        try:
+            async with self._lock:
+                values = await self._batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                # Forget failed keys so a later load retries them
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+def id_in(column: ColumnElement, ids: list, dialect_name: str) -> ColumnElement:
+    """
+    Filter a column on a list of ids.
+
+    On Postgres the ids are bound as a single array, ``column = ANY(:ids)``,
+    so the statement text, and its prepared plan, is the same for any number
+    of ids. Other databases get an expanding ``IN``.
+
+    Args:
+        column (ColumnElement): The id column.
+        ids (list): The ids.
+        dialect_name (str): Name of the database dialect.
+
+    Returns:
+        ColumnElement: The filter.
+    """
+    if dialect_name == 'postgresql':
+        return column == any_(bindparam('ids', ids, type_=ARRAY(column.type)))
+    return column.in_(ids)
@@ -0,0 +1,283 @@
+
+"""
+Per-request query diagnostics, for development and staging.
+
+With `settings.DEBUG` or `settings.DIAGNOSTICS_ENABLED` every statement
+executed while serving a request is recorded with its duration and the
+application frames that issued it. When the request is over its report is
+logged as JSON if the request:
+
+- ran more than `settings.DIAGNOSTICS_MAX_QUERIES` statements,
+- spent more than `settings.DIAGNOSTICS_MAX_DB_TIME` seconds in the database,
+- ran the same statement shape `settings.DIAGNOSTICS_REPEAT_THRESHOLD` times
+  or more, the signature of an N+1 pattern such as loading the topic of every
+  thread one at a time,
+- or ran a statement slower than `settings.DIAGNOSTICS_SLOW_QUERY`.
+
+Slow statements are also logged on their own as they complete, inside a
+request or not. Recording walks the stack on every statement, it is not meant
+to be left on in production.
+
+Tests can assert on the statements of a block of code directly:
+
+    with capture_queries() as recorder:
+        await thread_repo.get_all_threads_by_topic(topic_id)
+    assert not recorder.repeated_statements()
+"""
+
+import re
+import sys
+import time
+import logging
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from traceback import FrameSummary, extract_stack
+from typing import Iterator, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from thunderbolt.core.cache import dumps
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ENABLED = settings.DEBUG or settings.DIAGNOSTICS_ENABLED
+
+# Frames of the application, everything else is library code
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+STACK_DEPTH = 8
+STACKS_PER_STATEMENT = 3
+
+_PLACEHOLDER = r'(?:\?|\$\d+|%\(\w+\)s|:\w+)'
+_PLACEHOLDER_LIST = re.compile(rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)')
+_NUMBERED_PLACEHOLDER = re.compile(r'\$\d+')
+_WHITESPACE = re.compile(r'\s+')
+
+_recorder: ContextVar[Optional['QueryRecorder']] = ContextVar('diagnostics_recorder', default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so that executions differing only by parameters compare equal.
+
+    Args:
+        statement (str): SQL statement, as sent to the driver.
+
+    Returns:
+        str: The statement with whitespace collapsed and placeholder lists,
+            e.g. an expanded ``IN``, reduced to ``(...)``.
+    """
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _PLACEHOLDER_LIST.sub('(...)', statement)
+    return _NUMBERED_PLACEHOLDER.sub('$n', statement)
+
+
+def _application_stack() -> list[str]:
+    # Statements run in a greenlet spawned by the async session, the awaiting
+    # coroutines are on the stack of its parent greenlets.
+    frames: list[FrameSummary] = extract_stack(sys._getframe(1))
+    greenlet = getcurrent().parent
+    while greenlet is not None:
+        if greenlet.gr_frame is not None:
+            frames = extract_stack(greenlet.gr_frame) + frames
+        greenlet = greenlet.parent
+
+    stack = [
+        f'{frame.filename[len(PROJECT_ROOT) + 1:]}:{frame.lineno} in {frame.name}'
+        for frame in frames
+        if frame.filename.startswith(PROJECT_ROOT)
+        and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return stack[-STACK_DEPTH:]
+
+
+@dataclass(slots=True)
+class QueryRecord:
+    statement: str
+    shape: str
+    duration: float
+    stack: list[str]
+
+
+@dataclass
+class QueryRecorder:
+    """
+    Statements executed in a context, with the frames that issued them.
+    """
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> list[dict]:
+        """
+        Find statement shapes executed at least `threshold` times.
+
+        Args:
+            threshold (Optional[int]): Defaults to `settings.DIAGNOSTICS_REPEAT_THRESHOLD`.
+
+        Returns:
+            list[dict]: Shape, count and distinct call stacks of each repeated
+                statement, most repeated first.
+        """
+        threshold = threshold or settings.DIAGNOSTICS_REPEAT_THRESHOLD
+        by_shape: dict[str, list[QueryRecord]] = defaultdict(list)
+        for query in self.queries:
+            by_shape[query.shape].append(query)
+
+        repeated = []
+        for shape, queries in by_shape.items():
+            if len(queries) < threshold:
+                continue
+            stacks = []
+            for query in queries:
+                if query.stack not in stacks:
+                    stacks.append(query.stack)
+            repeated.append({
+                'statement': shape,
+                'count': len(queries),
+                'db_time': sum(query.duration for query in queries),
+                'stacks': stacks[:STACKS_PER_STATEMENT],
+            })
+        return sorted(repeated, key=lambda item: item['count'], reverse=True)
+
+    def slow_statements(self, threshold: Optional[float] = None) -> list[dict]:
+        threshold = threshold or settings.DIAGNOSTICS_SLOW_QUERY
+        return [
+            {'statement': query.statement, 'duration': query.duration, 'stack': query.stack}
+            for query in self.queries
+            if query.duration >= threshold
+        ]
+
+    def report(self) -> dict:
+        """
+        Build the diagnostics report.
+
+        Returns:
+            dict: Totals, the thresholds that were exceeded under ``violations``,
+                the repeated and the slow statements.
+        """
+        repeated = self.repeated_statements()
+        slow = self.slow_statements()
+        violations = []
+        if self.count > settings.DIAGNOSTICS_MAX_QUERIES:
+            violations.append('query_count')
+        if self.db_time > settings.DIAGNOSTICS_MAX_DB_TIME:
+            violations.append('db_time')
+        if repeated:
+            violations.append('repeated_statements')
+        if slow:
+            violations.append('slow_statements')
+        return {
+            'query_count': self.count,
+            'db_time': round(self.db_time, 6),
+            'violations': violations,
+            'repeated_statements': repeated,
+            'slow_statements': slow,
+        }
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryRecorder]:
+    """
+    Record the statements executed in the context.
+
+    Only engines passed to `install_query_hooks` are recorded.
+
+    Yields:
+        QueryRecorder: The recorder.
+    """
+    recorder = QueryRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._diagnostics_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, '_diagnostics_started_at', None)
+    if started_at is None:
+        return
+    duration = time.perf_counter() - started_at
+    recorder = _recorder.get()
+    slow = duration >= settings.DIAGNOSTICS_SLOW_QUERY
+    if recorder is None and not slow:
+        return
+
+    stack = _application_stack()
+    if slow:
+        logger.warning("Slow query (%.3fs): %s\n  %s", duration, statement, '\n  '.join(stack))
+    if recorder is not None:
+        recorder.queries.append(QueryRecord(statement, statement_shape(statement), duration, stack))
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """
+    Record the statements of an engine for `capture_queries` and the slow query log.
+
+    Args:
+        engine (AsyncEngine): The engine.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class DiagnosticsMiddleware:
+    """
+    Record the statements of every request and log the report of offending ones.
+
+    Every response gets ``X-DB-Query-Count`` and ``X-DB-Time`` headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries() as recorder:
+            async def send_with_headers(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    headers = MutableHeaders(scope=message)
+                    headers['X-DB-Query-Count'] = str(recorder.count)
+                    headers['X-DB-Time'] = f'{recorder.db_time:.6f}'
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                report = recorder.report()
+                if report['violations']:
+                    route = scope.get('route')
+                    report = {
+                        'method': scope['method'],
+                        'path': scope['path'],
+                        'route': route.path if route is not None else None,
+                        **report,
+                    }
+                    logger.warning("Query diagnostics: %s", dumps(report))
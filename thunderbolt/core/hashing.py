@@ -0,0 +1,141 @@
+
+"""
+Password hashing off the event loop.
+
+scrypt is deliberately slow, so hashing and verifying passwords inline blocks the
+event loop for every other request of the worker. `PasswordHasher` runs the work
+on a bounded thread or process pool and rejects new work once
+`settings.PASSWORD_HASH_MAX_PENDING` calls are already queued, so a login burst
+fails fast instead of stalling the worker.
+"""
+
+import asyncio
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+class HasherOverloadedError(RuntimeError):
+    """
+    Raised when too many hashing calls are already pending.
+    """
+
+
+class PasswordHasher:
+    """
+    Asynchronous password hasher backed by an executor.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the PasswordHasher class.
+
+        Args:
+            max_workers (Optional[int]): Number of hashing workers.
+            max_pending (Optional[int]): Maximum number of running and queued calls.
+            executor (Optional[str]): 'thread' or 'process'.
+        """
+        self._max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self._max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+        self._executor_kind = executor or settings.PASSWORD_HASH_EXECUTOR
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            elif self._executor_kind == 'thread':
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='password-hasher',
+                )
+            else:
+                raise ValueError(f"Unknown password hash executor: {self._executor_kind}")
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._pending >= self._max_pending:
+            raise HasherOverloadedError("Too many pending password hashing calls")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password.
+
+        Args:
+            password (str): The password to be hashed.
+
+        Raises:
+            HasherOverloadedError: If too many calls are pending.
+
+        Returns:
+            str: The password hash.
+        """
+        return await self._run(
+            generate_password_hash,
+            password,
+            settings.HASH_METHOD,
+            settings.SALT_LENGTH,
+        )
+
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        """
+        Check a password against a hash.
+
+        Args:
+            hashed_password (str): The stored password hash.
+            password (str): The password to be checked.
+
+        Raises:
+            HasherOverloadedError: If too many calls are pending.
+
+        Returns:
+            bool: True if the password matches.
+        """
+        return await self._run(check_password_hash, hashed_password, password)
+
+    def shutdown(self) -> None:
+        """
+        Shut the executor down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """
+    Get the process wide password hasher.
+
+    Returns:
+        PasswordHasher: The password hasher.
+    """
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+    return _hasher
@@ -0,0 +1,178 @@
+
+"""
+HTTP caching with validators and conditional GETs.
+
+A read route declares its caching policy with the `http_cache` dependency,
+then validates the request as soon as it knows the version of what it is
+about to return, before serializing anything:
+
+    async def get_thread(..., cache: Annotated[HTTPCache, Depends(http_cache(max_age=10))]):
+        thread = await thread_repo.get(thread_id)
+        cache.validate(entity_etag(thread.id, thread.updated_at), thread.updated_at)
+        return orjson_response(...)
+
+`validate` raises a 304 response when ``If-None-Match`` (or, without it,
+``If-Modified-Since``) matches. Otherwise `HTTPCacheMiddleware` adds the
+``ETag``, ``Last-Modified`` and ``Cache-Control`` headers to the successful
+response, whatever response class the route returns.
+
+Collections are validated by `collection_etag` alone. Their latest
+``updated_at`` is no ``Last-Modified``: deleting an item doesn't change it,
+so ``If-Modified-Since`` would keep answering 304 for a listing that lost
+items, while the ETag covers every item.
+"""
+
+import hashlib
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import HTTPException, Request, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+STATE_KEY = 'http_cache_headers'
+
+
+def entity_etag(*parts: Any) -> str:
+    """
+    Compute a strong ETag from version parts, e.g. ``(id, updated_at)``.
+
+    Args:
+        *parts: Values identifying a version of the representation.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def collection_etag(versions: Iterable[tuple]) -> str:
+    """
+    Compute a strong ETag for a collection from the versions of its items.
+
+    Validate collections with this ETag only, without a last modification time.
+
+    Args:
+        versions (Iterable[tuple]): ``(id, updated_at)`` of every item, in response order.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return entity_etag(*versions)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function
+    candidates = (candidate.strip() for candidate in header.split(','))
+    return any(
+        candidate == '*' or candidate.removeprefix('W/') == etag.removeprefix('W/')
+        for candidate in candidates
+    )
+
+
+class HTTPCache:
+    """
+    Caching policy and validators of a single request.
+    """
+
+    def __init__(self, request: Request, cache_control: str) -> None:
+        self._request = request
+        self.headers = {'Cache-Control': cache_control}
+        setattr(request.state, STATE_KEY, self.headers)
+
+    def validate(self, etag: str, last_modified: Optional[datetime] = None) -> None:
+        """
+        Record the validators of the response and check the request preconditions.
+
+        Args:
+            etag (str): ETag of the representation.
+            last_modified (Optional[datetime]): Last modification time of the representation.
+
+        Raises:
+            HTTPException: 304 Not Modified, when the client copy is still valid.
+        """
+        self.headers['ETag'] = etag
+        if last_modified is not None:
+            last_modified = _as_utc(last_modified).replace(microsecond=0)
+            self.headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+
+        if self._is_not_modified(etag, last_modified):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(self.headers))
+
+    def _is_not_modified(self, etag: str, last_modified: Optional[datetime]) -> bool:
+        if_none_match = self._request.headers.get('if-none-match')
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, etag)
+
+        if_modified_since = self._request.headers.get('if-modified-since')
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since
+
+
+def http_cache(
+    max_age: int = 0,
+    private: bool = False,
+    stale_while_revalidate: Optional[int] = None,
+) -> Callable[[Request], HTTPCache]:
+    """
+    Build the caching dependency of a route.
+
+    Args:
+        max_age (int): Seconds a cached copy is fresh, 0 to revalidate every time.
+        private (bool): Forbid shared caches, e.g. a CDN, from storing the response.
+        stale_while_revalidate (Optional[int]): Seconds a stale copy may be served while revalidating.
+
+    Returns:
+        Callable[[Request], HTTPCache]: The dependency.
+    """
+    directives = ['private' if private else 'public', f'max-age={max_age}']
+    if max_age == 0:
+        directives.append('must-revalidate')
+    if stale_while_revalidate is not None:
+        directives.append(f'stale-while-revalidate={stale_while_revalidate}')
+    cache_control = ', '.join(directives)
+
+    def dependency(request: Request) -> HTTPCache:
+        return HTTPCache(request, cache_control)
+
+    return dependency
+
+
+class HTTPCacheMiddleware:
+    """
+    Add the caching headers recorded by `HTTPCache` to successful responses.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message['type'] == 'http.response.start' and 200 <= message['status'] < 300:
+                headers = scope.get('state', {}).get(STATE_KEY)
+                if headers:
+                    message['headers'] = [
+                        *message.get('headers', []),
+                        *((key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in headers.items()),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,115 @@
+"""
+Time ordered primary keys.
+
+Rows are keyed by UUIDv7 (RFC 9562): 48 bits of Unix time in milliseconds,
+then 74 random bits, in the same 128 bit `uuid.UUID` and ``uuid`` column type
+as the random v4 keys they replace. New keys are appended to the right edge
+of the primary key B-tree instead of scattered over it, so inserts touch a few
+hot pages, pages are not split half full, and the index stays small enough to
+be cached.
+
+Within a process keys are strictly increasing: the 12 bits after the version
+are a counter seeded randomly every millisecond, as in method 1 of RFC 9562
+section 6.2. Ordering by id is therefore ordering by creation time, and an id
+alone is a valid keyset cursor. Keys created before UUIDv7 were random and
+sort anywhere.
+"""
+
+import os
+import time
+import uuid
+import threading
+
+from datetime import datetime, timezone
+from typing import Optional
+
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_COUNTER_MAX = 0xFFF
+
+
+def _build(timestamp_ms: int, counter: int, tail: int) -> uuid.UUID:
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= (counter & _COUNTER_MAX) << 64
+    value |= 0b10 << 62
+    value |= tail & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7, greater than every one generated before by this process.
+
+    Returns:
+        uuid.UUID: The id.
+    """
+    global _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(10), 'big')
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_ms:
+            # Seeded in the lower half so the counter rarely overflows
+            _last_ms, _counter = timestamp_ms, random_bits >> 69
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                # Borrow the next millisecond rather than go back in order
+                _last_ms, _counter = _last_ms + 1, 0
+        return _build(_last_ms, _counter, random_bits)
+
+
+def uuid7_at(moment: datetime, random_bits: Optional[int] = None) -> uuid.UUID:
+    """
+    Build a UUIDv7 for a given time, for generated or backfilled rows.
+
+    Args:
+        moment (datetime): Creation time of the row, naive values are UTC.
+        random_bits (Optional[int]): 74 random bits, drawn from `os.urandom` by default.
+
+    Returns:
+        uuid.UUID: The id.
+    """
+    if random_bits is None:
+        random_bits = int.from_bytes(os.urandom(10), 'big')
+    return _build(_to_ms(moment), random_bits >> 62, random_bits)
+
+
+def uuid7_floor(moment: datetime) -> uuid.UUID:
+    """
+    Get the smallest UUIDv7 of a time, to bound a range of ids by creation time.
+
+    Args:
+        moment (datetime): The time, naive values are UTC.
+
+    Returns:
+        uuid.UUID: The bound.
+    """
+    return _build(_to_ms(moment), 0, 0)
+
+
+def uuid7_time(value: uuid.UUID) -> datetime:
+    """
+    Get the creation time of a UUIDv7.
+
+    Args:
+        value (uuid.UUID): The id.
+
+    Raises:
+        ValueError: If the id is not a UUIDv7.
+
+    Returns:
+        datetime: The time, in UTC, to the millisecond.
+    """
+    if value.version != 7:
+        raise ValueError(f"{value} is not a UUIDv7")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, timezone.utc)
+
+
+def _to_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
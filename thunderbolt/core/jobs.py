@@ -0,0 +1,263 @@
+
+"""
+Background jobs through a transactional outbox.
+
+A side effect of a request, refreshing a summary, indexing, notifying, is
+not run by the request. It is written as a row of the ``job`` table with
+`enqueue`, in the same session and so the same transaction as the change it
+follows up on: the job exists if and only if the change was committed.
+
+Jobs are plain coroutines registered with `job`, taking the session of the
+worker and the JSON payload given to `enqueue`:
+
+    @job('forum.refresh_tag_counts')
+    async def refresh_tag_counts(session, tag_ids):
+        ...
+
+    await enqueue(session, refresh_tag_counts, tag_ids=[...])
+
+The worker, ``python -m thunderbolt.worker``, claims due jobs in batches with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of workers share the
+table without contention, and runs each job in a savepoint of the batch
+transaction: what a job writes is committed together with its removal from
+the outbox. A failed job is retried with exponential backoff and marked
+``dead`` after `max_attempts`; a worker dying mid-batch rolls back and the
+batch is claimed again.
+
+Dead jobs are kept, with their last error, until they are requeued with
+`requeue_dead_jobs` once the cause is fixed, or deleted with
+`purge_dead_jobs`, e.g. ``python -m thunderbolt.worker --requeue-dead``.
+
+With `settings.JOBS_INLINE`, for tests and local development, `enqueue` runs
+the job right away in the caller's session instead.
+"""
+
+import random
+import asyncio
+import logging
+import traceback
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.cache import dumps, loads
+from thunderbolt.core.settings import get_settings
+from thunderbolt.models import Job
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DEAD = 'dead'
+
+JobFunction = Callable[..., Awaitable[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class JobHandler:
+    name: str
+    function: JobFunction
+    max_attempts: int
+
+
+# Registered jobs by name
+JOBS: dict[str, JobHandler] = {}
+
+
+def job(name: str, max_attempts: Optional[int] = None) -> Callable[[JobFunction], JobFunction]:
+    """
+    Register a coroutine as a job.
+
+    Args:
+        name (str): Unique name of the job, stored in the outbox.
+        max_attempts (Optional[int]): Runs before the job is dead, defaults to `settings.JOB_MAX_ATTEMPTS`.
+
+    Returns:
+        Callable: The decorator, returning the coroutine unchanged.
+    """
+    def decorator(function: JobFunction) -> JobFunction:
+        if name in JOBS and JOBS[name].function is not function:
+            raise ValueError(f"Job {name} is already registered")
+        JOBS[name] = JobHandler(name, function, max_attempts or settings.JOB_MAX_ATTEMPTS)
+        function.job_name = name
+        return function
+    return decorator
+
+
+def _get_handler(function: Union[JobFunction, str]) -> JobHandler:
+    name = function if isinstance(function, str) else getattr(function, 'job_name', None)
+    if name not in JOBS:
+        raise ValueError(f"{function!r} is not a registered job")
+    return JOBS[name]
+
+
+async def enqueue(
+    session: AsyncSession,
+    function: Union[JobFunction, str],
+    delay: float = 0,
+    **payload: Any,
+) -> None:
+    """
+    Schedule a job in the transaction of the session.
+
+    Args:
+        session (AsyncSession): Session of the change the job follows up on.
+        function (Union[JobFunction, str]): The job, or its name.
+        delay (float): Seconds before the job is due.
+        **payload: JSON serializable arguments of the job.
+    """
+    handler = _get_handler(function)
+    raw = dumps(payload)
+    if settings.JOBS_INLINE:
+        await handler.function(session, **loads(raw))
+        return
+    session.add(Job(
+        name=handler.name,
+        payload=raw,
+        max_attempts=handler.max_attempts,
+        run_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+    ))
+    await session.flush()
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Delay before the next run of a job that failed `attempts` times, with full jitter.
+    """
+    ceiling = min(settings.JOB_RETRY_BACKOFF_MAX, settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1))
+    return random.uniform(0, ceiling)
+
+
+async def run_due_jobs(session: AsyncSession, limit: Optional[int] = None) -> int:
+    """
+    Claim a batch of due jobs and run them.
+
+    Done jobs are deleted, failed ones rescheduled or marked dead. Nothing is
+    committed, the caller commits the batch.
+
+    Args:
+        session (AsyncSession): Session of the batch transaction.
+        limit (Optional[int]): Batch size, defaults to `settings.JOB_BATCH_SIZE`.
+
+    Returns:
+        int: Number of claimed jobs.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        select(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+        .where(Job.status == PENDING, Job.run_at <= now)
+        .order_by(Job.run_at)
+        .limit(limit or settings.JOB_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = (await session.execute(stmt)).all()
+
+    done = []
+    for job_id, name, payload, attempts, max_attempts in claimed:
+        attempts += 1
+        try:
+            handler = JOBS[name]
+            async with session.begin_nested():
+                await handler.function(session, **loads(payload))
+        except Exception as e:
+            dead = attempts >= max_attempts or name not in JOBS
+            logger.warning("Job %s %s failed (attempt %d): %s", name, job_id, attempts, e)
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    attempts=attempts,
+                    status=DEAD if dead else PENDING,
+                    run_at=now + timedelta(seconds=retry_delay(attempts)),
+                    last_error=''.join(traceback.format_exception(e))[-4000:],
+                )
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            done.append(job_id)
+
+    if done:
+        await session.execute(delete(Job).where(Job.id.in_(done)).execution_options(synchronize_session=False))
+    return len(claimed)
+
+
+async def requeue_dead_jobs(session: AsyncSession) -> int:
+    """
+    Schedule the dead jobs to run again now, with all their attempts.
+
+    Nothing is committed, the caller commits.
+
+    Args:
+        session (AsyncSession): The session.
+
+    Returns:
+        int: Number of requeued jobs.
+    """
+    result = await session.execute(
+        update(Job)
+        .where(Job.status == DEAD)
+        .values(status=PENDING, attempts=0, run_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def purge_dead_jobs(session: AsyncSession) -> int:
+    """
+    Delete the dead jobs.
+
+    Nothing is committed, the caller commits.
+
+    Args:
+        session (AsyncSession): The session.
+
+    Returns:
+        int: Number of deleted jobs.
+    """
+    result = await session.execute(
+        delete(Job).where(Job.status == DEAD).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def run_worker(
+    session_factory: Callable[[], AsyncSession],
+    batch_size: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+    once: bool = False,
+) -> int:
+    """
+    Run due jobs until cancelled, sleeping while there are none.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Returns a new session per batch.
+        batch_size (Optional[int]): Jobs per batch, defaults to `settings.JOB_BATCH_SIZE`.
+        poll_interval (Optional[float]): Seconds between polls of an empty outbox,
+            defaults to `settings.JOB_POLL_INTERVAL`.
+        once (bool): Return once no job is due instead of polling.
+
+    Returns:
+        int: Number of jobs run, when `once`.
+    """
+    poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    total = 0
+    while True:
+        try:
+            async with session_factory() as session:
+                count = await run_due_jobs(session, batch_size)
+                await session.commit()
+            total += count
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Job batch failed, retrying: %s", e)
+            count = 0
+        if not count:
+            if once:
+                return total
+            await asyncio.sleep(poll_interval)
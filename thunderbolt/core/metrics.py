@@ -0,0 +1,382 @@
+
+"""
+Request, repository and query metrics in the Prometheus text format.
+
+`MetricsMiddleware` times every request under its route template. Repository
+methods are wrapped by `instrument_methods`, which times the outermost call and
+names it, e.g. ``PostRepository.get_by_thread``, for the duration of the call.
+The cursor hooks installed by `instrument_engine` attribute the time and the
+rows of every query to that name, so the loader queries of a listing are
+charged to the repository method that issued them.
+
+Route latency is always recorded. With `settings.METRICS_SAMPLE_RATE` below 1
+only that fraction of requests records repository and query metrics, the rest
+pay a single context variable lookup per call and per query.
+"""
+
+import time
+import random
+import inspect
+import functools
+import threading
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from thunderbolt.core.pool import WAIT_BUCKETS
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNATTRIBUTED = 'other'
+
+_sampled: ContextVar[bool] = ContextVar('metrics_sampled', default=True)
+_operation: ContextVar[Optional[str]] = ContextVar('metrics_operation', default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter, one series per combination of label values.
+    """
+
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._series.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = list(self._series.items())
+        for labels, value in series:
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets, one series per combination of label values.
+    """
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per bucket counts, not cumulative, followed by the sum and the count
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[-1] if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        for labels, values in series:
+            yield from _histogram_samples(
+                self.name, self.labelnames, labels, self.buckets, values[:-2], values[-2], values[-1],
+            )
+
+
+def _histogram_samples(
+    name: str,
+    labelnames: tuple[str, ...],
+    labels: tuple,
+    buckets: tuple[float, ...],
+    counts: list[int],
+    total: float,
+    count: int,
+) -> Iterator[str]:
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        le = f'le="{bound}"'
+        yield f'{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}'
+    le = 'le="+Inf"'
+    yield f'{name}_bucket{_format_labels(labelnames, labels, le)} {count}'
+    yield f'{name}_sum{_format_labels(labelnames, labels)} {_format_value(float(total))}'
+    yield f'{name}_count{_format_labels(labelnames, labels)} {count}'
+
+
+class MetricsRegistry:
+    """
+    Collection of the metrics exposed by a process.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    'thunderbolt_http_request_duration_seconds',
+    'Latency of HTTP requests by route template.',
+    ('method', 'route'),
+)
+requests_total = registry.counter(
+    'thunderbolt_http_requests_total',
+    'HTTP requests by route template and status code.',
+    ('method', 'route', 'status'),
+)
+repository_duration = registry.histogram(
+    'thunderbolt_repository_call_duration_seconds',
+    'Latency of repository method calls, sampled requests only.',
+    ('operation',),
+)
+query_duration = registry.histogram(
+    'thunderbolt_db_query_duration_seconds',
+    'Latency of database queries by calling repository method, sampled requests only.',
+    ('operation',),
+)
+query_rows = registry.counter(
+    'thunderbolt_db_query_rows_total',
+    'Rows returned or affected by database queries by calling repository method, sampled requests only.',
+    ('operation',),
+)
+
+
+def traced(method: Callable) -> Callable:
+    """
+    Time a repository coroutine method and attribute its queries to it.
+
+    Nested calls, e.g. through ``super()`` or from another repository method,
+    are attributed to the outermost one.
+
+    Args:
+        method (Callable): The coroutine method.
+
+    Returns:
+        Callable: The wrapped method.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if _operation.get() is not None or not _sampled.get():
+            return await method(self, *args, **kwargs)
+        operation = f'{type(self).__name__}.{method.__name__}'
+        token = _operation.set(operation)
+        started_at = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            repository_duration.observe(time.perf_counter() - started_at, operation)
+            _operation.reset(token)
+    wrapper._traced = True
+    return wrapper
+
+
+def instrument_methods(cls: type) -> type:
+    """
+    Wrap the public coroutine methods defined by a class with `traced`.
+
+    Args:
+        cls (type): The repository class.
+
+    Returns:
+        type: The same class.
+    """
+    for name, member in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.iscoroutinefunction(member) and not hasattr(member, '_traced'):
+            setattr(cls, name, traced(member))
+    return cls
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _sampled.get():
+        context._metrics_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, '_metrics_started_at', None)
+    if started_at is None:
+        return
+    operation = _operation.get() or UNATTRIBUTED
+    query_duration.observe(time.perf_counter() - started_at, operation)
+    rows = cursor.rowcount
+    if rows < 0:
+        # The async adapters buffer the whole result of a SELECT on execute
+        rows = len(getattr(cursor, '_rows', ()))
+    query_rows.inc(rows, operation)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Record the queries of an engine into the query metrics.
+
+    Args:
+        engine (AsyncEngine): The engine.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def render_pool_metrics(snapshot: dict) -> str:
+    """
+    Render a connection pool snapshot, see `PoolMetrics.snapshot`, in the Prometheus text format.
+
+    Args:
+        snapshot (dict): The pool metrics.
+
+    Returns:
+        str: The exposition.
+    """
+    name = 'thunderbolt_db_pool_wait_seconds'
+    lines = [
+        f'# HELP {name} Time spent checking a connection out of the pool.',
+        f'# TYPE {name} histogram',
+        *_histogram_samples(
+            name, (), (), WAIT_BUCKETS,
+            list(snapshot['wait_seconds_buckets'].values()),
+            snapshot['wait_seconds_sum'],
+            snapshot['checkouts'],
+        ),
+    ]
+    counters = {
+        'timeouts': 'Pool checkouts that timed out.',
+        'connects': 'Database connections opened.',
+        'invalidations': 'Database connections invalidated.',
+    }
+    for key, documentation in counters.items():
+        lines += [
+            f'# HELP thunderbolt_db_pool_{key}_total {documentation}',
+            f'# TYPE thunderbolt_db_pool_{key}_total counter',
+            f'thunderbolt_db_pool_{key}_total {snapshot[key]}',
+        ]
+    gauges = {
+        'size': 'Configured size of the pool.',
+        'checked_in': 'Idle connections in the pool.',
+        'in_use': 'Connections checked out of the pool.',
+        'overflow': 'Connections open beyond the pool size.',
+    }
+    for key, documentation in gauges.items():
+        if key in snapshot:
+            lines += [
+                f'# HELP thunderbolt_db_pool_{key} {documentation}',
+                f'# TYPE thunderbolt_db_pool_{key} gauge',
+                f'thunderbolt_db_pool_{key} {snapshot[key]}',
+            ]
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    Record the latency and status of every request under its route template.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None) -> None:
+        self.app = app
+        self.sample_rate = settings.METRICS_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        token = _sampled.set(self.sample_rate >= 1 or random.random() < self.sample_rate)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            _sampled.reset(token)
+            # Raw paths would make a series per id, unmatched requests share one
+            route = scope.get('route')
+            template = route.path if route is not None else 'unmatched'
+            request_duration.observe(elapsed, scope['method'], template)
+            requests_total.inc(1, scope['method'], template, str(status_code))
@@ -0,0 +1,170 @@
+
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by a tuple of columns that ends with the primary key, for
+example ``(created_at, id)``. A page is fetched with ``WHERE (created_at, id) > (:a, :b)
+ORDER BY created_at, id LIMIT :n``, so the cost of a page does not depend on how
+deep the reader has scrolled, unlike OFFSET paging.
+
+The position of the last row on a page is handed to the client as an opaque,
+url-safe token. Clients must not try to interpret it.
+"""
+
+import json
+import uuid
+import base64
+
+from datetime import datetime
+from decimal import Decimal
+from dataclasses import dataclass, field
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+
+T = TypeVar('T')
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a cursor token cannot be decoded.
+    """
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    A single page of a keyset paginated listing.
+
+    Attributes:
+        items (list): Items of the page.
+        next_cursor (Optional[str]): Token of the next page, None on the last page.
+    """
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _load_value(value: Any, type_: type) -> Any:
+    if value is None:
+        return None
+    if type_ is datetime:
+        return datetime.fromisoformat(value)
+    return type_(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of a row into an opaque cursor token.
+
+    Args:
+        *values: Values of the sort key columns, in order.
+
+    Returns:
+        str: The cursor token.
+    """
+    raw = json.dumps([_dump_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, *types: type) -> tuple:
+    """
+    Decode a cursor token produced by `encode_cursor`.
+
+    Args:
+        token (str): The cursor token.
+        *types: Expected types of the sort key columns, in order.
+
+    Raises:
+        InvalidCursorError: If the token is malformed.
+
+    Returns:
+        tuple: The decoded sort key.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorError("Malformed cursor")
+        return tuple(_load_value(value, type_) for value, type_ in zip(values, types))
+    except InvalidCursorError:
+        raise
+    except Exception as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """
+    Bound a client supplied page size.
+
+    Args:
+        limit (Optional[int]): Requested page size.
+
+    Returns:
+        int: Page size between 1 and `settings.PAGE_SIZE_MAX`.
+    """
+    if not limit:
+        return settings.PAGE_SIZE_DEFAULT
+    return max(1, min(limit, settings.PAGE_SIZE_MAX))
+
+
+def build_page(rows: Sequence[T], limit: int, key) -> Page[T]:
+    """
+    Build a page from rows fetched with ``LIMIT limit + 1``.
+
+    The extra row only signals that a next page exists and is not returned.
+
+    Args:
+        rows (Sequence): Fetched rows.
+        limit (int): Page size.
+        key (Callable): Returns the sort key tuple of a row.
+
+    Returns:
+        Page: The page.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(*key(items[-1]))
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def estimate_count(session: AsyncSession, stmt: Select) -> int:
+    """
+    Estimate the number of rows a statement returns.
+
+    On Postgres the estimate is the planner's, read from ``EXPLAIN``: it costs
+    a plan, not a scan, whatever the size of the table, and is as accurate as
+    the table statistics. Other databases run an exact ``COUNT(*)``.
+
+    Args:
+        session (AsyncSession): The session.
+        stmt (Select): The filtered statement, without ORDER BY or LIMIT.
+
+    Returns:
+        int: The estimated row count.
+    """
+    connection = await session.connection()
+    if connection.dialect.name != 'postgresql':
+        result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+        return result.scalar_one()
+
+    compiled = stmt.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+    result = await session.execute(text(f'EXPLAIN (FORMAT JSON) {compiled}'))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
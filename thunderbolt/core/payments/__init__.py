@@ -1,12 +1,35 @@
 
-from ._base import Priceable, ProductList, PaymentSystem
+from ._base import (
+    Priceable,
+    ProductList,
+    PaymentSystem,
+    PaymentError,
+    PaymentRejected,
+    PaymentProviderUnavailable,
+)
+from ._resilience import CircuitBreaker
+from .pricing import PricingEngine, PricedCart
+from .notifications import NotificationQueue, NotificationQueueUnavailable, PaymentUpdate, get_notification_queue
 
 from .yookassa.client import YookassaPaymentSystem, YookassaItem, YookassaProductList
+from .yookassa.async_client import AsyncYookassaClient, get_yookassa_client
 
 __all__ = (
     'Priceable',
     'ProductList',
     'PaymentSystem',
+    'PaymentError',
+    'PaymentRejected',
+    'PaymentProviderUnavailable',
+    'CircuitBreaker',
+    'PricingEngine',
+    'PricedCart',
+    'NotificationQueue',
+    'NotificationQueueUnavailable',
+    'PaymentUpdate',
+    'get_notification_queue',
+    'AsyncYookassaClient',
+    'get_yookassa_client',
     'YookassaPaymentSystem',
     'YookassaItem',
     'YookassaProductList',
@@ -1,4 +1,5 @@
 
+from decimal import Decimal
 from typing import Iterable, Protocol
 from abc import ABC, abstractmethod
 
@@ -6,8 +7,10 @@ from abc import ABC, abstractmethod
 class Priceable(Protocol):
     """
     A protocol that defines a 'price' attribute.
+
+    An element may also have a 'quantity' attribute, 1 when missing.
     """
-    price: float
+    price: Decimal
 
 
 class ProductList(list):
@@ -21,14 +24,36 @@ class ProductList(list):
                 raise ValueError("Each element in the sequence should have a 'price' attribute.")
         super().__init__(sequence)
 
-    def total(self):
+    def total(self) -> Decimal:
         """
         Get the total price of all products in the list.
         
         Returns:
-            float: The total price of all products in the list.
+            Decimal: The total price of all products in the list.
         """
-        return sum([product.price for product in self])
+        return sum((product.price * getattr(product, 'quantity', 1) for product in self), Decimal(0))
+
+
+class PaymentError(Exception):
+    """
+    Base class of payment errors.
+    """
+
+
+class PaymentRejected(PaymentError):
+    """
+    Raised when the payment provider rejects a request.
+    """
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"Payment provider rejected the request with {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class PaymentProviderUnavailable(PaymentError):
+    """
+    Raised when the payment provider cannot be reached.
+    """
 
 
 class PaymentSystem(ABC):
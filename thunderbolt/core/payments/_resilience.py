@@ -0,0 +1,92 @@
+
+"""
+Resilience primitives for payment provider calls.
+"""
+
+import time
+import random
+
+from typing import Iterator
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a call is rejected because the circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive failure circuit breaker.
+
+    After `threshold` consecutive failures the circuit opens and calls are
+    rejected for `cooldown` seconds. Then a single trial call is let through
+    (half-open): a success closes the circuit, a failure opens it again.
+    Every call let through must end with `record_success`, `record_failure`
+    or `release`, or a half-open circuit rejects calls forever.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._failures < self._threshold:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self._cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or a half-open trial is running.
+        """
+        state = self.state
+        if state == self.OPEN:
+            raise CircuitOpenError("Circuit is open")
+        if state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError("Circuit is half-open, trial call in flight")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        End a call without an outcome, such as a cancelled one.
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._failures >= self._threshold:
+            self._opened_at = time.monotonic()
+
+
+def backoff_delays(retries: int, base: float, cap: float) -> Iterator[float]:
+    """
+    Exponential backoff delays with full jitter.
+
+    Args:
+        retries (int): Number of retries.
+        base (float): Delay of the first retry, in seconds.
+        cap (float): Maximum delay, in seconds.
+
+    Yields:
+        float: Delay before each retry.
+    """
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
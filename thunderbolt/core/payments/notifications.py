@@ -0,0 +1,204 @@
+
+"""
+Durable queue of payment notifications.
+
+The webhook only validates a notification and appends it to a Redis stream,
+so answering the provider costs one round-trip to Redis whatever the load.
+Workers of a consumer group read the stream in batches, apply the batch in a
+single transaction and only then acknowledge and delete its entries. Entries
+of a worker that died before acknowledging are claimed by another worker once
+they have been pending for `settings.PAYMENT_NOTIFICATION_CLAIM_IDLE` seconds,
+so every notification is applied at least once; applying one twice is a no-op,
+see `latest_updates` and `PaymentRepository.apply_updates`.
+
+Providers retry a notification until it is answered with 200, a retry storm
+therefore only grows the stream, never the work done by the API workers.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from pydantic import ValidationError
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError, ResponseError
+
+from thunderbolt.core.settings import get_settings
+from .yookassa.schema import Notification
+
+
+settings = get_settings()
+
+# Payment statuses in the order a payment goes through them, a notification
+# never moves a payment back to an earlier status
+STATUS_RANK = {
+    'pending': 0,
+    'waiting_for_capture': 1,
+    'succeeded': 2,
+    'canceled': 2,
+}
+
+
+class NotificationQueueUnavailable(Exception):
+    """
+    Raised when the notification queue cannot be reached.
+    """
+
+
+@dataclass(slots=True)
+class PaymentUpdate:
+    provider_payment_id: str
+    status: str
+    paid: bool
+    amount: Decimal
+    currency: str
+
+    @classmethod
+    def from_notification(cls, notification: Notification) -> 'PaymentUpdate':
+        payment = notification.object
+        return cls(payment.id, payment.status, payment.paid, payment.amount.value, payment.amount.currency)
+
+
+def latest_updates(updates: Iterable[PaymentUpdate]) -> list[PaymentUpdate]:
+    """
+    Keep the most advanced update of every payment.
+
+    Args:
+        updates (Iterable[PaymentUpdate]): Updates, in the order they were received.
+
+    Returns:
+        list[PaymentUpdate]: One update per payment, unknown statuses dropped.
+    """
+    latest: dict[str, PaymentUpdate] = {}
+    for update in updates:
+        rank = STATUS_RANK.get(update.status)
+        if rank is None:
+            continue
+        current = latest.get(update.provider_payment_id)
+        if current is None or STATUS_RANK[current.status] < rank:
+            latest[update.provider_payment_id] = update
+    return list(latest.values())
+
+
+class NotificationQueue:
+    """
+    Payment notifications in a Redis stream, consumed by a consumer group.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        stream: str = 'thunderbolt:payments:notifications',
+        group: str = 'payments',
+    ) -> None:
+        self._redis = redis
+        self._stream = stream
+        self._group = group
+
+    async def enqueue(self, notification: Notification) -> str:
+        """
+        Append a notification to the stream.
+
+        Args:
+            notification (Notification): The validated notification.
+
+        Raises:
+            NotificationQueueUnavailable: If Redis cannot be reached.
+
+        Returns:
+            str: Id of the stream entry.
+        """
+        try:
+            return await self._redis.xadd(self._stream, {'payload': notification.json()})
+        except (RedisError, OSError) as e:
+            raise NotificationQueueUnavailable(str(e)) from e
+
+    async def ensure_group(self) -> None:
+        try:
+            await self._redis.xgroup_create(self._stream, self._group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    async def read(self, consumer: str, count: int, block: float) -> list[tuple[str, Optional[PaymentUpdate]]]:
+        """
+        Read a batch of entries for a consumer.
+
+        Entries abandoned by other consumers are claimed first, new entries are
+        waited for up to `block` seconds.
+
+        Args:
+            consumer (str): Name of the consumer, unique per worker.
+            count (int): Maximum number of entries.
+            block (float): Seconds to wait for new entries.
+
+        Returns:
+            list[tuple[str, Optional[PaymentUpdate]]]: Entry ids and their updates,
+                None for an entry that could not be parsed.
+        """
+        _, entries, _ = await self._redis.xautoclaim(
+            self._stream,
+            self._group,
+            consumer,
+            min_idle_time=int(settings.PAYMENT_NOTIFICATION_CLAIM_IDLE * 1000),
+            count=count,
+        )
+        if not entries:
+            response = await self._redis.xreadgroup(
+                self._group, consumer, {self._stream: '>'}, count=count, block=int(block * 1000),
+            )
+            entries = response[0][1] if response else []
+
+        batch = []
+        for entry_id, fields in entries:
+            try:
+                update = PaymentUpdate.from_notification(Notification.parse_raw(fields['payload']))
+            except (KeyError, TypeError, ValidationError):
+                update = None
+            batch.append((entry_id, update))
+        return batch
+
+    async def ack(self, entry_ids: list[str]) -> None:
+        """
+        Acknowledge applied entries and remove them from the stream.
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self._stream, self._group, *entry_ids)
+            pipe.xdel(self._stream, *entry_ids)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+_queue: Optional[NotificationQueue] = None
+
+
+def get_notification_queue() -> NotificationQueue:
+    """
+    Get the process wide notification queue.
+
+    Returns:
+        NotificationQueue: The queue.
+    """
+    global _queue
+    if _queue is None:
+        redis = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        _queue = NotificationQueue(redis)
+    return _queue
+
+
+async def close_notification_queue() -> None:
+    """
+    Close the process wide notification queue, if it was created.
+    """
+    global _queue
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
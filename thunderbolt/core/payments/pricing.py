@@ -0,0 +1,230 @@
+
+"""
+Exact pricing of carts and receipts.
+
+Money is held as integer minor units, kopecks or cents, from the moment it is
+read until a receipt is built, so no amount ever goes through a float. A cart
+is priced column-wise: unit prices, quantities and currencies are parallel
+lists, and every step, conversion, discount and tax, is one pass over them.
+Rounding happens once per step, half up, and every allocation is exact: the
+line discounts add up to the cart discount and the receipt items add up to
+the amount charged.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from typing import Iterable, Mapping, Optional, Sequence
+
+from .yookassa.schema import Amount, Item
+
+
+def _divide(numerator: int, denominator: int) -> int:
+    # Integer division rounding half away from zero
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def _allocate(amount: int, weights: Sequence[int]) -> list[int]:
+    """
+    Split an amount proportionally to weights, by largest remainder.
+
+    Returns:
+        list[int]: Shares adding up to exactly `amount`.
+    """
+    total = sum(weights)
+    if not total:
+        return [0] * len(weights)
+    shares, remainders = [], []
+    for weight in weights:
+        share, remainder = divmod(amount * weight, total)
+        shares.append(share)
+        remainders.append(remainder)
+    left = amount - sum(shares)
+    for index in sorted(range(len(weights)), key=remainders.__getitem__, reverse=True)[:left]:
+        shares[index] += 1
+    return shares
+
+
+@dataclass(slots=True)
+class PricedCart:
+    """
+    Cart priced in a single currency, amounts in minor units.
+
+    `line_totals` are after discount and include tax, `taxes` is the tax part
+    of every line total.
+    """
+    currency: str
+    exponent: int
+    names: list[str]
+    unit_prices: list[int]
+    quantities: list[int]
+    discounts: list[int]
+    line_totals: list[int]
+    taxes: list[int]
+    vat_code: Optional[int] = None
+
+    @property
+    def subtotal(self) -> int:
+        return sum(map(int.__mul__, self.unit_prices, self.quantities))
+
+    @property
+    def discount(self) -> int:
+        return sum(self.discounts)
+
+    @property
+    def tax(self) -> int:
+        return sum(self.taxes)
+
+    @property
+    def total(self) -> int:
+        return sum(self.line_totals)
+
+    def to_decimal(self, minor: int) -> Decimal:
+        return Decimal(minor).scaleb(-self.exponent)
+
+    def amount(self) -> Amount:
+        return Amount(value=self.to_decimal(self.total), currency=self.currency)
+
+    def receipt_items(self) -> list[Item]:
+        """
+        Build the receipt items, adding up to exactly `total`.
+
+        A receipt states a unit price per item, so a discounted line whose
+        total is not a multiple of its quantity is split in two items whose
+        unit prices differ by one minor unit.
+
+        Returns:
+            list[Item]: The receipt items.
+        """
+        # Amounts are exact already, skip validating thousands of items
+        items = []
+        for name, quantity, line_total in zip(self.names, self.quantities, self.line_totals):
+            if quantity <= 0:
+                continue
+            unit, remainder = divmod(line_total, quantity)
+            if remainder:
+                items.append(Item.construct(
+                    description=name,
+                    price=self.to_decimal(unit + 1),
+                    quantity=remainder,
+                    vat_code=self.vat_code,
+                ))
+            if quantity > remainder:
+                items.append(Item.construct(
+                    description=name,
+                    price=self.to_decimal(unit),
+                    quantity=quantity - remainder,
+                    vat_code=self.vat_code,
+                ))
+        return items
+
+
+class PricingEngine:
+    """
+    Prices carts in one currency.
+    """
+
+    def __init__(
+        self,
+        currency: str = 'RUB',
+        rates: Optional[Mapping[str, Decimal]] = None,
+        tax_rate: Optional[Decimal] = None,
+        vat_code: Optional[int] = None,
+        exponent: int = 2,
+    ) -> None:
+        """
+        Initialize the PricingEngine class.
+
+        Args:
+            currency (str): Currency carts are priced in.
+            rates (Optional[Mapping[str, Decimal]]): Units of `currency` per unit of
+                every other currency a price may be in.
+            tax_rate (Optional[Decimal]): Rate of the tax included in prices, e.g. 0.2.
+            vat_code (Optional[int]): VAT code stated on the receipt items.
+            exponent (int): Number of minor unit digits of the currencies.
+        """
+        self.currency = currency
+        self.exponent = exponent
+        self.vat_code = vat_code
+        self._rates = {code: Fraction(rate) for code, rate in (rates or {}).items()}
+        self._rates[currency] = Fraction(1)
+        self._tax = Fraction(tax_rate) / (1 + Fraction(tax_rate)) if tax_rate else None
+
+    def to_minor(self, prices: Iterable[Decimal]) -> list[int]:
+        """
+        Convert prices to minor units, rounding half up.
+        """
+        exponent = self.exponent
+        return [int(price.scaleb(exponent).to_integral_value(ROUND_HALF_UP)) for price in prices]
+
+    def _convert(self, unit_prices: list[int], currencies: Sequence[str]) -> list[int]:
+        converted = list(unit_prices)
+        for index, code in enumerate(currencies):
+            if code == self.currency:
+                continue
+            try:
+                rate = self._rates[code]
+            except KeyError:
+                raise ValueError(f"No rate from {code} to {self.currency}")
+            converted[index] = _divide(unit_prices[index] * rate.numerator, rate.denominator)
+        return converted
+
+    def price(
+        self,
+        names: Sequence[str],
+        prices: Sequence[Decimal],
+        quantities: Sequence[int],
+        currencies: Optional[Sequence[str]] = None,
+        discount: Decimal = Decimal(0),
+    ) -> PricedCart:
+        """
+        Price a cart given as columns.
+
+        Args:
+            names (Sequence[str]): Product names.
+            prices (Sequence[Decimal]): Unit prices.
+            quantities (Sequence[int]): Quantities.
+            currencies (Optional[Sequence[str]]): Currency of every price, defaults to the engine currency.
+            discount (Decimal): Fraction of the cart subtotal taken off, spread over the lines
+                in proportion to their subtotals.
+
+        Raises:
+            ValueError: If the columns differ in length or a currency has no rate.
+
+        Returns:
+            PricedCart: The priced cart.
+        """
+        if not len(names) == len(prices) == len(quantities):
+            raise ValueError("Cart columns differ in length")
+        unit_prices = self.to_minor(prices)
+        if currencies is not None:
+            unit_prices = self._convert(unit_prices, currencies)
+        quantities = list(quantities)
+
+        subtotals = list(map(int.__mul__, unit_prices, quantities))
+        if discount:
+            fraction = Fraction(discount)
+            discounts = _allocate(_divide(sum(subtotals) * fraction.numerator, fraction.denominator), subtotals)
+        else:
+            discounts = [0] * len(subtotals)
+        line_totals = list(map(int.__sub__, subtotals, discounts))
+        if self._tax is not None:
+            numerator, denominator = self._tax.numerator, self._tax.denominator
+            taxes = [_divide(line_total * numerator, denominator) for line_total in line_totals]
+        else:
+            taxes = [0] * len(line_totals)
+
+        return PricedCart(
+            currency=self.currency,
+            exponent=self.exponent,
+            names=list(names),
+            unit_prices=unit_prices,
+            quantities=quantities,
+            discounts=discounts,
+            line_totals=line_totals,
+            taxes=taxes,
+            vat_code=self.vat_code,
+        )
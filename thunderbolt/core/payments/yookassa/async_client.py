@@ -0,0 +1,201 @@
+
+"""
+Asynchronous YooKassa client.
+
+The official SDK performs blocking HTTP requests, which freezes the event loop
+for the whole round-trip to the provider. This client talks to the API over a
+pooled keep-alive `httpx.AsyncClient` instead, with:
+
+- connect/read timeouts,
+- an idempotency key per payment, reused by every retry of the same call,
+- bounded retries with exponential backoff and full jitter on network errors,
+  429 and 5xx responses,
+- a circuit breaker that fails fast while the provider is down.
+"""
+
+import uuid
+import asyncio
+
+from typing import Optional
+
+import httpx
+
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.payments._base import PaymentError, PaymentProviderUnavailable, PaymentRejected
+from thunderbolt.core.payments._resilience import CircuitBreaker, CircuitOpenError, backoff_delays
+from .schema import PaymentDetails, PaymentResponse
+
+
+settings = get_settings()
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class AsyncYookassaClient:
+    """
+    Pooled, retrying YooKassa API client.
+    """
+
+    def __init__(
+        self,
+        account_id: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        Initialize the AsyncYookassaClient class.
+
+        Args:
+            account_id (Optional[str]): Shop id, defaults to `settings.YOOKASSA_ACCOUNT_ID`.
+            secret_key (Optional[str]): Secret key, defaults to `settings.YOOKASSA_SECRET_KEY`.
+            base_url (Optional[str]): API url, defaults to `settings.YOOKASSA_API_URL`.
+            max_retries (Optional[int]): Retries per call, defaults to `settings.PAYMENT_MAX_RETRIES`.
+            retry_backoff (Optional[float]): First retry delay, defaults to `settings.PAYMENT_RETRY_BACKOFF`.
+            breaker (Optional[CircuitBreaker]): Circuit breaker shared by every call.
+            transport (Optional[httpx.AsyncBaseTransport]): Custom transport, used in tests.
+        """
+        self._max_retries = settings.PAYMENT_MAX_RETRIES if max_retries is None else max_retries
+        self._retry_backoff = settings.PAYMENT_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self._breaker = breaker or CircuitBreaker(
+            threshold=settings.PAYMENT_BREAKER_THRESHOLD,
+            cooldown=settings.PAYMENT_BREAKER_COOLDOWN,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=base_url or settings.YOOKASSA_API_URL,
+            auth=(
+                account_id or settings.YOOKASSA_ACCOUNT_ID,
+                secret_key or settings.YOOKASSA_SECRET_KEY,
+            ),
+            timeout=httpx.Timeout(
+                settings.PAYMENT_READ_TIMEOUT,
+                connect=settings.PAYMENT_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.PAYMENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PAYMENT_MAX_CONNECTIONS,
+            ),
+            transport=transport,
+        )
+
+    async def _request(self, method: str, url: str, idempotency_key: Optional[str] = None, **kwargs) -> dict:
+        headers = kwargs.pop('headers', {})
+        if idempotency_key:
+            headers['Idempotence-Key'] = idempotency_key
+
+        delays = backoff_delays(
+            self._max_retries,
+            base=self._retry_backoff,
+            cap=settings.PAYMENT_RETRY_BACKOFF_MAX,
+        )
+        while True:
+            try:
+                self._breaker.before_call()
+            except CircuitOpenError as e:
+                raise PaymentProviderUnavailable(str(e)) from e
+
+            error: Exception
+            try:
+                response = await self._client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            except asyncio.CancelledError:
+                self._breaker.release()
+                raise
+            except Exception:
+                self._breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self._breaker.record_success()
+                    if response.is_error:
+                        raise PaymentRejected(response.status_code, response.text)
+                    return response.json()
+                error = PaymentError(f"Provider responded with {response.status_code}")
+
+            self._breaker.record_failure()
+            delay = next(delays, None)
+            if delay is None:
+                raise PaymentProviderUnavailable("Payment provider is unavailable") from error
+            await asyncio.sleep(delay)
+
+    async def create_payment(
+        self,
+        payment_details: PaymentDetails,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse:
+        """
+        Create a payment.
+
+        Args:
+            payment_details (PaymentDetails): The payment to be created.
+            idempotency_key (Optional[str]): Key deduplicating the payment on the
+                provider side, generated when omitted.
+
+        Raises:
+            PaymentRejected: If the provider rejected the payment.
+            PaymentProviderUnavailable: If the provider could not be reached.
+
+        Returns:
+            PaymentResponse: The created payment.
+        """
+        data = await self._request(
+            'POST',
+            '/payments',
+            idempotency_key=idempotency_key or str(uuid.uuid4()),
+            content=payment_details.json(exclude_none=True),
+            headers={'Content-Type': 'application/json'},
+        )
+        return PaymentResponse.parse_obj(data)
+
+    async def get_payment(self, payment_id: str) -> PaymentResponse:
+        """
+        Get a payment.
+
+        Args:
+            payment_id (str): The payment id.
+
+        Raises:
+            PaymentRejected: If the provider rejected the request.
+            PaymentProviderUnavailable: If the provider could not be reached.
+
+        Returns:
+            PaymentResponse: The payment.
+        """
+        data = await self._request('GET', f'/payments/{payment_id}')
+        return PaymentResponse.parse_obj(data)
+
+    async def aclose(self) -> None:
+        """
+        Close pooled connections.
+        """
+        await self._client.aclose()
+
+
+_client: Optional[AsyncYookassaClient] = None
+
+
+def get_yookassa_client() -> AsyncYookassaClient:
+    """
+    Get the process wide YooKassa client.
+
+    Returns:
+        AsyncYookassaClient: The client.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncYookassaClient()
+    return _client
+
+
+async def close_yookassa_client() -> None:
+    """
+    Close the process wide YooKassa client, if it was created.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -5,7 +5,10 @@ from yookassa.payment import PaymentResponse
 
 from thunderbolt.core.payments import Priceable, ProductList, PaymentSystem
 from thunderbolt.core.payments._base import Priceable, ProductList
-from .schema import PaymentDetails, CustomerDetails, Item, Reciept, Amount, Confirmation
+from thunderbolt.core.payments.pricing import PricedCart, PricingEngine
+from .schema import PaymentDetails, CustomerDetails, Reciept, Confirmation
+from .schema import PaymentResponse as AsyncPaymentResponse
+from .async_client import AsyncYookassaClient, get_yookassa_client
 
 
 class YookassaItem(Priceable):
@@ -25,23 +28,23 @@ class YookassaPaymentSystem(PaymentSystem):
         customer_details: CustomerDetails,
         confirmation_url: str,
         base_currency: Optional[str] = None,
+        pricing: Optional[PricingEngine] = None,
     ) -> None:
         self.customer_details = customer_details
         self.confirmation_url = confirmation_url
 
         if base_currency:
             self.BASE_CURRENCY = base_currency
+        self.pricing = pricing or PricingEngine(self.BASE_CURRENCY)
 
-    def _convert_product_cart(self, product_cart: ProductList) -> YookassaProductList:
-        yookassa_product_cart = list()
-        for product in product_cart:
-            yookassa_product_cart.append(
-                YookassaItem(
-                    name=product.name,
-                    price=product.price,
-                )
-            )
-        return yookassa_product_cart
+    def _price_product_cart(self, product_cart: ProductList) -> PricedCart:
+        # Elements without a quantity or a currency are single items in the base currency
+        return self.pricing.price(
+            [product.name for product in product_cart],
+            [product.price for product in product_cart],
+            [getattr(product, 'quantity', 1) for product in product_cart],
+            [getattr(product, 'currency', self.pricing.currency) for product in product_cart],
+        )
 
     @staticmethod
     def create_payment(payment_details: PaymentDetails) -> PaymentResponse:
@@ -50,21 +53,48 @@ class YookassaPaymentSystem(PaymentSystem):
         )
         return payment
 
-    def create_payment_by_product_cart(self, product_cart: YookassaProductList) -> PaymentResponse:
-        total = product_cart.total()
+    def _build_payment_details(self, product_cart: YookassaProductList) -> PaymentDetails:
+        priced_cart = self._price_product_cart(product_cart)
         reciept = Reciept(
             customer=self.customer_details,
-            items=self._convert_product_cart(product_cart),
+            items=priced_cart.receipt_items(),
         )
         confirmation = Confirmation(
             return_url=self.confirmation_url,
         )
-        payment_data = PaymentDetails(
-            amount=Amount(
-                value=total,
-                currency=self.BASE_CURRENCY,
-            ),
+        return PaymentDetails(
+            amount=priced_cart.amount(),
             confirmation=confirmation,
             receipt=reciept,
         )
-        return self.create_payment(payment_data)
+
+    def create_payment_by_product_cart(self, product_cart: YookassaProductList) -> PaymentResponse:
+        return self.create_payment(self._build_payment_details(product_cart))
+
+    async def acreate_payment_by_product_cart(
+        self,
+        product_cart: YookassaProductList,
+        idempotency_key: Optional[str] = None,
+        client: Optional[AsyncYookassaClient] = None,
+    ) -> AsyncPaymentResponse:
+        """
+        Create a payment by product cart without blocking the event loop.
+
+        Args:
+            product_cart (YookassaProductList): The product cart to be paid.
+            idempotency_key (Optional[str]): Key deduplicating the payment, for
+                example the order id, so a repeated checkout never charges twice.
+            client (Optional[AsyncYookassaClient]): Client, defaults to the process wide one.
+
+        Raises:
+            PaymentRejected: If the provider rejected the payment.
+            PaymentProviderUnavailable: If the provider could not be reached.
+
+        Returns:
+            PaymentResponse: The created payment.
+        """
+        client = client or get_yookassa_client()
+        return await client.create_payment(
+            self._build_payment_details(product_cart),
+            idempotency_key=idempotency_key,
+        )
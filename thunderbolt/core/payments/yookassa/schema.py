@@ -14,13 +14,19 @@ https://yookassa.ru/developers/api#create_payment
 
 """
 
+from decimal import Decimal
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
-from thunderbolt.core.payments import Priceable
+
+def _format_decimal(value: Decimal) -> str:
+    # The API takes amounts as strings, never in exponent notation
+    return format(value, 'f')
 
 
 class Amount(BaseModel):
-    value: float = Field(example=157.99, description='Amount value')
+    value: Decimal = Field(example='157.99', description='Amount value')
     currency: str = Field(example='RUB', description='Amount currency')
 
 
@@ -36,10 +42,11 @@ class CustomerDetails(BaseModel):
     inn: int = Field(example=123456789012, description='Customer INN')
 
 
-class Item(BaseModel, Priceable):
-    price: float = Field(example=157.99, description='Item price')
-    quantity: float = Field(example=1.0, description='Item quantity', default=1.0)
+class Item(BaseModel):
+    price: Decimal = Field(example='157.99', description='Item price')
+    quantity: Decimal = Field(example=1, description='Item quantity', default=1)
     description: str = Field(example='Item description', description='Item description')
+    vat_code: Optional[int] = Field(example=1, description='Item VAT code', default=None)
 
 
 class Reciept(BaseModel):
@@ -55,8 +62,8 @@ class Reciept(BaseModel):
     items: list[Item] = Field(
         description='Items',
         example=[
-            Item(price=157.99, quantity=1.0, description='Item description #1'),
-            Item(price=79.99, quantity=0.5, description='Item description #2')
+            Item(price=Decimal('157.99'), quantity=1, description='Item description #1'),
+            Item(price=Decimal('79.99'), quantity=Decimal('0.5'), description='Item description #2')
         ]
     )
 
@@ -64,11 +71,40 @@ class Reciept(BaseModel):
 class PaymentDetails(BaseModel):
     amount: Amount = Field(
         description='Payment amount', 
-        example=Amount(value=157.99, currency='RUB')
+        example=Amount(value=Decimal('157.99'), currency='RUB')
     )
     confirmation: Confirmation = Field(
         description='Payment confirmation',
         example=Confirmation(type='redirect', return_url='https://example.com/return')
     )
-    description: str = Field(example='Payment description', description='Payment description')
+    description: Optional[str] = Field(example='Payment description', description='Payment description', default=None)
     receipt: Reciept = Field(description='Payment receipt')
+
+    class Config:
+        json_encoders = {Decimal: _format_decimal}
+
+
+class ConfirmationResponse(BaseModel):
+    type: str = Field(example='redirect', description='Confirmation type')
+    confirmation_url: Optional[str] = Field(
+        example='https://yoomoney.ru/checkout/payments/v2/contract?orderId=22e12f66',
+        description='Url the customer is redirected to',
+        default=None,
+    )
+
+
+class PaymentResponse(BaseModel):
+    id: str = Field(example='22e12f66-000f-5000-8000-18db351245c7', description='Payment id')
+    status: str = Field(example='pending', description='Payment status')
+    paid: bool = Field(example=False, description='Whether the payment is paid', default=False)
+    amount: Amount = Field(description='Payment amount')
+    confirmation: Optional[ConfirmationResponse] = Field(description='Payment confirmation', default=None)
+
+    class Config:
+        extra = 'allow'
+
+
+class Notification(BaseModel):
+    type: str = Field(example='notification', description='Notification type')
+    event: str = Field(example='payment.succeeded', description='Event the notification is about')
+    object: PaymentResponse = Field(description='Payment the event happened to')
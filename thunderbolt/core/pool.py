@@ -0,0 +1,119 @@
+
+"""
+Connection pool metrics.
+
+`MeteredQueuePool` times how long each checkout takes, including waiting for a
+free connection, opening a new one and the pre-ping, and counts checkout
+timeouts. Gauges such as in-use connections and overflow are
+read from the pool itself when a snapshot is taken, so they are always
+consistent with the pool state.
+"""
+
+import time
+import threading
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+# Upper bounds of the checkout wait histogram buckets, in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+@dataclass
+class PoolMetrics:
+    """
+    Counters shared by every pool of the process.
+
+    Pools are recreated on `engine.dispose()`, so the counters live outside of
+    the pool instances.
+    """
+    checkouts: int = 0
+    timeouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    wait_sum: float = 0.0
+    wait_max: float = 0.0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * len(WAIT_BUCKETS))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def observe_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        """
+        Get the current metrics.
+
+        Args:
+            pool (Pool): The pool to read gauges from.
+
+        Returns:
+            dict: Counters, checkout wait statistics and pool gauges.
+        """
+        with self._lock:
+            data = {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'wait_seconds_sum': self.wait_sum,
+                'wait_seconds_max': self.wait_max,
+                'wait_seconds_buckets': dict(zip(WAIT_BUCKETS, self.wait_buckets)),
+            }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update({
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'in_use': pool.checkedout(),
+                'overflow': max(pool.overflow(), 0),
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records checkout wait time into `pool_metrics`.
+    """
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.observe_timeout()
+            raise
+        pool_metrics.observe_wait(time.perf_counter() - started_at)
+        return connection
+
+    def _create_connection(self):
+        connection = super()._create_connection()
+        pool_metrics.observe_connect()
+        return connection
+
+    def _invalidate(self, connection, exception=None, _checkin=True):
+        pool_metrics.observe_invalidation()
+        return super()._invalidate(connection, exception, _checkin)
@@ -0,0 +1,37 @@
+
+from fastapi import APIRouter, Response
+
+from thunderbolt.core.session import get_pool_metrics
+from thunderbolt.core.metrics import CONTENT_TYPE, registry, render_pool_metrics
+
+
+internal_router = APIRouter(
+    tags=["internal"],
+    prefix="/internal",
+)
+
+
+@internal_router.get("/pool")
+async def get_pool_stats() -> dict:
+    """
+    Get connection pool metrics of this worker.
+
+    Returns:
+        dict: Checkout counters, checkout wait statistics and pool gauges.
+    """
+    return get_pool_metrics()
+
+
+metrics_router = APIRouter(tags=["internal"])
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Get the metrics of this worker in the Prometheus text format.
+
+    Returns:
+        Response: Request, repository, query and connection pool metrics.
+    """
+    content = registry.render() + render_pool_metrics(get_pool_metrics())
+    return Response(content, media_type=CONTENT_TYPE)
@@ -0,0 +1,151 @@
+
+"""
+In-process full-text search.
+
+Postgres serves search from a GIN indexed ``tsvector`` column. SQLite, used by
+the test database, has no equivalent, so `InvertedIndex` reproduces the same
+behaviour in pure Python: every query term must match (like
+``websearch_to_tsquery``), documents are ranked by weighted term frequency and
+`highlight` builds snippets the way ``ts_headline`` does.
+"""
+
+import re
+import html
+import math
+
+from collections import defaultdict
+from typing import Hashable, Iterable, Optional
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """
+    Split a text into lowercase word tokens.
+
+    Args:
+        text (Optional[str]): The text.
+
+    Returns:
+        list[str]: Tokens in order of appearance.
+    """
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Term to document postings with weighted term frequencies.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[Hashable, float]] = defaultdict(dict)
+        self._documents: dict[Hashable, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: Hashable, *fields: tuple[Optional[str], float]) -> None:
+        """
+        Index a document, replacing a previous version of it.
+
+        Args:
+            doc_id (Hashable): Document id.
+            *fields: ``(text, weight)`` pairs, e.g. a title weighted above the body.
+        """
+        self.remove(doc_id)
+        terms = set()
+        for text, weight in fields:
+            for token in tokenize(text):
+                postings = self._postings[token]
+                postings[doc_id] = postings.get(doc_id, 0.0) + weight
+                terms.add(token)
+        self._documents[doc_id] = terms
+
+    def remove(self, doc_id: Hashable) -> None:
+        """
+        Remove a document from the index.
+
+        Args:
+            doc_id (Hashable): Document id.
+        """
+        for term in self._documents.pop(doc_id, ()):
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str) -> list[tuple[Hashable, float]]:
+        """
+        Find the documents matching every term of a query.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            list[tuple[Hashable, float]]: ``(doc_id, score)`` pairs ordered by
+            score descending, then by document id.
+        """
+        terms = set(tokenize(query))
+        if not terms or not all(term in self._postings for term in terms):
+            return []
+
+        # Intersect starting from the rarest term to keep candidate sets small
+        ordered = sorted(terms, key=lambda term: len(self._postings[term]))
+        candidates = set(self._postings[ordered[0]])
+        for term in ordered[1:]:
+            candidates.intersection_update(self._postings[term])
+            if not candidates:
+                return []
+
+        total = len(self._documents)
+        idf = {term: math.log(1 + total / len(self._postings[term])) for term in terms}
+        scores = [
+            (doc_id, sum(self._postings[term][doc_id] * idf[term] for term in terms))
+            for doc_id in candidates
+        ]
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores
+
+
+def highlight(text: Optional[str], terms: Iterable[str], max_words: int = 35) -> str:
+    """
+    Build a snippet of a text around its first matching term.
+
+    The text is HTML escaped and matches are wrapped in `HIGHLIGHT_START` and
+    `HIGHLIGHT_STOP`, so the snippet is safe to render as HTML.
+
+    Args:
+        text (Optional[str]): The text.
+        terms (Iterable[str]): Lowercase terms to highlight.
+        max_words (int): Maximum number of words in the snippet.
+
+    Returns:
+        str: The snippet.
+    """
+    if not text:
+        return ''
+    terms = set(terms)
+    words = list(TOKEN_RE.finditer(text))
+    if not words:
+        return html.escape(text)
+
+    first = next((i for i, word in enumerate(words) if word.group().lower() in terms), 0)
+    start = max(0, min(first - max_words // 4, len(words) - max_words))
+    window = words[start:start + max_words]
+
+    parts = []
+    position = window[0].start()
+    for word in window:
+        parts.append(html.escape(text[position:word.start()]))
+        if word.group().lower() in terms:
+            parts.append(f'{HIGHLIGHT_START}{html.escape(word.group())}{HIGHLIGHT_STOP}')
+        else:
+            parts.append(html.escape(word.group()))
+        position = word.end()
+    return ''.join(parts)
@@ -1,23 +1,190 @@
+import os
+import random
+import asyncio
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from thunderbolt.core.settings import get_settings
+from thunderbolt.core.settings import get_settings, ApplicationSettings
+from thunderbolt.core.pool import MeteredQueuePool, pool_metrics
+from thunderbolt.core.metrics import instrument_engine
+from thunderbolt.core import diagnostics
 
 
 settings = get_settings()
 
-engine = create_async_engine(settings.DATABASE_URI, future=True)
+
+def get_engine_options(settings: ApplicationSettings, uri: str) -> dict:
+    """
+    Build `create_async_engine` keyword arguments from settings.
+
+    Pool options only apply to server databases, SQLite keeps the dialect's
+    default pool.
+
+    Args:
+        settings (ApplicationSettings): Application settings.
+        uri (str): Database URI.
+
+    Returns:
+        dict: Engine keyword arguments.
+    """
+    options = {'future': True}
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        return options
+
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+    if url.get_driver_name() == 'asyncpg':
+        options['connect_args'] = {
+            'statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+            'server_settings': {
+                'application_name': settings.APP_NAME,
+                **settings.DB_SERVER_SETTINGS,
+            },
+        }
+    return options
+
+
+def create_engine_from_settings(settings: ApplicationSettings, uri: str = None) -> AsyncEngine:
+    """
+    Create an async engine configured from settings.
+
+    Args:
+        settings (ApplicationSettings): Application settings.
+        uri (str): Database URI, defaults to `settings.DATABASE_URI`.
+
+    Returns:
+        AsyncEngine: The engine.
+    """
+    uri = uri or settings.DATABASE_URI
+    return create_async_engine(uri, **get_engine_options(settings, uri))
+
+
+engine = create_engine_from_settings(settings)
+replica_engines = [
+    create_engine_from_settings(settings, uri)
+    for uri in settings.DATABASE_REPLICA_URIS
+]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain reads to a replica and everything else to the primary.
+
+    Once the session has written anything, through a flush or a DML statement,
+    it sticks to the primary for the rest of its life, so a request always
+    reads its own writes. `SELECT ... FOR UPDATE` and textual statements always
+    go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            replica_engines
+            and not self.info.get('use_primary')
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return random.choice(replica_engines).sync_engine
+        if clause is not None and getattr(clause, 'is_dml', False):
+            self.info['use_primary'] = True
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_to_primary_after_flush(session: Session, flush_context) -> None:
+    session.info['use_primary'] = True
+
+
+def use_primary(session: AsyncSession) -> None:
+    """
+    Route every following statement of the session to the primary.
+
+    Args:
+        session (AsyncSession): The session.
+    """
+    session.sync_session.info['use_primary'] = True
+
+
 SessionLocal = sessionmaker(
-    autocommit=False, 
-    autoflush=False, 
-    bind=engine, 
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
 
+def get_engines() -> list[AsyncEngine]:
+    """
+    Get the primary engine followed by the replica engines.
+
+    Returns:
+        list[AsyncEngine]: Engines of this process.
+    """
+    return [engine, *replica_engines]
+
+
+if settings.METRICS_ENABLED:
+    for instrumented_engine in get_engines():
+        instrument_engine(instrumented_engine)
+if diagnostics.ENABLED:
+    for instrumented_engine in get_engines():
+        diagnostics.install_query_hooks(instrumented_engine)
+
+
+def _dispose_after_fork() -> None:
+    # Connections inherited from the parent process must never be used by the
+    # child, drop them without closing the parent's sockets.
+    for child_engine in get_engines():
+        child_engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+async def warmup_engine(engine: AsyncEngine, connections: int = 1) -> None:
+    """
+    Pre-connect the pool and prime dialect caches before serving traffic.
+
+    Args:
+        engine (AsyncEngine): The engine to warm up.
+        connections (int): Number of pool connections to open.
+    """
+    if connections < 1:
+        return
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        await opened[0].run_sync(lambda conn: inspect(conn).get_table_names())
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
+
+
+def get_pool_metrics() -> dict:
+    """
+    Get connection pool metrics of the primary engine.
+
+    Returns:
+        dict: Pool metrics.
+    """
+    return pool_metrics.snapshot(engine.sync_engine.pool)
@@ -1,5 +1,6 @@
 import os
 
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic import BaseSettings
 
@@ -12,6 +13,17 @@ class ApplicationSettings(BaseSettings):
     DEBUG: bool = False
 
     DATABASE_URI: str = None
+    # Read replicas, plain reads are spread over them
+    DATABASE_REPLICA_URIS: list[str] = []
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_SERVER_SETTINGS: dict[str, str] = {}
 
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -21,15 +33,123 @@ class ApplicationSettings(BaseSettings):
 
     REDIS_PORT: int
     REDIS_HOST: str
+    REDIS_DB: int = 0
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    CACHE_ENABLED: bool = True
+    CACHE_TTL: int = 300
+    CACHE_VERSION_TTL: int = 86400
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    CACHE_RETRY_INTERVAL: int = 5
+
+    BROADCAST_QUEUE_SIZE: int = 64
+    BROADCAST_HEARTBEAT_INTERVAL: float = 15.0
+    BROADCAST_RETRY_MS: int = 3000
 
     JWT_SECRET: str = 'thunderbolt@secret'
     JWT_ALGORITHM: str = 'HS256'
+    JWT_EXPIRE_SECONDS: int = 3600
+
+    # 'stateless' serves authenticated users from a per-worker snapshot cache,
+    # 'database' loads the user on every request
+    AUTH_MODE: str = 'stateless'
+    AUTH_USER_CACHE_TTL: int = 30
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
 
     HASH_METHOD: str = 'scrypt'
     SALT_LENGTH: int = 16
+    PASSWORD_HASH_EXECUTOR: str = 'thread'
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     SERVER_TIMEZONE: str = 'UTC'
 
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_LOOP: str = 'uvloop'
+    SERVER_HTTP: str = 'httptools'
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_LIMIT_MAX_REQUESTS: Optional[int] = None
+    SERVER_ACCESS_LOG: bool = False
+    # Proxies whose X-Forwarded-For header gives the client address, '*' for any
+    SERVER_FORWARDED_ALLOW_IPS: str = '127.0.0.1'
+
+    # Connections opened by each worker on startup
+    WARMUP_POOL_CONNECTIONS: int = 1
+
+    YOOKASSA_ACCOUNT_ID: str = ''
+    YOOKASSA_SECRET_KEY: str = ''
+    YOOKASSA_API_URL: str = 'https://api.yookassa.ru/v3'
+
+    PAYMENT_CONNECT_TIMEOUT: float = 3.0
+    PAYMENT_READ_TIMEOUT: float = 10.0
+    PAYMENT_MAX_CONNECTIONS: int = 20
+    PAYMENT_MAX_RETRIES: int = 3
+    PAYMENT_RETRY_BACKOFF: float = 0.2
+    PAYMENT_RETRY_BACKOFF_MAX: float = 2.0
+    PAYMENT_BREAKER_THRESHOLD: int = 5
+    PAYMENT_BREAKER_COOLDOWN: float = 30.0
+
+    # Networks payment notifications are accepted from, none when empty
+    YOOKASSA_NOTIFICATION_IPS: list[str] = [
+        '185.71.76.0/27',
+        '185.71.77.0/27',
+        '77.75.153.0/25',
+        '77.75.156.11/32',
+        '77.75.156.35/32',
+        '77.75.154.128/25',
+        '2a02:5180::/32',
+    ]
+    # Tasks applying queued payment notifications, per `thunderbolt.worker` process
+    PAYMENT_NOTIFICATION_WORKERS: int = 1
+    PAYMENT_NOTIFICATION_BATCH: int = 100
+    PAYMENT_NOTIFICATION_BLOCK: float = 1.0
+    PAYMENT_NOTIFICATION_CLAIM_IDLE: float = 60.0
+    PAYMENT_NOTIFICATION_RETRY_INTERVAL: float = 1.0
+
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    SEARCH_QUERY_MAX_LENGTH: int = 200
+
+    BULK_CHUNK_SIZE: int = 5000
+    BULK_USE_COPY: bool = True
+
+    METRICS_ENABLED: bool = True
+    # Fraction of requests recording repository and query metrics
+    METRICS_SAMPLE_RATE: float = 1.0
+
+    # Record the statements of every request and report offenders, see
+    # thunderbolt.core.diagnostics. Always on with DEBUG.
+    DIAGNOSTICS_ENABLED: bool = False
+    DIAGNOSTICS_MAX_QUERIES: int = 20
+    DIAGNOSTICS_MAX_DB_TIME: float = 0.5
+    DIAGNOSTICS_REPEAT_THRESHOLD: int = 3
+    DIAGNOSTICS_SLOW_QUERY: float = 0.2
+
+    # Run background jobs inside `enqueue` instead of the worker, for tests
+    JOBS_INLINE: bool = False
+    JOB_BATCH_SIZE: int = 50
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF: float = 2.0
+    JOB_RETRY_BACKOFF_MAX: float = 600.0
+
+    TAG_MAX_PER_POST: int = 10
+    TAG_MAX_LENGTH: int = 50
+
+    CART_MAX_ITEMS: int = 100
+    # Keep carts in Redis and write them back to the database in the
+    # background, see thunderbolt.market.repository.hot_cart
+    CART_HOT_ENABLED: bool = False
+    CART_HOT_TTL: int = 86400
+    CART_WRITE_BACK_INTERVAL: float = 5.0
+    CART_WRITE_BACK_BATCH: int = 100
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -62,5 +182,4 @@ def get_settings():
 
 
 def get_test_settings():
-    DATABASE_URI = get_async_db_uri_from_env()
-    return ApplicationSettings(DATABASE_URI=DATABASE_URI)
+    return ApplicationSettings(DATABASE_URI=TEST_DB_URI)
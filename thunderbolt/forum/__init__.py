@@ -2,9 +2,13 @@
 from .routes.post import post_router
 from .routes.thread import thread_router
 from .routes.topic import topic_router
+from .routes.search import search_router
+from .routes.tag import tag_router
 
 __all__ = (
     'post_router',
     'thread_router',
     'topic_router',
+    'search_router',
+    'tag_router',
 )
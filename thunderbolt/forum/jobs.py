@@ -0,0 +1,22 @@
+"""
+Background jobs of the forum, see `thunderbolt.core.jobs`.
+"""
+
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.jobs import job
+from thunderbolt.forum.repository.tag import TagRepository
+
+
+@job('forum.refresh_tag_counts')
+async def refresh_tag_counts(session: AsyncSession, tag_ids: list[str]) -> None:
+    """
+    Refresh the post count summary of Tags after posts were tagged or deleted.
+
+    Args:
+        session (AsyncSession): Session of the job.
+        tag_ids (list[str]): UUIDs of the Tags.
+    """
+    await TagRepository(session).refresh_post_counts([uuid.UUID(tag_id) for tag_id in tag_ids])
@@ -0,0 +1,106 @@
+import uuid
+import asyncio
+
+from typing import Annotated, Awaitable, Iterable, Optional
+from fastapi import Depends
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from thunderbolt.core.session import get_session
+from thunderbolt.core.dataloader import DataLoader, id_in
+from thunderbolt.models import Post, Thread, Topic, User
+from thunderbolt.forum.repository.projection import PostInfo, to_post_info
+
+
+class ForumLoaders:
+    """
+    Request-scoped batching loaders of users, threads and topics
+
+    Relationships of a list of posts are resolved with one query per entity
+    type, each distinct row fetched once, instead of a join repeating the
+    thread, topic and user columns on every post. All loaders share the
+    session, their batches run one at a time.
+    """
+
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
+        """
+        Initialize the ForumLoaders class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+        """
+        self._session = session
+        lock = asyncio.Lock()
+        self.users: DataLoader[uuid.UUID, User] = DataLoader(self._batch(User), lock)
+        self.threads: DataLoader[uuid.UUID, Thread] = DataLoader(self._batch(Thread), lock)
+        self.topics: DataLoader[uuid.UUID, Topic] = DataLoader(self._batch(Topic), lock)
+
+    def _batch(self, model: type):
+        async def batch_load(ids: list) -> dict:
+            stmt = select(model).where(id_in(model.id, ids, self._session.bind.dialect.name))
+            result = await self._session.execute(stmt)
+            return {entity.id: entity for entity in result.scalars()}
+        return batch_load
+
+    def load_user(self, user_id: uuid.UUID) -> Awaitable[Optional[User]]:
+        return self.users.load(user_id)
+
+    def load_thread(self, thread_id: uuid.UUID) -> Awaitable[Optional[Thread]]:
+        return self.threads.load(thread_id)
+
+    def load_topic(self, topic_id: uuid.UUID) -> Awaitable[Optional[Topic]]:
+        return self.topics.load(topic_id)
+
+    async def resolve_threads(self, threads: Iterable[Thread]) -> None:
+        """
+        Attach their Topic to Threads.
+
+        Args:
+            threads (Iterable[Thread]): Thread objects
+        """
+        threads = [thread for thread in threads if thread is not None]
+        topics = await asyncio.gather(*(self.load_topic(thread.topic_id) for thread in threads))
+        for thread, topic in zip(threads, topics):
+            set_committed_value(thread, 'topic', topic)
+
+    async def _load_posts_relations(self, posts: list) -> tuple[list[Thread], list[User]]:
+        loads = [self.load_thread(post.thread_id) for post in posts]
+        loads += [self.load_user(post.user_id) for post in posts]
+        loaded = await asyncio.gather(*loads)
+        threads, users = loaded[:len(posts)], loaded[len(posts):]
+        await self.resolve_threads(set(threads))
+        return threads, users
+
+    async def resolve_posts(self, posts: Iterable[Post]) -> None:
+        """
+        Attach their Thread, with its Topic, and their User to Posts.
+
+        Issues at most one query for users, one for threads and one for topics.
+
+        Args:
+            posts (Iterable[Post]): Post objects
+        """
+        posts = list(posts)
+        threads, users = await self._load_posts_relations(posts)
+        for post, thread, user in zip(posts, threads, users):
+            set_committed_value(post, 'thread', thread)
+            set_committed_value(post, 'user', user)
+
+    async def resolve_post_infos(self, rows: Iterable) -> list[PostInfo]:
+        """
+        Build `PostInfo` from rows of `select_post_info`, with their Thread,
+        Topic and User.
+
+        Issues at most one query for users, one for threads and one for topics.
+
+        Args:
+            rows (Iterable): Rows of `select_post_info`
+
+        Returns:
+            list[PostInfo]: The posts, in the order of the rows
+        """
+        rows = list(rows)
+        threads, users = await self._load_posts_relations(rows)
+        return [to_post_info(row, thread, user) for row, thread, user in zip(rows, threads, users)]
@@ -1,15 +1,32 @@
 import uuid
 
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Iterable, Optional, Sequence
 from fastapi import Depends
 
-from sqlalchemy import select
+from sqlalchemy import case, func, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from thunderbolt.core.session import get_session
-from thunderbolt.core.base import AbstractRepository
-from thunderbolt.models import Post
+from thunderbolt.core.base import AbstractRepository, iter_chunks
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import Page, build_page, clamp_page_size, decode_cursor
+from thunderbolt.models import Post, Thread, Topic
+from thunderbolt.forum.repository.loaders import ForumLoaders
+from thunderbolt.forum.repository.projection import PostInfo, select_post_info
+
+
+settings = get_settings()
+
+
+def _last_post_values(model, last_post_at, post_id) -> dict:
+    # Activity columns of a Thread or Topic, only replaced by a newer post.
+    # Both conditions read the row as it was before the update
+    latest = or_(model.last_post_id.is_(None), model.last_post_at <= last_post_at)
+    return {
+        'last_post_at': case((latest, last_post_at), else_=model.last_post_at),
+        'last_post_id': case((latest, post_id), else_=model.last_post_id),
+    }
 
 
 class PostRepository(AbstractRepository):
@@ -18,27 +35,73 @@ class PostRepository(AbstractRepository):
 
     This class encapsulates the database access for the Post model. It provides
     functions for adding, getting, and deleting post records.
+
+    Listings resolve the thread, topic and user of their posts through the
+    request-scoped `ForumLoaders`, one small query per entity type.
     """
+    model = Post
 
-    def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
+    def __init__(
+        self,
+        session: Annotated[AsyncSession, Depends(get_session)],
+        loaders: Annotated[Optional[ForumLoaders], Depends(ForumLoaders)] = None,
+    ):
         """
         Initialize the PostRepository class.
 
         Args:
             session (AsyncSession): SQLAlchemy Session for database access
+            loaders (Optional[ForumLoaders]): Request-scoped loaders resolving
+                the thread, topic and user of posts
         """
         self._session = session
+        self._loaders = loaders or ForumLoaders(session)
+
+    async def _fetch(self, stmt) -> list[Post]:
+        result = await self._session.execute(stmt)
+        posts = result.scalars().all()
+        await self._loaders.resolve_posts(posts)
+        return posts
 
     async def add(self, post: Post) -> None:
         """
         Add a new Post to the database.
 
+        The activity counters of the Thread and its Topic are updated in the
+        same transaction. The last post only moves forward in time, a post
+        committed after a newer one doesn't replace it. Their `updated_at` is
+        bumped too, as it versions the HTTP representations embedding the
+        counters.
+
         Args:
             post (Post): Post object to be added
         """
+        last_post_at = post.created_at or func.now()
         self._session.add(post)
         await self._session.flush()
 
+        topic_id = select(Thread.topic_id).where(Thread.id == post.thread_id).scalar_subquery()
+        await self._session.execute(
+            update(Thread)
+            .where(Thread.id == post.thread_id)
+            .values(
+                post_count=Thread.post_count + 1,
+                **_last_post_values(Thread, last_post_at, post.id),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(
+            update(Topic)
+            .where(Topic.id == topic_id)
+            .values(
+                post_count=Topic.post_count + 1,
+                **_last_post_values(Topic, last_post_at, post.id),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def update(self, post: Post) -> None:
         """
         Update a Post in the database.
@@ -51,7 +114,7 @@ class PostRepository(AbstractRepository):
 
     async def get(self, post_id: uuid.UUID) -> Post:
         """
-        Get a Post from the database by id.
+        Get a Post from the database by id, without its relationships.
 
         Args:
             post_id (uuid.UUID): UUID of the Post
@@ -59,23 +122,44 @@ class PostRepository(AbstractRepository):
         Returns:
             Post: Post object
         """
-        stmt = select(Post).where(Post.id == post_id).options(joinedload(Post.thread), joinedload(Post.user))
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(select(Post).where(Post.id == post_id))
         return result.scalars().first()
 
-    async def get_by_thread(self, thread_id: uuid.UUID) -> list[Post]:
+    async def get_by_thread(
+        self,
+        thread_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[Post]:
         """
-        Get all Posts for a specific Thread from the database.
+        Get a page of Posts for a specific Thread from the database.
+
+        Posts are ordered by ``(created_at, id)`` and paginated by keyset, so
+        every page costs a single index range scan regardless of its depth.
 
         Args:
             thread_id (uuid.UUID): UUID of the Thread
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
 
         Returns:
-            List[Post]: List of Post objects
+            Page[Post]: Page of Post objects
         """
-        stmt = select(Post).where(Post.thread_id == thread_id).options(joinedload(Post.thread), joinedload(Post.user))
-        result = await self._session.execute(stmt)
-        return result.scalars().all()
+        limit = clamp_page_size(limit)
+        stmt = (
+            select(Post)
+            .where(Post.thread_id == thread_id)
+            .order_by(Post.created_at, Post.id)
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, post_id = decode_cursor(cursor, datetime, uuid.UUID)
+            stmt = stmt.where(tuple_(Post.created_at, Post.id) > tuple_(created_at, post_id))
+        posts = await self._fetch(stmt)
+        return build_page(posts, limit, key=lambda post: (post.created_at, post.id))
 
     async def get_by_user(self, user_id: uuid.UUID) -> list[Post]:
         """
@@ -87,9 +171,12 @@ class PostRepository(AbstractRepository):
         Returns:
             List[Post]: List of Post objects
         """
-        stmt = select(Post).where(Post.user_id == user_id).options(joinedload(Post.thread), joinedload(Post.user))
-        result = await self._session.execute(stmt)
-        return result.scalars().all()
+        stmt = (
+            select(Post)
+            .where(Post.user_id == user_id)
+            .order_by(Post.created_at, Post.id)
+        )
+        return await self._fetch(stmt)
 
     async def get_all(self) -> list[Post]:
         """
@@ -98,16 +185,257 @@ class PostRepository(AbstractRepository):
         Returns:
             List[Post]: List of Post objects
         """
-        stmt = select(Post).options(joinedload(Post.thread), joinedload(Post.user))
+        return await self._fetch(select(Post))
+
+    async def get_info(self, post_id: uuid.UUID) -> Optional[PostInfo]:
+        """
+        Get the listing projection of a Post by id.
+
+        Args:
+            post_id (uuid.UUID): UUID of the Post
+
+        Returns:
+            Optional[PostInfo]: The Post, None if it does not exist
+        """
+        result = await self._session.execute(select_post_info().where(Post.id == post_id))
+        posts = await self._loaders.resolve_post_infos(result)
+        return posts[0] if posts else None
+
+    async def get_info_by_thread(
+        self,
+        thread_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[PostInfo]:
+        """
+        Get a page of listing projections of Posts for a specific Thread.
+
+        Same order and pagination as `get_by_thread`, without loading the posts
+        as entities.
+
+        Args:
+            thread_id (uuid.UUID): UUID of the Thread
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[PostInfo]: Page of Posts
+        """
+        limit = clamp_page_size(limit)
+        stmt = (
+            select_post_info()
+            .where(Post.thread_id == thread_id)
+            .order_by(Post.created_at, Post.id)
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, post_id = decode_cursor(cursor, datetime, uuid.UUID)
+            stmt = stmt.where(tuple_(Post.created_at, Post.id) > tuple_(created_at, post_id))
         result = await self._session.execute(stmt)
-        return result.scalars().all()
+        posts = await self._loaders.resolve_post_infos(result)
+        return build_page(posts, limit, key=lambda post: (post.created_at, post.id))
+
+    async def get_info_by_user(self, user_id: uuid.UUID) -> list[PostInfo]:
+        """
+        Get listing projections of all Posts by a specific User.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            List[PostInfo]: List of Posts
+        """
+        stmt = select_post_info().where(Post.user_id == user_id).order_by(Post.created_at, Post.id)
+        result = await self._session.execute(stmt)
+        return await self._loaders.resolve_post_infos(result)
+
+    async def get_all_info(self) -> list[PostInfo]:
+        """
+        Get listing projections of all Posts.
+
+        Returns:
+            List[PostInfo]: List of Posts
+        """
+        result = await self._session.execute(select_post_info())
+        return await self._loaders.resolve_post_infos(result)
 
     async def delete(self, post: Post) -> None:
         """
         Delete a Post from the database.
 
+        The activity counters of the Thread and its Topic are updated in the
+        same transaction, the last post is looked up again through the
+        ``(thread_id, created_at, id)`` and ``(topic_id, last_post_at, id)`` indexes.
+
         Args:
             post (Post): Post object to be deleted
         """
+        thread_id = post.thread_id
         await self._session.delete(post)
         await self._session.flush()
+
+        last_post = (
+            select(Post)
+            .where(Post.thread_id == thread_id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(1)
+        )
+        await self._session.execute(
+            update(Thread)
+            .where(Thread.id == thread_id)
+            .values(
+                post_count=Thread.post_count - 1,
+                last_post_at=func.coalesce(
+                    last_post.with_only_columns(Post.created_at).scalar_subquery(),
+                    Thread.created_at,
+                ),
+                last_post_id=last_post.with_only_columns(Post.id).scalar_subquery(),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        topic_id = select(Thread.topic_id).where(Thread.id == thread_id).scalar_subquery()
+        last_thread = (
+            select(Thread)
+            .where(Thread.topic_id == Topic.id, Thread.last_post_id.is_not(None))
+            .order_by(Thread.last_post_at.desc(), Thread.id.desc())
+            .limit(1)
+        )
+        await self._session.execute(
+            update(Topic)
+            .where(Topic.id == topic_id)
+            .values(
+                post_count=Topic.post_count - 1,
+                last_post_at=last_thread.with_only_columns(Thread.last_post_at).scalar_subquery(),
+                last_post_id=last_thread.with_only_columns(Thread.last_post_id).scalar_subquery(),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def add_many(self, posts: Iterable, chunk_size: Optional[int] = None) -> int:
+        """
+        Insert many Posts, see `AbstractRepository.add_many`.
+
+        The activity counters of the affected Threads and Topics are
+        recomputed once for the whole batch.
+
+        Args:
+            posts (Iterable): Post objects or mappings of column values
+            chunk_size (Optional[int]): Rows per round-trip
+
+        Returns:
+            int: Number of inserted rows
+        """
+        posts = list(posts)
+        count = await super().add_many(posts, chunk_size)
+        await self.refresh_activity({self._entity_values(post)['thread_id'] for post in posts})
+        return count
+
+    async def upsert_many(
+        self,
+        posts: Iterable,
+        conflict_columns: Sequence[str] = ('id',),
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Insert or update many Posts, see `AbstractRepository.upsert_many`.
+
+        The activity counters of the Threads the posts belonged to and now
+        belong to are recomputed once for the whole batch.
+
+        Args:
+            posts (Iterable): Post objects or mappings of column values
+            conflict_columns (Sequence[str]): Columns of the unique index identifying a row
+            chunk_size (Optional[int]): Rows per round-trip
+
+        Returns:
+            int: Number of inserted or updated rows
+        """
+        posts = [self._entity_values(post) for post in posts]
+        thread_ids = {post['thread_id'] for post in posts if post.get('thread_id')}
+        thread_ids |= await self._get_thread_ids([post['id'] for post in posts if post.get('id')])
+        count = await super().upsert_many(posts, conflict_columns, chunk_size)
+        await self.refresh_activity(thread_ids)
+        return count
+
+    async def delete_many(self, post_ids: Iterable, chunk_size: Optional[int] = None) -> int:
+        """
+        Delete many Posts by id, see `AbstractRepository.delete_many`.
+
+        Args:
+            post_ids (Iterable): UUIDs of the Posts
+            chunk_size (Optional[int]): Ids per statement
+
+        Returns:
+            int: Number of deleted rows
+        """
+        post_ids = list(post_ids)
+        thread_ids = await self._get_thread_ids(post_ids)
+        count = await super().delete_many(post_ids, chunk_size)
+        await self.refresh_activity(thread_ids)
+        return count
+
+    async def _get_thread_ids(self, post_ids: list) -> set:
+        thread_ids = set()
+        for chunk in iter_chunks(post_ids, settings.BULK_CHUNK_SIZE):
+            result = await self._session.execute(select(Post.thread_id).where(Post.id.in_(chunk)).distinct())
+            thread_ids.update(result.scalars())
+        return thread_ids
+
+    async def refresh_activity(self, thread_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Recompute the activity counters of Threads and of their Topics.
+
+        Used after bulk writes instead of the per-post increments of `add`
+        and `delete`.
+
+        Args:
+            thread_ids (Iterable[uuid.UUID]): UUIDs of the Threads
+        """
+        last_post = (
+            select(Post)
+            .where(Post.thread_id == Thread.id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(1)
+        )
+        last_thread = (
+            select(Thread)
+            .where(Thread.topic_id == Topic.id, Thread.last_post_id.is_not(None))
+            .order_by(Thread.last_post_at.desc(), Thread.id.desc())
+            .limit(1)
+        )
+        for chunk in iter_chunks(thread_ids, settings.BULK_CHUNK_SIZE):
+            await self._session.execute(
+                update(Thread)
+                .where(Thread.id.in_(chunk))
+                .values(
+                    post_count=select(func.count()).where(Post.thread_id == Thread.id).scalar_subquery(),
+                    last_post_at=func.coalesce(
+                        last_post.with_only_columns(Post.created_at).scalar_subquery(),
+                        Thread.created_at,
+                    ),
+                    last_post_id=last_post.with_only_columns(Post.id).scalar_subquery(),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+            topic_ids = select(Thread.topic_id).where(Thread.id.in_(chunk)).distinct()
+            await self._session.execute(
+                update(Topic)
+                .where(Topic.id.in_(topic_ids))
+                .values(
+                    post_count=select(func.coalesce(func.sum(Thread.post_count), 0))
+                    .where(Thread.topic_id == Topic.id)
+                    .scalar_subquery(),
+                    last_post_at=last_thread.with_only_columns(Thread.last_post_at).scalar_subquery(),
+                    last_post_id=last_thread.with_only_columns(Thread.last_post_id).scalar_subquery(),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
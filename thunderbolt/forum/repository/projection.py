@@ -0,0 +1,109 @@
+
+"""
+Lightweight read models for listing endpoints.
+
+Listings select only the post columns their response schema returns and build
+these slotted objects from the rows, instead of loading full ORM entities: no
+large text columns are transferred and every object is a few attribute slots.
+The thread, topic and user of the posts are not joined onto every row, they
+are loaded once per distinct id by `ForumLoaders.resolve_post_infos`. They
+are read only snapshots, never flushed back.
+"""
+
+import uuid
+
+from datetime import date, datetime
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import Select, select
+
+from thunderbolt.models import Post, Thread, Topic, User
+
+
+@dataclass(slots=True)
+class TopicInfo:
+    symbol: str
+    title: str
+    description: Optional[str]
+    post_count: int
+    last_post_at: Optional[datetime]
+    last_post_id: Optional[uuid.UUID]
+
+
+@dataclass(slots=True)
+class ThreadInfo:
+    title: str
+    description: Optional[str]
+    topic: TopicInfo
+
+
+@dataclass(slots=True)
+class UserInfo:
+    id: uuid.UUID
+    username: str
+    email: str
+    name: str
+    description: Optional[str]
+    gender: Optional[str]
+    birthday: Optional[date]
+
+
+@dataclass(slots=True)
+class PostInfo:
+    id: uuid.UUID
+    title: str
+    created_at: datetime
+    # Latest update of the post or of anything embedded in it
+    updated_at: Optional[datetime]
+    thread: ThreadInfo
+    user: UserInfo
+
+
+POST_INFO_COLUMNS = (
+    Post.id, Post.title, Post.created_at, Post.updated_at, Post.thread_id, Post.user_id,
+)
+
+
+def select_post_info() -> Select:
+    """
+    Select the post columns of `PostInfo` and the ids of its thread and user.
+
+    Returns:
+        Select: The statement, to be filtered and ordered by the caller.
+    """
+    return select(*POST_INFO_COLUMNS)
+
+
+def to_post_info(row, thread: Thread, user: User) -> PostInfo:
+    """
+    Build a `PostInfo` from a row of `select_post_info`.
+
+    Args:
+        row: The row.
+        thread (Thread): The thread of the post, with its topic.
+        user (User): The author of the post.
+
+    Returns:
+        PostInfo: The post.
+    """
+    post_id, title, created_at, updated_at = row[:4]
+    topic = thread.topic
+    versions = (updated_at, thread.updated_at, topic.updated_at, user.updated_at)
+    return PostInfo(
+        id=post_id,
+        title=title,
+        created_at=created_at,
+        updated_at=max((version for version in versions if version is not None), default=None),
+        thread=ThreadInfo(
+            thread.title,
+            thread.description,
+            TopicInfo(
+                topic.symbol, topic.title, topic.description,
+                topic.post_count, topic.last_post_at, topic.last_post_id,
+            ),
+        ),
+        user=UserInfo(
+            user.id, user.username, user.email, user.name, user.description, user.gender, user.birthday,
+        ),
+    )
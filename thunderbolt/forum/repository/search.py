@@ -0,0 +1,197 @@
+import uuid
+
+from typing import Annotated, NamedTuple, Optional
+from fastapi import Depends
+
+from sqlalchemy import Column, and_, cast, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import REAL, REGCONFIG, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.session import get_session
+from thunderbolt.core.metrics import instrument_methods
+from thunderbolt.core.pagination import Page, build_page, clamp_page_size, decode_cursor
+from thunderbolt.core.search import HIGHLIGHT_START, HIGHLIGHT_STOP, InvertedIndex, highlight, tokenize
+from thunderbolt.models import Post, Thread
+
+
+# Must match the configuration of the generated `search_vector` columns
+SEARCH_CONFIG = 'simple'
+HEADLINE_OPTIONS = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=35, MinWords=15'
+
+# Characters escaped before `ts_headline`, like `html.escape` does. The default
+# parser reads the escapes as entities, not words, so matching is unchanged
+HTML_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#39;'))
+
+# Default `ts_rank` weights of the 'A' (title) and 'B' (body) labels
+TITLE_WEIGHT = 1.0
+BODY_WEIGHT = 0.4
+
+
+class PostSearchHit(NamedTuple):
+    id: uuid.UUID
+    thread_id: uuid.UUID
+    title: str
+    snippet: str
+    rank: float
+
+
+class ThreadSearchHit(NamedTuple):
+    id: uuid.UUID
+    topic_id: uuid.UUID
+    title: str
+    snippet: str
+    rank: float
+
+
+class _Target(NamedTuple):
+    model: type
+    parent: Column
+    title: Column
+    body: Column
+    hit: type
+
+
+POST_TARGET = _Target(Post, Post.thread_id, Post.title, Post.content, PostSearchHit)
+THREAD_TARGET = _Target(Thread, Thread.topic_id, Thread.title, Thread.description, ThreadSearchHit)
+
+
+def _escape_html(text):
+    for character, escape in HTML_ESCAPES:
+        text = func.replace(text, character, escape)
+    return text
+
+
+@instrument_methods
+class SearchRepository:
+    """
+    Repository class for forum full-text search
+
+    On Postgres, queries are answered from the generated `search_vector`
+    columns of the post and thread tables through their GIN indexes, never by
+    pattern matching. Results are ranked with ``ts_rank`` and paginated by
+    ``(rank, id)`` keyset, snippets are only built for the rows of the page.
+
+    Other databases (SQLite in tests) use an in-process `InvertedIndex`.
+    """
+
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
+        """
+        Initialize the SearchRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+        """
+        self._session = session
+
+    async def search_posts(
+        self,
+        query: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[PostSearchHit]:
+        """
+        Search Posts by title and content.
+
+        Args:
+            query (str): Search query, every word must match
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[PostSearchHit]: Page of hits, best match first
+        """
+        return await self._search(POST_TARGET, query, cursor, limit)
+
+    async def search_threads(
+        self,
+        query: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[ThreadSearchHit]:
+        """
+        Search Threads by title and description.
+
+        Args:
+            query (str): Search query, every word must match
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[ThreadSearchHit]: Page of hits, best match first
+        """
+        return await self._search(THREAD_TARGET, query, cursor, limit)
+
+    async def _search(self, target: _Target, query: str, cursor: Optional[str], limit: Optional[int]) -> Page:
+        limit = clamp_page_size(limit)
+        after = decode_cursor(cursor, float, uuid.UUID) if cursor else None
+        if self._session.bind.dialect.name == 'postgresql':
+            hits = await self._search_postgres(target, query, after, limit)
+        else:
+            hits = await self._search_in_process(target, query, after, limit)
+        return build_page(hits, limit, key=lambda hit: (hit.rank, hit.id))
+
+    async def _search_postgres(self, target: _Target, query: str, after: Optional[tuple], limit: int) -> list:
+        config = cast(SEARCH_CONFIG, REGCONFIG)
+        tsquery = func.websearch_to_tsquery(config, query)
+        table = target.model.__table__
+        search_vector = literal_column(f'{table.name}.search_vector', type_=TSVECTOR)
+        rank = func.ts_rank(search_vector, tsquery)
+
+        matches = (
+            select(target.model.id, target.parent, target.title, target.body, rank.label('rank'))
+            .where(search_vector.bool_op('@@')(tsquery))
+            .order_by(rank.desc(), target.model.id)
+            .limit(limit + 1)
+        )
+        if after:
+            last_rank, last_id = after
+            last_rank = cast(last_rank, REAL)
+            matches = matches.where(or_(rank < last_rank, and_(rank == last_rank, target.model.id > last_id)))
+        matches = matches.subquery()
+
+        stmt = (
+            select(
+                matches.c.id,
+                matches.c[target.parent.name],
+                matches.c[target.title.name],
+                func.ts_headline(
+                    config,
+                    _escape_html(func.coalesce(matches.c[target.body.name], '')),
+                    tsquery,
+                    HEADLINE_OPTIONS,
+                ),
+                matches.c.rank,
+            )
+            .order_by(matches.c.rank.desc(), matches.c.id)
+        )
+        result = await self._session.execute(stmt)
+        return [target.hit(*row) for row in result.all()]
+
+    async def _search_in_process(self, target: _Target, query: str, after: Optional[tuple], limit: int) -> list:
+        stmt = select(target.model.id, target.parent, target.title, target.body)
+        rows = {row[0]: row for row in (await self._session.execute(stmt)).all()}
+
+        index = InvertedIndex()
+        for doc_id, _, title, body in rows.values():
+            index.add(doc_id, (title, TITLE_WEIGHT), (body, BODY_WEIGHT))
+
+        matches = index.search(query)
+        if after:
+            last_rank, last_id = after
+            matches = [
+                (doc_id, rank) for doc_id, rank in matches
+                if rank < last_rank or (rank == last_rank and doc_id > last_id)
+            ]
+
+        terms = tokenize(query)
+        hits = []
+        for doc_id, rank in matches[:limit + 1]:
+            _, parent_id, title, body = rows[doc_id]
+            hits.append(target.hit(doc_id, parent_id, title, highlight(body, terms), rank))
+        return hits
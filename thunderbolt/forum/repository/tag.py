@@ -0,0 +1,249 @@
+import uuid
+
+from datetime import datetime, timezone
+from typing import Annotated, Iterable, Optional
+from fastapi import Depends
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.session import get_session
+from thunderbolt.core.base import AbstractRepository, iter_chunks
+from thunderbolt.core.base.repository import UPSERT_DIALECTS
+from thunderbolt.core.ids import uuid7
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import Page, build_page, clamp_page_size, decode_cursor
+from thunderbolt.models import Post, PostTags, Tag
+from thunderbolt.forum.repository.loaders import ForumLoaders
+from thunderbolt.forum.repository.projection import PostInfo, select_post_info
+
+
+settings = get_settings()
+
+
+class TagRepository(AbstractRepository):
+    """
+    Repository class for Tag model
+
+    Tags are unique by name and assigned to posts through PostTags, indexed
+    on ``(tag_id, post_id)`` for tag pages and ``(post_id, tag_id)`` for the
+    tags of a post. `Tag.post_count` is a summary refreshed by
+    `refresh_post_counts`, not maintained on every assignment.
+    """
+    model = Tag
+
+    def __init__(
+        self,
+        session: Annotated[AsyncSession, Depends(get_session)],
+        loaders: Annotated[Optional[ForumLoaders], Depends(ForumLoaders)] = None,
+    ):
+        """
+        Initialize the TagRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+            loaders (Optional[ForumLoaders]): Request-scoped loaders resolving
+                the thread, topic and user of posts
+        """
+        self._session = session
+        self._loaders = loaders or ForumLoaders(session)
+
+    async def add(self, tag: Tag) -> None:
+        """
+        Add a new Tag to the database.
+
+        Args:
+            tag (Tag): Tag object to be added
+        """
+        self._session.add(tag)
+        await self._session.flush()
+
+    async def update(self, tag: Tag) -> None:
+        """
+        Update a Tag in the database.
+
+        Args:
+            tag (Tag): Tag object to be updated
+        """
+        self._session.add(tag)
+        await self._session.flush()
+
+    async def get(self, tag_id: uuid.UUID) -> Optional[Tag]:
+        """
+        Get a Tag from the database by id.
+
+        Args:
+            tag_id (uuid.UUID): UUID of the Tag
+
+        Returns:
+            Optional[Tag]: Tag object
+        """
+        result = await self._session.execute(select(Tag).where(Tag.id == tag_id))
+        return result.scalars().first()
+
+    async def get_by_name(self, name: str) -> Optional[Tag]:
+        """
+        Get a Tag from the database by name.
+
+        Args:
+            name (str): Name of the Tag
+
+        Returns:
+            Optional[Tag]: Tag object
+        """
+        result = await self._session.execute(select(Tag).where(Tag.name == name))
+        return result.scalars().first()
+
+    async def delete(self, tag: Tag) -> None:
+        """
+        Delete a Tag from the database.
+
+        Args:
+            tag (Tag): Tag object to be deleted
+        """
+        await self._session.delete(tag)
+        await self._session.flush()
+
+    async def get_or_create_many(self, names: Iterable[str]) -> dict[str, uuid.UUID]:
+        """
+        Get the ids of Tags by name, creating the missing ones.
+
+        One upsert creates every missing tag, whatever the number of names.
+
+        Args:
+            names (Iterable[str]): Names of the Tags
+
+        Returns:
+            dict[str, uuid.UUID]: UUIDs by name
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+        now = datetime.now(timezone.utc)
+        insert = UPSERT_DIALECTS[self._dialect_name()]
+        await self._session.execute(
+            insert(Tag)
+            .values([{'id': uuid7(), 'name': name, 'created_at': now, 'updated_at': now} for name in names])
+            .on_conflict_do_nothing(index_elements=['name'])
+        )
+        result = await self._session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+        return dict(result.all())
+
+    async def assign(self, post_id: uuid.UUID, tag_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Assign Tags to a Post, in a single statement.
+
+        Args:
+            post_id (uuid.UUID): UUID of the Post
+            tag_ids (Iterable[uuid.UUID]): UUIDs of the Tags
+        """
+        now = datetime.now(timezone.utc)
+        rows = [
+            {'id': uuid7(), 'post_id': post_id, 'tag_id': tag_id, 'created_at': now, 'updated_at': now}
+            for tag_id in set(tag_ids)
+        ]
+        if not rows:
+            return
+        insert = UPSERT_DIALECTS[self._dialect_name()]
+        await self._session.execute(
+            insert(PostTags).values(rows).on_conflict_do_nothing(index_elements=['tag_id', 'post_id'])
+        )
+
+    async def unassign_posts(self, post_ids: Iterable[uuid.UUID]) -> set[uuid.UUID]:
+        """
+        Remove every Tag from Posts, before the posts are deleted.
+
+        Args:
+            post_ids (Iterable[uuid.UUID]): UUIDs of the Posts
+
+        Returns:
+            set[uuid.UUID]: UUIDs of the Tags that were assigned
+        """
+        tag_ids = set()
+        for chunk in iter_chunks(post_ids, settings.BULK_CHUNK_SIZE):
+            result = await self._session.execute(
+                delete(PostTags)
+                .where(PostTags.post_id.in_(chunk))
+                .returning(PostTags.tag_id)
+                .execution_options(synchronize_session=False)
+            )
+            tag_ids.update(result.scalars())
+        return tag_ids
+
+    async def get_post_info_by_tag(
+        self,
+        tag_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[PostInfo]:
+        """
+        Get a page of listing projections of the Posts of a Tag.
+
+        Posts are ordered by descending id, newest first as ids are time
+        ordered, and paginated by keyset over the ``(tag_id, post_id)`` index,
+        so a page reads only its own entries of the tag, however popular it is.
+
+        Args:
+            tag_id (uuid.UUID): UUID of the Tag
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[PostInfo]: Page of Posts
+        """
+        limit = clamp_page_size(limit)
+        stmt = (
+            select_post_info()
+            .join(PostTags, PostTags.post_id == Post.id)
+            .where(PostTags.tag_id == tag_id)
+            .order_by(PostTags.post_id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            (post_id,) = decode_cursor(cursor, uuid.UUID)
+            stmt = stmt.where(PostTags.post_id < post_id)
+        result = await self._session.execute(stmt)
+        posts = await self._loaders.resolve_post_infos(result)
+        return build_page(posts, limit, key=lambda post: (post.id,))
+
+    async def get_leaderboard(self, limit: Optional[int] = None) -> list[Tag]:
+        """
+        Get the Tags with the most posts, from the summary.
+
+        Args:
+            limit (Optional[int]): Number of Tags, bounded by `settings.PAGE_SIZE_MAX`
+
+        Returns:
+            list[Tag]: Tags by decreasing post count
+        """
+        stmt = (
+            select(Tag)
+            .where(Tag.post_count > 0)
+            .order_by(Tag.post_count.desc(), Tag.id.desc())
+            .limit(clamp_page_size(limit))
+        )
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
+
+    async def refresh_post_counts(self, tag_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Recompute the post count summary of Tags.
+
+        Every count is an index only scan of ``(tag_id, post_id)``.
+
+        Args:
+            tag_ids (Iterable[uuid.UUID]): UUIDs of the Tags
+        """
+        for chunk in iter_chunks(tag_ids, settings.BULK_CHUNK_SIZE):
+            await self._session.execute(
+                update(Tag)
+                .where(Tag.id.in_(chunk))
+                .values(
+                    post_count=select(func.count()).where(PostTags.tag_id == Tag.id).scalar_subquery(),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
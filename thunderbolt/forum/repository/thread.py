@@ -1,15 +1,18 @@
 import uuid
 
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Optional
 from fastapi import Depends
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from thunderbolt.core.cache import Cache, get_cache, entity_to_dict, entity_from_dict, invalidate_on_commit
 from thunderbolt.core.session import get_session
 from thunderbolt.core.base import AbstractRepository
-from thunderbolt.models import Thread
+from thunderbolt.core.pagination import Page, build_page, clamp_page_size, decode_cursor
+from thunderbolt.models import Thread, Topic
 
 
 class ThreadRepository(AbstractRepository):
@@ -19,6 +22,7 @@ class ThreadRepository(AbstractRepository):
     This class encapsulates the database access for the Thread model. It provides
     functions for adding, getting, and deleting thread records.
     """
+    model = Thread
 
     def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
         """
@@ -73,10 +77,54 @@ class ThreadRepository(AbstractRepository):
         Returns:
             List[Thread]: List of Thread objects
         """
-        stmt = select(Thread).options(joinedload(Thread.topic)).where(Thread.topic_id == topic_id)
+        stmt = (
+            select(Thread)
+            .options(joinedload(Thread.topic))
+            .where(Thread.topic_id == topic_id)
+            .order_by(Thread.created_at, Thread.id)
+        )
         result = await self._session.execute(stmt)
         return result.scalars().all()
 
+    async def get_by_activity(
+        self,
+        topic_id: Optional[uuid.UUID] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[Thread]:
+        """
+        Get a page of Threads ordered by last activity, most recent first.
+
+        Served by the ``(topic_id, last_post_at, id)`` and ``(last_post_at, id)``
+        indexes, with the post count and last post taken from the Thread row.
+
+        Args:
+            topic_id (Optional[uuid.UUID]): UUID of the Topic, None for every Topic
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[Thread]: Page of Thread objects
+        """
+        limit = clamp_page_size(limit)
+        stmt = (
+            select(Thread)
+            .options(joinedload(Thread.topic))
+            .order_by(Thread.last_post_at.desc(), Thread.id.desc())
+            .limit(limit + 1)
+        )
+        if topic_id:
+            stmt = stmt.where(Thread.topic_id == topic_id)
+        if cursor:
+            last_post_at, thread_id = decode_cursor(cursor, datetime, uuid.UUID)
+            stmt = stmt.where(tuple_(Thread.last_post_at, Thread.id) < tuple_(last_post_at, thread_id))
+        result = await self._session.execute(stmt)
+        threads = result.scalars().all()
+        return build_page(threads, limit, key=lambda thread: (thread.last_post_at, thread.id))
+
     async def get_all(self) -> list[Thread]:
         """
         Get all Threads from the database.
@@ -97,3 +145,80 @@ class ThreadRepository(AbstractRepository):
         """
         await self._session.delete(thread)
         await self._session.flush()
+
+
+def _thread_to_dict(thread: Thread) -> dict:
+    return {**entity_to_dict(thread), 'topic': entity_to_dict(thread.topic)}
+
+
+def _thread_from_dict(row: dict) -> Thread:
+    thread = entity_from_dict(Thread, row)
+    thread.topic = entity_from_dict(Topic, row['topic'])
+    return thread
+
+
+class CachedThreadRepository(ThreadRepository):
+    """
+    Thread repository with a read-through cache for listings.
+
+    `get_all` and `get_all_threads_by_topic` are served from the cache, and every
+    write invalidates the thread listings once the session commits.
+    """
+    CACHE_NAMESPACE = 'threads'
+
+    def __init__(
+        self,
+        session: Annotated[AsyncSession, Depends(get_session)],
+        cache: Annotated[Cache, Depends(get_cache)],
+    ):
+        """
+        Initialize the CachedThreadRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+            cache (Cache): Cache for listings
+        """
+        super().__init__(session)
+        self._cache = cache
+
+    async def add(self, thread: Thread) -> None:
+        await super().add(thread)
+        invalidate_on_commit(self._session, self._cache, self.CACHE_NAMESPACE)
+
+    async def update(self, thread: Thread) -> None:
+        await super().update(thread)
+        invalidate_on_commit(self._session, self._cache, self.CACHE_NAMESPACE)
+
+    async def delete(self, thread: Thread) -> None:
+        await super().delete(thread)
+        invalidate_on_commit(self._session, self._cache, self.CACHE_NAMESPACE)
+
+    async def get_all_threads_by_topic(self, topic_id: uuid.UUID) -> list[Thread]:
+        """
+        Get all Threads for a specific Topic, from the cache when possible.
+
+        Args:
+            topic_id (uuid.UUID): UUID of the Topic
+
+        Returns:
+            List[Thread]: List of detached, read-only Thread objects
+        """
+        async def load() -> list[dict]:
+            threads = await super(CachedThreadRepository, self).get_all_threads_by_topic(topic_id)
+            return [_thread_to_dict(thread) for thread in threads]
+
+        rows = await self._cache.get_or_set(self.CACHE_NAMESPACE, f'topic:{topic_id}', load)
+        return [_thread_from_dict(row) for row in rows]
+
+    async def get_all(self) -> list[Thread]:
+        """
+        Get all Threads, from the cache when possible.
+
+        Returns:
+            List[Thread]: List of detached, read-only Thread objects
+        """
+        async def load() -> list[dict]:
+            return [_thread_to_dict(thread) for thread in await super(CachedThreadRepository, self).get_all()]
+
+        rows = await self._cache.get_or_set(self.CACHE_NAMESPACE, 'all', load)
+        return [_thread_from_dict(row) for row in rows]
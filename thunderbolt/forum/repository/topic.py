@@ -5,6 +5,7 @@ from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from thunderbolt.core.cache import Cache, get_cache, entity_to_dict, entity_from_dict, invalidate_on_commit
 from thunderbolt.core.session import get_session
 from thunderbolt.core.base import AbstractRepository
 from thunderbolt.models import Topic
@@ -17,6 +18,7 @@ class TopicRepository(AbstractRepository):
     This class encapsulates the database access for the Topic model. It provides
     functions for adding, getting, and deleting topic records.
     """
+    model = Topic
 
     def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
         """
@@ -95,3 +97,55 @@ class TopicRepository(AbstractRepository):
         """
         await self._session.delete(topic)
         await self._session.flush()
+
+
+class CachedTopicRepository(TopicRepository):
+    """
+    Topic repository with a read-through cache for listings.
+
+    `get_all` is served from the cache, and every write invalidates the topic
+    listings together with the thread listings that embed topics, once the
+    session commits.
+    """
+    CACHE_NAMESPACE = 'topics'
+    INVALIDATES = ('topics', 'threads')
+
+    def __init__(
+        self,
+        session: Annotated[AsyncSession, Depends(get_session)],
+        cache: Annotated[Cache, Depends(get_cache)],
+    ):
+        """
+        Initialize the CachedTopicRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+            cache (Cache): Cache for listings
+        """
+        super().__init__(session)
+        self._cache = cache
+
+    async def add(self, topic: Topic) -> None:
+        await super().add(topic)
+        invalidate_on_commit(self._session, self._cache, *self.INVALIDATES)
+
+    async def update(self, topic: Topic) -> None:
+        await super().update(topic)
+        invalidate_on_commit(self._session, self._cache, *self.INVALIDATES)
+
+    async def delete(self, topic: Topic) -> None:
+        await super().delete(topic)
+        invalidate_on_commit(self._session, self._cache, *self.INVALIDATES)
+
+    async def get_all(self) -> list[Topic]:
+        """
+        Get all Topics, from the cache when possible.
+
+        Returns:
+            List[Topic]: List of detached, read-only Topic objects
+        """
+        async def load() -> list[dict]:
+            return [entity_to_dict(topic) for topic in await super(CachedTopicRepository, self).get_all()]
+
+        rows = await self._cache.get_or_set(self.CACHE_NAMESPACE, 'all', load)
+        return [entity_from_dict(Topic, row) for row in rows]
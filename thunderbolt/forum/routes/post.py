@@ -1,16 +1,24 @@
 
-from typing import Annotated
+from typing import Annotated, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from thunderbolt.models import User
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import InvalidCursorError
+from thunderbolt.core.http_cache import HTTPCache, entity_etag, http_cache
+from thunderbolt.core.serialization import orjson_response
 from thunderbolt.forum.repository.post import PostRepository
 from thunderbolt.forum.service.post import PostService
-from thunderbolt.forum.schema.post import PostInfoResponse, PostDataCreate, PostDataUpdate
+from thunderbolt.forum.schema.post import PostInfoResponse, PostPageResponse, PostDataCreate, PostDataUpdate
 
 from thunderbolt.users.dependencies import get_user_by_token
 
 
+settings = get_settings()
+
+
 post_router = APIRouter(
     tags=["post", "forum"],
     prefix="/forum",
@@ -19,61 +27,77 @@ post_router = APIRouter(
 
 @post_router.get("/topics/threads/posts/users/{user_id}", response_model=list[PostInfoResponse])
 async def get_all_posts_by_user(
-    user_id: str,
+    user_id: UUID,
     post_repo: Annotated[PostRepository, Depends(PostRepository)],
 ) -> list[PostInfoResponse]:
     """
     Get all posts by user.
     
     Args:
-        user_id (str): The id of the user to be retrieved.
+        user_id (UUID): The id of the user to be retrieved.
         post_repo (PostRepository): The post repository to be used.
     
     Returns:
         PostResponse: The requested post.
     """
-    posts = await post_repo.get_by_user(user_id)
-    return posts
+    posts = await post_repo.get_info_by_user(user_id)
+    return orjson_response(list[PostInfoResponse], posts)
 
 
-@post_router.get("/topics/threads/{thread_id}/posts", response_model=list[PostInfoResponse])
+@post_router.get("/topics/threads/{thread_id}/posts", response_model=PostPageResponse)
 async def get_all_posts_by_thread(
-    thread_id: str,
+    thread_id: UUID,
     post_repo: Annotated[PostRepository, Depends(PostRepository)],
-) -> list[PostInfoResponse]:
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> PostPageResponse:
     """
-    Get all posts by thread.
+    Get a page of posts by thread.
     
     Args:
-        thread_id (str): The id of the thread to be retrieved.
+        thread_id (UUID): The id of the thread to be retrieved.
         post_repo (PostRepository): The post repository to be used.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
     
     Returns:
-        PostResponse: The requested post.
+        PostPageResponse: The requested page of posts.
     """
-    posts = await post_repo.get_by_thread(thread_id)
-    return posts
+    try:
+        page = await post_repo.get_info_by_thread(thread_id, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return orjson_response(PostPageResponse, page)
 
 
 @post_router.get("/topics/threads/posts/{post_id}", response_model=PostInfoResponse)
 async def get_post(
-    post_id: str,
+    post_id: UUID,
     post_repo: Annotated[PostRepository, Depends(PostRepository)],
+    cache: Annotated[HTTPCache, Depends(http_cache(max_age=30))],
 ) -> PostInfoResponse:
     """
     Get a post by id.
     
     Args:
-        post_id (str): The id of the post to be retrieved.
+        post_id (UUID): The id of the post to be retrieved.
         post_repo (PostRepository): The post repository to be used.
+        cache (HTTPCache): The caching policy of the route.
     
     Raises:
-        HTTPException: If the requested post is not found.
+        HTTPException: If the requested post is not found, 304 if the
+            client copy is up to date.
     
     Returns:
         PostResponse: The requested post.
     """
-    post = await post_repo.get(post_id)
+    post = await post_repo.get_info(post_id)
 
     if not post:
         raise HTTPException(
@@ -81,7 +105,8 @@ async def get_post(
             detail="Post not found",
         )
 
-    return post
+    cache.validate(entity_etag(post.id, post.updated_at), post.updated_at)
+    return orjson_response(PostInfoResponse, post)
 
 
 @post_router.post("/topics/threads/posts", response_model=PostInfoResponse)
@@ -89,19 +114,22 @@ async def create_post(
     post: PostDataCreate,
     user: Annotated[User, Depends(get_user_by_token)],
     post_service: Annotated[PostService, Depends(PostService)],
+    post_repo: Annotated[PostRepository, Depends(PostRepository)],
 ) -> PostInfoResponse:
     """
     Create a post.
     
     Args:
-        thread_id (str): The id of the thread to be retrieved.
+        post (PostDataCreate): The post data, with its tags.
+        user (User): The user making the request.
+        post_service (PostService): The post service to be used.
         post_repo (PostRepository): The post repository to be used.
     
     Returns:
-        PostResponse: The requested post.
+        PostResponse: The created post.
     """
     post = await post_service.create_post(user, post)
-    return post
+    return orjson_response(PostInfoResponse, await post_repo.get_info(post.id))
 
 
 @post_router.put("/topics/threads/posts/{post_id}", response_model=PostInfoResponse)
@@ -0,0 +1,82 @@
+
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import InvalidCursorError
+from thunderbolt.forum.repository.search import SearchRepository
+from thunderbolt.forum.schema.search import PostSearchPageResponse, ThreadSearchPageResponse
+
+
+settings = get_settings()
+
+
+search_router = APIRouter(
+    tags=["search", "forum"],
+    prefix="/forum",
+)
+
+
+@search_router.get("/search", response_model=PostSearchPageResponse)
+async def search_posts(
+    search_repo: Annotated[SearchRepository, Depends(SearchRepository)],
+    q: Annotated[str, Query(min_length=1, max_length=settings.SEARCH_QUERY_MAX_LENGTH)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> PostSearchPageResponse:
+    """
+    Search posts, best match first.
+
+    Args:
+        search_repo (SearchRepository): The search repository to be used.
+        q (str): The search query, every word must match.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        PostSearchPageResponse: The requested page of posts.
+    """
+    try:
+        page = await search_repo.search_posts(q, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return page
+
+
+@search_router.get("/search/threads", response_model=ThreadSearchPageResponse)
+async def search_threads(
+    search_repo: Annotated[SearchRepository, Depends(SearchRepository)],
+    q: Annotated[str, Query(min_length=1, max_length=settings.SEARCH_QUERY_MAX_LENGTH)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> ThreadSearchPageResponse:
+    """
+    Search threads, best match first.
+
+    Args:
+        search_repo (SearchRepository): The search repository to be used.
+        q (str): The search query, every word must match.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        ThreadSearchPageResponse: The requested page of threads.
+    """
+    try:
+        page = await search_repo.search_threads(q, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return page
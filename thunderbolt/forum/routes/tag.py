@@ -0,0 +1,76 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import InvalidCursorError
+from thunderbolt.core.serialization import orjson_response
+from thunderbolt.forum.repository.tag import TagRepository
+from thunderbolt.forum.schema.post import PostPageResponse
+from thunderbolt.forum.schema.tag import TagResponse
+
+
+settings = get_settings()
+
+
+tag_router = APIRouter(
+    tags=["tag", "forum"],
+    prefix="/forum",
+)
+
+
+@tag_router.get("/tags", response_model=list[TagResponse])
+async def get_tag_leaderboard(
+    tag_repo: Annotated[TagRepository, Depends(TagRepository)],
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> list[TagResponse]:
+    """
+    Get the tags with the most posts.
+
+    Args:
+        tag_repo (TagRepository): The tag repository to be used.
+        limit (int): The number of tags.
+
+    Returns:
+        list[TagResponse]: Tags by decreasing post count.
+    """
+    tags = await tag_repo.get_leaderboard(limit)
+    return orjson_response(list[TagResponse], tags)
+
+
+@tag_router.get("/tags/{name}/posts", response_model=PostPageResponse)
+async def get_posts_by_tag(
+    name: str,
+    tag_repo: Annotated[TagRepository, Depends(TagRepository)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> PostPageResponse:
+    """
+    Get a page of the posts of a tag.
+
+    Args:
+        name (str): The name of the tag.
+        tag_repo (TagRepository): The tag repository to be used.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the tag is not found or the cursor is malformed.
+
+    Returns:
+        PostPageResponse: The requested page of posts.
+    """
+    tag = await tag_repo.get_by_name(name.strip().lower())
+    if not tag:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tag not found",
+        )
+    try:
+        page = await tag_repo.get_post_info_by_tag(tag.id, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return orjson_response(PostPageResponse, page)
@@ -1,11 +1,23 @@
 
-from typing import Annotated
+from typing import Annotated, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.broadcast import Broadcaster, get_broadcaster, sse_stream
+from thunderbolt.core.pagination import InvalidCursorError
+from thunderbolt.core.http_cache import HTTPCache, entity_etag, http_cache
+from thunderbolt.core.serialization import orjson_response
 
 # TODO: add __init__ files to all folders
-from thunderbolt.forum.repository.thread import ThreadRepository
-from thunderbolt.forum.schema.thread import ThreadInfoWithRelatedResponse
+from thunderbolt.forum.repository.thread import ThreadRepository, CachedThreadRepository
+from thunderbolt.forum.service.post import thread_channel
+from thunderbolt.forum.schema.thread import ThreadInfoWithRelatedResponse, ThreadActivityPageResponse
+
+
+settings = get_settings()
 
 
 thread_router = APIRouter(
@@ -16,7 +28,7 @@ thread_router = APIRouter(
 
 @thread_router.get("/threads", response_model=list[ThreadInfoWithRelatedResponse])
 async def get_all_threads(
-    thread_repo: Annotated[ThreadRepository, Depends(ThreadRepository)],
+    thread_repo: Annotated[CachedThreadRepository, Depends(CachedThreadRepository)],
 ) -> list[ThreadInfoWithRelatedResponse]:
     """
     Get all threads.
@@ -28,23 +40,84 @@ async def get_all_threads(
         ThreadResponse: The requested thread.
     """
     threads = await thread_repo.get_all()
-    return threads
+    return orjson_response(list[ThreadInfoWithRelatedResponse], threads)
+
+
+@thread_router.get("/threads/active", response_model=ThreadActivityPageResponse)
+async def get_active_threads(
+    thread_repo: Annotated[ThreadRepository, Depends(ThreadRepository)],
+    topic_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+) -> ThreadActivityPageResponse:
+    """
+    Get a page of threads ordered by last activity, with post counts.
+
+    Args:
+        thread_repo (ThreadRepository): The thread repository to be used.
+        topic_id (Optional[UUID]): Only list threads of this topic.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        ThreadActivityPageResponse: The requested page of threads.
+    """
+    try:
+        page = await thread_repo.get_by_activity(topic_id, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return page
+
+
+@thread_router.get("/threads/{thread_id}/events", response_class=StreamingResponse)
+async def stream_thread_events(
+    thread_id: UUID,
+    broadcaster: Annotated[Broadcaster, Depends(get_broadcaster)],
+) -> StreamingResponse:
+    """
+    Stream new and deleted posts of a thread as Server-Sent Events.
+
+    Every event carries a JSON object with a `type` of `post_created` or
+    `post_deleted`. The stream holds no database session, idle watchers
+    only cost their subscription.
+
+    Args:
+        thread_id (UUID): The id of the thread to be watched.
+        broadcaster (Broadcaster): The broadcaster to subscribe with.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    return StreamingResponse(
+        sse_stream(broadcaster, thread_channel(thread_id)),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @thread_router.get("/threads/{thread_id}", response_model=ThreadInfoWithRelatedResponse)
 async def get_thread(
-    thread_id: str,
+    thread_id: UUID,
     thread_repo: Annotated[ThreadRepository, Depends(ThreadRepository)],
+    cache: Annotated[HTTPCache, Depends(http_cache(max_age=10))],
 ) -> ThreadInfoWithRelatedResponse:
     """
     Get a thread by id.
     
     Args:
-        thread_id (str): The id of the thread to be retrieved.
+        thread_id (UUID): The id of the thread to be retrieved.
         thread_repo (ThreadRepository): The thread repository to be used.
+        cache (HTTPCache): The caching policy of the route.
     
     Raises:
-        HTTPException: If the requested thread is not found.
+        HTTPException: If the requested thread is not found, 304 if the
+            client copy is up to date.
     
     Returns:
         ThreadResponse: The requested thread.
@@ -57,4 +130,8 @@ async def get_thread(
             detail="Thread not found",
         )
 
-    return thread
+    cache.validate(
+        entity_etag(thread.id, thread.updated_at, thread.topic.updated_at),
+        max(filter(None, (thread.updated_at, thread.topic.updated_at)), default=None),
+    )
+    return orjson_response(ThreadInfoWithRelatedResponse, thread)
@@ -3,8 +3,11 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from thunderbolt.core.http_cache import HTTPCache, collection_etag, http_cache
+from thunderbolt.core.serialization import orjson_response
+
 # TODO: add __init__ files to all folders
-from thunderbolt.forum.repository.topic import TopicRepository
+from thunderbolt.forum.repository.topic import TopicRepository, CachedTopicRepository
 from thunderbolt.forum.schema.topic import TopicInfoResponse
 
 
@@ -16,19 +19,25 @@ topic_router = APIRouter(
 
 @topic_router.get("/topics", response_model=list[TopicInfoResponse])
 async def get_all_topics(
-    topic_repo: Annotated[TopicRepository, Depends(TopicRepository)],
+    topic_repo: Annotated[CachedTopicRepository, Depends(CachedTopicRepository)],
+    cache: Annotated[HTTPCache, Depends(http_cache(max_age=60))],
 ) -> list[TopicInfoResponse]:
     """
     Get all topics.
     
     Args:
         topic_repo (TopicRepository): The topic repository to be used.
+        cache (HTTPCache): The caching policy of the route.
     
+    Raises:
+        HTTPException: 304 if the client copy is up to date.
+
     Returns:
         TopicResponse: The requested topic.
     """
     topics = await topic_repo.get_all()
-    return topics
+    cache.validate(collection_etag((topic.id, topic.updated_at) for topic in topics))
+    return orjson_response(list[TopicInfoResponse], topics)
 
 
 @topic_router.get("/topics/{topic_id}", response_model=TopicInfoResponse)
@@ -1,12 +1,19 @@
 
+from typing import Optional
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
+from thunderbolt.core.settings import get_settings
 from thunderbolt.forum.schema.thread import ThreadInfoWithRelatedResponse
 from thunderbolt.users.schema import UserPersonalInfoResponse
 
 
+settings = get_settings()
+
+
 class PostInfoResponse(BaseModel):
-    id: int = Field(example=1, description='Post ID')
+    id: UUID = Field(description='Post ID')
     thread: ThreadInfoWithRelatedResponse = Field(description='Thread')
     user: UserPersonalInfoResponse = Field(description='User')
     title: str = Field(example='Post title', description='Post title')
@@ -15,16 +22,31 @@ class PostInfoResponse(BaseModel):
         orm_mode = True
 
 
+class PostPageResponse(BaseModel):
+    items: list[PostInfoResponse] = Field(description='Posts of the page')
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, null on the last page',
+        default=None,
+    )
+
+    class Config:
+        orm_mode = True
+
+
 class PostDataCreate(BaseModel):
-    thread_id: int = Field(example=1, description='Thread ID')
-    user_id: int = Field(example=1, description='User ID')
+    thread_id: UUID = Field(description='Thread ID')
     title: str = Field(example='Post title', description='Post title')
     content: str = Field(example='Post content', description='Post content')
+    tags: list[str] = Field(
+        example=['aviation'],
+        description='Tag names, created when missing',
+        default=[],
+        max_items=settings.TAG_MAX_PER_POST,
+    )
 
 
 class PostDataUpdate(BaseModel):
-    id: int = Field(example=1, description='Post ID')
-    thread_id: int = Field(example=1, description='Thread ID')
-    user_id: int = Field(example=1, description='User ID')
+    id: UUID = Field(description='Post ID')
+    thread_id: UUID = Field(description='Thread ID')
     title: str = Field(example='Post title', description='Post title')
     content: str = Field(example='Post content', description='Post content')
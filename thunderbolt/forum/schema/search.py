@@ -0,0 +1,54 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class PostSearchResult(BaseModel):
+    id: UUID = Field(description='Post ID')
+    thread_id: UUID = Field(description='Thread ID')
+    title: str = Field(example='Post title', description='Post title')
+    snippet: str = Field(
+        example='Fragment of the <mark>matching</mark> content',
+        description='Content fragment, HTML escaped, matches are wrapped in <mark>',
+    )
+    rank: float = Field(example=0.0607927, description='Relevance, higher is better')
+
+    class Config:
+        orm_mode = True
+
+
+class ThreadSearchResult(BaseModel):
+    id: UUID = Field(description='Thread ID')
+    topic_id: UUID = Field(description='Topic ID')
+    title: str = Field(example='Hello world', description='Thread title')
+    snippet: str = Field(
+        example='Fragment of the <mark>matching</mark> description',
+        description='Description fragment, HTML escaped, matches are wrapped in <mark>',
+    )
+    rank: float = Field(example=0.0607927, description='Relevance, higher is better')
+
+    class Config:
+        orm_mode = True
+
+
+class PostSearchPageResponse(BaseModel):
+    items: list[PostSearchResult] = Field(description='Posts of the page, best match first')
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, null on the last page',
+        default=None,
+    )
+
+    class Config:
+        orm_mode = True
+
+
+class ThreadSearchPageResponse(BaseModel):
+    items: list[ThreadSearchResult] = Field(description='Threads of the page, best match first')
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, null on the last page',
+        default=None,
+    )
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,12 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class TagResponse(BaseModel):
+    id: UUID = Field(description='Tag ID')
+    name: str = Field(example='aviation', description='Tag name')
+    post_count: int = Field(example=42, description='Number of posts, refreshed in the background', default=0)
+
+    class Config:
+        orm_mode = True
@@ -1,4 +1,8 @@
 
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 from thunderbolt.forum.schema.topic import TopicInfoResponse
@@ -9,9 +13,10 @@ class ThreadInfoWithoutRelatedResponse(BaseModel):
         example='Hello world',
         description='Thread title'
     )
-    description: str = Field(
+    description: Optional[str] = Field(
         example='Hello world',
-        description='Thread description'
+        description='Thread description',
+        default=None,
     )
 
     class Config:
@@ -31,3 +36,24 @@ class ThreadInfoWithRelatedResponse(ThreadInfoWithoutRelatedResponse):
 
     class Config:
         orm_mode = True
+
+
+class ThreadActivityResponse(ThreadInfoWithRelatedResponse):
+    id: UUID = Field(description='Thread ID')
+    post_count: int = Field(example=42, description='Number of posts')
+    last_post_at: datetime = Field(description='Time of the last post, or of creation without posts')
+    last_post_id: Optional[UUID] = Field(description='ID of the last post', default=None)
+
+    class Config:
+        orm_mode = True
+
+
+class ThreadActivityPageResponse(BaseModel):
+    items: list[ThreadActivityResponse] = Field(description='Threads of the page')
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, null on the last page',
+        default=None,
+    )
+
+    class Config:
+        orm_mode = True
@@ -1,11 +1,18 @@
 
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 
 class TopicInfoResponse(BaseModel):
     symbol: str = Field(example='GEN', description='Topic symbol')
     title: str = Field(example='General', description='Topic title')
-    description: str = Field(example='General discussion', description='Topic description')
+    description: Optional[str] = Field(example='General discussion', description='Topic description', default=None)
+    post_count: int = Field(example=42, description='Number of posts', default=0)
+    last_post_at: Optional[datetime] = Field(description='Time of the last post', default=None)
+    last_post_id: Optional[UUID] = Field(description='ID of the last post', default=None)
 
     class Config:
         orm_mode = True
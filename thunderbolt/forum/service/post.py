@@ -1,23 +1,74 @@
 
+import uuid
+
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from thunderbolt.models import User, Post
+from thunderbolt.core.jobs import enqueue
+from thunderbolt.core.session import get_session
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.broadcast import Broadcaster, get_broadcaster, publish_on_commit
 
+from thunderbolt.forum.jobs import refresh_tag_counts
 from thunderbolt.forum.schema.post import PostDataCreate, PostInfoResponse
 from thunderbolt.forum.repository.post import PostRepository
+from thunderbolt.forum.repository.tag import TagRepository
+
+
+settings = get_settings()
+
+
+def thread_channel(thread_id: uuid.UUID) -> str:
+    """
+    Get the broadcast channel of a thread.
+
+    Args:
+        thread_id (uuid.UUID): The id of the thread.
+
+    Returns:
+        str: The channel name.
+    """
+    return f'thread:{thread_id}'
 
 
 class PostService:
     """
     Service for post related operations.
+
+    Creations and deletions are committed together with the background jobs
+    refreshing the tag post counts they change, and published to the channel
+    of the thread once committed, see `thread_channel`.
     """
 
     def __init__(
         self, 
-        post_repo: Annotated[PostRepository, Depends(PostRepository)]
+        post_repo: Annotated[PostRepository, Depends(PostRepository)],
+        tag_repo: Annotated[TagRepository, Depends(TagRepository)],
+        broadcaster: Annotated[Broadcaster, Depends(get_broadcaster)],
+        session: Annotated[AsyncSession, Depends(get_session)],
     ) -> None:
         self.post_repo: PostRepository = post_repo
+        self.tag_repo: TagRepository = tag_repo
+        self.broadcaster: Broadcaster = broadcaster
+        self.session: AsyncSession = session
+
+    def _normalize_tags(self, tags: list[str]) -> list[str]:
+        """
+        Normalize tag names.
+
+        Raises:
+            HTTPException: A tag is empty or too long
+        """
+        names = {tag.strip().lower() for tag in tags}
+        if any(not name or len(name) > settings.TAG_MAX_LENGTH for name in names):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tags must be 1 to {settings.TAG_MAX_LENGTH} characters long",
+            )
+        return sorted(names)
 
     async def create_post(self, user: User, post_data: PostDataCreate) -> Post:
         """
@@ -28,12 +79,13 @@ class PostService:
             post_data (PostDataCreate): The post data to be used.
 
         Raises:
-            HTTPException: If the requested thread is not found.
+            HTTPException: If the requested thread is not found or a tag is invalid.
 
         Returns:
             Post: The created post.
         """
-        post_data_dict = post_data.dict()
+        tag_names = self._normalize_tags(post_data.tags)
+        post_data_dict = post_data.dict(exclude={'tags'})
         post_model = Post()
         
         for field, value in post_data_dict.items():
@@ -41,8 +93,23 @@ class PostService:
         
         post_model.user_id = user.id
         
-        post = await self.post_repo.add(post_model)
-        return post
+        await self.post_repo.add(post_model)
+        if tag_names:
+            tag_ids = (await self.tag_repo.get_or_create_many(tag_names)).values()
+            await self.tag_repo.assign(post_model.id, tag_ids)
+            await enqueue(self.session, refresh_tag_counts, tag_ids=list(tag_ids))
+        publish_on_commit(self.session, self.broadcaster, thread_channel(post_model.thread_id), {
+            'type': 'post_created',
+            'thread_id': post_model.thread_id,
+            'post': {
+                'id': post_model.id,
+                'user_id': post_model.user_id,
+                'title': post_model.title,
+                'created_at': post_model.created_at,
+            },
+        })
+        await self.session.commit()
+        return post_model
 
     async def update_post(self, user: User, post_data: PostDataCreate) -> Post:
         """
@@ -94,4 +161,13 @@ class PostService:
                 detail="User is not authorized to delete this post",
             )
 
+        tag_ids = await self.tag_repo.unassign_posts([post.id])
         await self.post_repo.delete(post)
+        if tag_ids:
+            await enqueue(self.session, refresh_tag_counts, tag_ids=list(tag_ids))
+        publish_on_commit(self.session, self.broadcaster, thread_channel(post.thread_id), {
+            'type': 'post_deleted',
+            'thread_id': post.thread_id,
+            'post_id': post.id,
+        })
+        await self.session.commit()
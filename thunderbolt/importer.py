@@ -0,0 +1,174 @@
+
+"""
+Bulk JSONL importer.
+
+Streams a JSON Lines file, one object of column values per line, into the
+database through the bulk repository operations:
+
+    python -m thunderbolt.importer post posts.jsonl
+    python -m thunderbolt.importer product products.jsonl --upsert
+    cat threads.jsonl | python -m thunderbolt.importer thread -
+
+Rows are sent and committed in chunks of `settings.BULK_CHUNK_SIZE`, so memory
+stays flat and an interrupted import keeps every committed chunk. UUIDs,
+timestamps and decimals are given as strings.
+"""
+
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+# Add the thunderbolt package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.base import AbstractRepository, iter_chunks
+from thunderbolt.core.session import SessionLocal
+from thunderbolt.core.settings import get_settings
+from thunderbolt.forum.repository.post import PostRepository
+from thunderbolt.forum.repository.thread import ThreadRepository
+from thunderbolt.market.repository.product import ProductRepository
+
+
+settings = get_settings()
+
+REPOSITORIES: dict[str, type[AbstractRepository]] = {
+    'post': PostRepository,
+    'thread': ThreadRepository,
+    'product': ProductRepository,
+}
+
+CONVERTERS: dict[type, Callable] = {
+    uuid.UUID: uuid.UUID,
+    datetime: datetime.fromisoformat,
+    Decimal: Decimal,
+}
+
+
+def get_converters(table: Table) -> dict[str, Callable]:
+    """
+    Get the converters of the columns whose JSON value is a string.
+
+    Args:
+        table (Table): The table.
+
+    Returns:
+        dict[str, Callable]: Converters by column name.
+    """
+    converters = {}
+    for column in table.columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+        if python_type in CONVERTERS:
+            converters[column.key] = CONVERTERS[python_type]
+    return converters
+
+
+def read_jsonl(path: str, table: Table) -> Iterator[dict]:
+    """
+    Read rows from a JSONL file.
+
+    Args:
+        path (str): Path of the file, '-' for stdin.
+        table (Table): Table the rows belong to.
+
+    Raises:
+        ValueError: If a line is not an object of known columns.
+
+    Yields:
+        dict: Column values.
+    """
+    converters = get_converters(table)
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for lineno, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {lineno}: expected an object")
+            unknown = row.keys() - table.c.keys()
+            if unknown:
+                raise ValueError(f"Line {lineno}: unknown columns {', '.join(sorted(unknown))}")
+            for key, converter in converters.items():
+                value = row.get(key)
+                if value is None:
+                    continue
+                if converter is Decimal:
+                    row[key] = Decimal(str(value))
+                elif isinstance(value, str):
+                    row[key] = converter(value)
+            yield row
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+async def import_jsonl(
+    session: AsyncSession,
+    name: str,
+    path: str,
+    upsert: bool = False,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Import a JSONL file, committing after every chunk.
+
+    Args:
+        session (AsyncSession): Session to import with.
+        name (str): Target, one of `REPOSITORIES`.
+        path (str): Path of the file, '-' for stdin.
+        upsert (bool): Update rows whose id already exists instead of failing.
+        chunk_size (Optional[int]): Rows per chunk, defaults to `settings.BULK_CHUNK_SIZE`.
+
+    Returns:
+        int: Number of imported rows.
+    """
+    repository = REPOSITORIES[name](session)
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    rows = read_jsonl(path, repository.model.__table__)
+
+    count = 0
+    for chunk in iter_chunks(rows, chunk_size):
+        if upsert:
+            count += await repository.upsert_many(chunk, chunk_size=chunk_size)
+        else:
+            count += await repository.add_many(chunk, chunk_size=chunk_size)
+        await session.commit()
+    return count
+
+
+async def run(name: str, path: str, upsert: bool, chunk_size: Optional[int]) -> int:
+    async with SessionLocal() as session:
+        return await import_jsonl(session, name, path, upsert=upsert, chunk_size=chunk_size)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m thunderbolt.importer', description='Bulk import JSONL rows.')
+    parser.add_argument('target', choices=sorted(REPOSITORIES))
+    parser.add_argument('path', help="JSONL file, '-' for stdin")
+    parser.add_argument('--upsert', action='store_true', help='update rows whose id already exists')
+    parser.add_argument('--chunk-size', type=int, default=None, help='rows per chunk')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = asyncio.run(run(args.target, args.path, args.upsert, args.chunk_size))
+    elapsed = time.perf_counter() - started
+    print(f'Imported {count} {args.target} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} rows/s)', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
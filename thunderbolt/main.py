@@ -1,19 +1,69 @@
-import core
+import sys
+import asyncio
 import uvicorn
 
+from pathlib import Path
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
+
+# Add the thunderbolt package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.session import SessionLocal, get_engines, warmup_engine
+from thunderbolt.core.hashing import get_password_hasher
+from thunderbolt.core.payments.yookassa.async_client import close_yookassa_client
+from thunderbolt.core.payments.notifications import close_notification_queue
+from thunderbolt.core.routes import internal_router, metrics_router
+from thunderbolt.core.http_cache import HTTPCacheMiddleware
+from thunderbolt.core.metrics import MetricsMiddleware
+from thunderbolt.core import diagnostics
+from thunderbolt.core.broadcast import close_broadcaster
 from thunderbolt.users import auth_router, user_router
-from thunderbolt.forum import topic_router, thread_router, post_router
+from thunderbolt.forum import topic_router, thread_router, post_router, search_router, tag_router
+from thunderbolt.market.routes import market_router
+from thunderbolt.market.repository.hot_cart import close_hot_cart_store, get_hot_cart_store, write_back_carts
+
 
+settings = get_settings()
 
-settings = core.settings.get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the worker up before serving traffic and release resources on shutdown.
+    """
+    configure_mappers()
+    for engine in get_engines():
+        await warmup_engine(engine, settings.WARMUP_POOL_CONNECTIONS)
+    hot_carts = get_hot_cart_store()
+    if hot_carts is not None:
+        write_back_task = asyncio.create_task(write_back_carts(hot_carts, SessionLocal))
+    yield
+    await close_notification_queue()
+    if hot_carts is not None:
+        write_back_task.cancel()
+        await asyncio.gather(write_back_task, return_exceptions=True)
+        await close_hot_cart_store()
+    get_password_hasher().shutdown()
+    await close_yookassa_client()
+    await close_broadcaster()
+    for engine in get_engines():
+        await engine.dispose()
 
 
 app = FastAPI(
     debug=settings.DEBUG,
     title=settings.APP_NAME,
+    lifespan=lifespan,
 )
+app.add_middleware(HTTPCacheMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if diagnostics.ENABLED:
+    app.add_middleware(diagnostics.DiagnosticsMiddleware)
 
 # User routes
 app.include_router(auth_router)
@@ -23,6 +73,15 @@ app.include_router(user_router)
 app.include_router(topic_router)
 app.include_router(thread_router)
 app.include_router(post_router)
+app.include_router(search_router)
+app.include_router(tag_router)
+
+# Market routes
+app.include_router(market_router)
+
+# Internal routes
+app.include_router(internal_router)
+app.include_router(metrics_router)
 
 
 def main():
@@ -0,0 +1,249 @@
+import uuid
+
+from decimal import Decimal
+from datetime import datetime, timezone
+from typing import Annotated, Iterable, Mapping, NamedTuple, Optional
+from fastapi import Depends
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.base import AbstractRepository
+from thunderbolt.core.base.repository import UPSERT_DIALECTS
+from thunderbolt.core.ids import uuid7
+from thunderbolt.core.session import get_session
+from thunderbolt.models import Currency, Product, ProductCart
+
+
+class CartLine(NamedTuple):
+    product_id: uuid.UUID
+    name: str
+    price: Decimal
+    currency_id: uuid.UUID
+    quantity: int
+    subtotal: Decimal
+
+
+class CartTotal(NamedTuple):
+    currency_id: uuid.UUID
+    currency: str
+    total: Decimal
+    quantity: int
+
+
+class CartRepository(AbstractRepository):
+    """
+    Repository class for ProductCart model
+
+    A cart is the set of ProductCart rows of a user, one per product, unique on
+    ``(user_id, product_id)``. Batch changes are a single multi-row upsert on
+    that key, and totals are summed by the database, no Product is loaded.
+    """
+    model = ProductCart
+
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
+        """
+        Initialize the CartRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+        """
+        self._session = session
+
+    async def add(self, item: ProductCart) -> None:
+        """
+        Add a ProductCart to the database.
+
+        Args:
+            item (ProductCart): ProductCart object to be added
+        """
+        self._session.add(item)
+        await self._session.flush()
+
+    async def update(self, item: ProductCart) -> None:
+        """
+        Update a ProductCart in the database.
+
+        Args:
+            item (ProductCart): ProductCart object to be updated
+        """
+        self._session.add(item)
+        await self._session.flush()
+
+    async def get(self, item_id: uuid.UUID) -> Optional[ProductCart]:
+        """
+        Get a ProductCart from the database by id.
+
+        Args:
+            item_id (uuid.UUID): UUID of the ProductCart
+
+        Returns:
+            Optional[ProductCart]: ProductCart object
+        """
+        stmt = select(ProductCart).where(ProductCart.id == item_id)
+        result = await self._session.execute(stmt)
+        return result.scalars().first()
+
+    async def delete(self, item: ProductCart) -> None:
+        """
+        Delete a ProductCart from the database.
+
+        Args:
+            item (ProductCart): ProductCart object to be deleted
+        """
+        await self._session.delete(item)
+        await self._session.flush()
+
+    async def _upsert(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int], increment: bool) -> None:
+        if not quantities:
+            return
+        now = datetime.now(timezone.utc)
+        insert = UPSERT_DIALECTS[self._dialect_name()]
+        stmt = insert(ProductCart).values([
+            {
+                'id': uuid7(),
+                'user_id': user_id,
+                'product_id': product_id,
+                'quantity': quantity,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for product_id, quantity in quantities.items()
+        ])
+        quantity = ProductCart.quantity + stmt.excluded.quantity if increment else stmt.excluded.quantity
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'product_id'],
+            set_={'quantity': quantity, 'updated_at': now},
+        )
+        await self._session.execute(stmt)
+
+    async def add_items(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        """
+        Add products to a cart, on top of the quantities already in it.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+            quantities (Mapping[uuid.UUID, int]): Positive quantities by Product UUID
+        """
+        await self._upsert(user_id, quantities, increment=True)
+
+    async def set_quantities(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        """
+        Set the quantities of products in a cart, a quantity of 0 removes the product.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+            quantities (Mapping[uuid.UUID, int]): Quantities by Product UUID
+        """
+        await self._upsert(user_id, {key: value for key, value in quantities.items() if value > 0}, increment=False)
+        await self.remove_items(user_id, [key for key, value in quantities.items() if value <= 0])
+
+    async def remove_items(self, user_id: uuid.UUID, product_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Remove products from a cart.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+            product_ids (Iterable[uuid.UUID]): UUIDs of the Products
+        """
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        await self._session.execute(
+            delete(ProductCart)
+            .where(ProductCart.user_id == user_id, ProductCart.product_id.in_(product_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def replace(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        """
+        Make a cart hold exactly the given quantities.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+            quantities (Mapping[uuid.UUID, int]): Positive quantities by Product UUID
+        """
+        stmt = delete(ProductCart).where(ProductCart.user_id == user_id)
+        if quantities:
+            stmt = stmt.where(ProductCart.product_id.not_in(list(quantities)))
+        await self._session.execute(stmt.execution_options(synchronize_session=False))
+        await self._upsert(user_id, quantities, increment=False)
+
+    async def get_quantities(self, user_id: uuid.UUID) -> dict[uuid.UUID, int]:
+        """
+        Get the quantities of the products in a cart.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            dict[uuid.UUID, int]: Quantities by Product UUID
+        """
+        stmt = select(ProductCart.product_id, ProductCart.quantity).where(ProductCart.user_id == user_id)
+        result = await self._session.execute(stmt)
+        return dict(result.all())
+
+    async def get_lines(self, user_id: uuid.UUID) -> list[CartLine]:
+        """
+        Get the lines of a cart, in the order products were added.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            list[CartLine]: Product, quantity and subtotal of every line
+        """
+        stmt = (
+            select(
+                ProductCart.product_id,
+                Product.name,
+                Product.price,
+                Product.currency_id,
+                ProductCart.quantity,
+                (Product.price * ProductCart.quantity).label('subtotal'),
+            )
+            .join(Product, Product.id == ProductCart.product_id)
+            .where(ProductCart.user_id == user_id)
+            .order_by(ProductCart.created_at, ProductCart.id)
+        )
+        result = await self._session.execute(stmt)
+        return [CartLine(*row) for row in result]
+
+    async def get_totals(self, user_id: uuid.UUID) -> list[CartTotal]:
+        """
+        Get the totals of a cart, one per currency.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            list[CartTotal]: Sum of ``price * quantity`` and of quantities by currency
+        """
+        stmt = (
+            select(
+                Product.currency_id,
+                Currency.name,
+                func.sum(Product.price * ProductCart.quantity),
+                func.sum(ProductCart.quantity),
+            )
+            .join(Product, Product.id == ProductCart.product_id)
+            .join(Currency, Currency.id == Product.currency_id)
+            .where(ProductCart.user_id == user_id)
+            .group_by(Product.currency_id, Currency.name)
+            .order_by(Currency.name)
+        )
+        result = await self._session.execute(stmt)
+        return [CartTotal(*row) for row in result]
+
+    async def get_existing_products(self, product_ids: Iterable[uuid.UUID]) -> set[uuid.UUID]:
+        """
+        Get which of the given Products exist.
+
+        Args:
+            product_ids (Iterable[uuid.UUID]): UUIDs of the Products
+
+        Returns:
+            set[uuid.UUID]: UUIDs of the existing Products
+        """
+        result = await self._session.execute(select(Product.id).where(Product.id.in_(list(product_ids))))
+        return set(result.scalars())
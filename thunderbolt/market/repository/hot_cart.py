@@ -0,0 +1,242 @@
+
+"""
+Redis resident carts, written back to the database asynchronously.
+
+With `settings.CART_HOT_ENABLED` a cart lives in a Redis hash of quantities by
+product id from its first change on. Changes are applied to the hash, which is
+atomic per batch, and the user is added to a set of dirty carts; the database
+is not touched. `write_back_carts` periodically copies every dirty cart to the
+``product_cart`` table, and a cart is also written back before it is read from
+the database, e.g. to be totaled at checkout.
+
+Redis is the source of truth of hot carts: while it is unreachable cart changes
+fail with `HotCartUnavailableError` rather than diverge from it.
+"""
+
+import uuid
+import asyncio
+import logging
+
+from typing import Iterable, Mapping, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Field marking a hash as a loaded cart, so an emptied cart is still hot
+LOADED_FIELD = '_loaded'
+
+# Loads a cart into its hash unless it already holds one
+WARM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], unpack(ARGV))
+end
+redis.call('EXPIRE', KEYS[1], KEYS[2])
+"""
+
+
+class HotCartUnavailableError(Exception):
+    """
+    Raised when the hot cart store cannot be reached.
+    """
+
+
+class HotCartStore:
+    """
+    Carts held in Redis hashes.
+    """
+
+    def __init__(self, redis: aioredis.Redis, prefix: str = 'thunderbolt:cart', ttl: Optional[int] = None) -> None:
+        self._redis = redis
+        self._prefix = prefix
+        self._ttl = ttl or settings.CART_HOT_TTL
+        self._warm = redis.register_script(WARM_SCRIPT)
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f'{self._prefix}:{user_id}'
+
+    @property
+    def _dirty_key(self) -> str:
+        return f'{self._prefix}:dirty'
+
+    async def is_hot(self, user_id: uuid.UUID) -> bool:
+        try:
+            return bool(await self._redis.exists(self._key(user_id)))
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+
+    async def warm(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        """
+        Load a cart read from the database, unless it is already hot.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+            quantities (Mapping[uuid.UUID, int]): Quantities by Product UUID.
+        """
+        fields = [LOADED_FIELD, 1]
+        for product_id, quantity in quantities.items():
+            fields += [str(product_id), quantity]
+        try:
+            await self._warm(keys=[self._key(user_id), self._ttl], args=fields)
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+
+    async def _apply(self, user_id: uuid.UUID, increments: Mapping, quantities: Mapping, removals: Iterable) -> None:
+        key = self._key(user_id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for product_id, quantity in increments.items():
+                    pipe.hincrby(key, str(product_id), quantity)
+                if quantities:
+                    pipe.hset(key, mapping={str(product_id): quantity for product_id, quantity in quantities.items()})
+                removals = [str(product_id) for product_id in removals]
+                if removals:
+                    pipe.hdel(key, *removals)
+                pipe.expire(key, self._ttl)
+                pipe.sadd(self._dirty_key, str(user_id))
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+
+    async def add_items(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        await self._apply(user_id, quantities, {}, ())
+
+    async def set_quantities(self, user_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        await self._apply(
+            user_id,
+            {},
+            {key: value for key, value in quantities.items() if value > 0},
+            [key for key, value in quantities.items() if value <= 0],
+        )
+
+    async def remove_items(self, user_id: uuid.UUID, product_ids: Iterable[uuid.UUID]) -> None:
+        await self._apply(user_id, {}, {}, product_ids)
+
+    async def get_quantities(self, user_id: uuid.UUID) -> Optional[dict[uuid.UUID, int]]:
+        """
+        Get the quantities of a hot cart.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+
+        Returns:
+            Optional[dict[uuid.UUID, int]]: Quantities by Product UUID, None if the cart is not hot.
+        """
+        try:
+            fields = await self._redis.hgetall(self._key(user_id))
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+        if not fields:
+            return None
+        fields.pop(LOADED_FIELD, None)
+        return {uuid.UUID(product_id): int(quantity) for product_id, quantity in fields.items()}
+
+    async def pop_dirty(self, count: int) -> list[uuid.UUID]:
+        try:
+            return [uuid.UUID(user_id) for user_id in await self._redis.spop(self._dirty_key, count) or ()]
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+
+    async def take_dirty(self, user_id: uuid.UUID) -> bool:
+        try:
+            return bool(await self._redis.srem(self._dirty_key, str(user_id)))
+        except (RedisError, OSError) as e:
+            raise HotCartUnavailableError(str(e)) from e
+
+    async def mark_dirty(self, user_ids: Iterable[uuid.UUID]) -> None:
+        user_ids = [str(user_id) for user_id in user_ids]
+        if user_ids:
+            try:
+                await self._redis.sadd(self._dirty_key, *user_ids)
+            except (RedisError, OSError) as e:
+                raise HotCartUnavailableError(str(e)) from e
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+async def write_back(store: HotCartStore, session, user_ids: Iterable[uuid.UUID]) -> None:
+    """
+    Copy hot carts to the database and commit.
+
+    Carts changed again while being written stay dirty and are written by the
+    next pass. On failure the carts are marked dirty again.
+
+    Args:
+        store (HotCartStore): The store.
+        session (AsyncSession): Session to write with.
+        user_ids (Iterable[uuid.UUID]): UUIDs of the Users whose cart is written.
+    """
+    from thunderbolt.market.repository.cart import CartRepository
+
+    user_ids = list(user_ids)
+    cart_repo = CartRepository(session)
+    try:
+        for user_id in user_ids:
+            quantities = await store.get_quantities(user_id)
+            if quantities is not None:
+                await cart_repo.replace(user_id, quantities)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        await store.mark_dirty(user_ids)
+        raise
+
+
+async def write_back_carts(store: HotCartStore, session_factory) -> None:
+    """
+    Write dirty hot carts back every `settings.CART_WRITE_BACK_INTERVAL` seconds, until cancelled.
+
+    Args:
+        store (HotCartStore): The store.
+        session_factory: Callable returning a new AsyncSession.
+    """
+    while True:
+        await asyncio.sleep(settings.CART_WRITE_BACK_INTERVAL)
+        try:
+            while user_ids := await store.pop_dirty(settings.CART_WRITE_BACK_BATCH):
+                async with session_factory() as session:
+                    await write_back(store, session, user_ids)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Cart write-back failed, retrying: %s", e)
+
+
+_store: Optional[HotCartStore] = None
+
+
+def get_hot_cart_store() -> Optional[HotCartStore]:
+    """
+    Get the process wide hot cart store.
+
+    Returns:
+        Optional[HotCartStore]: The store, None unless `settings.CART_HOT_ENABLED`.
+    """
+    global _store
+    if _store is None and settings.CART_HOT_ENABLED:
+        redis = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        _store = HotCartStore(redis)
+    return _store
+
+
+async def close_hot_cart_store() -> None:
+    """
+    Close the process wide hot cart store, if it was created.
+    """
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
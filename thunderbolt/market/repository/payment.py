@@ -0,0 +1,132 @@
+import uuid
+
+from datetime import datetime, timezone
+from typing import Annotated, Iterable, Optional
+from fastapi import Depends
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.base import AbstractRepository
+from thunderbolt.core.base.repository import UPSERT_DIALECTS
+from thunderbolt.core.ids import uuid7
+from thunderbolt.core.payments.notifications import STATUS_RANK, PaymentUpdate
+from thunderbolt.core.session import get_session
+from thunderbolt.models import Payment
+
+
+class PaymentRepository(AbstractRepository):
+    """
+    Repository class for Payment model
+
+    Payment states are only written by `apply_updates`, a single upsert per
+    batch of notifications that never moves a payment back to an earlier
+    status, so replaying notifications is harmless.
+    """
+    model = Payment
+
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
+        """
+        Initialize the PaymentRepository class.
+
+        Args:
+            session (AsyncSession): SQLAlchemy Session for database access
+        """
+        self._session = session
+
+    async def add(self, item: Payment) -> None:
+        """
+        Add a Payment to the database.
+
+        Args:
+            item (Payment): Payment object to be added
+        """
+        self._session.add(item)
+        await self._session.flush()
+
+    async def update(self, item: Payment) -> None:
+        """
+        Update a Payment in the database.
+
+        Args:
+            item (Payment): Payment object to be updated
+        """
+        self._session.add(item)
+        await self._session.flush()
+
+    async def get(self, item_id: uuid.UUID) -> Optional[Payment]:
+        """
+        Get a Payment from the database by id.
+
+        Args:
+            item_id (uuid.UUID): UUID of the Payment
+
+        Returns:
+            Optional[Payment]: Payment object
+        """
+        stmt = select(Payment).where(Payment.id == item_id)
+        result = await self._session.execute(stmt)
+        return result.scalars().first()
+
+    async def delete(self, item: Payment) -> None:
+        """
+        Delete a Payment from the database.
+
+        Args:
+            item (Payment): Payment object to be deleted
+        """
+        await self._session.delete(item)
+        await self._session.flush()
+
+    async def get_by_provider_id(self, provider_payment_id: str) -> Optional[Payment]:
+        """
+        Get a Payment from the database by the id given by the provider.
+
+        Args:
+            provider_payment_id (str): Id of the payment at the provider
+
+        Returns:
+            Optional[Payment]: Payment object
+        """
+        stmt = select(Payment).where(Payment.provider_payment_id == provider_payment_id)
+        result = await self._session.execute(stmt)
+        return result.scalars().first()
+
+    async def apply_updates(self, updates: Iterable[PaymentUpdate]) -> None:
+        """
+        Record payment states, unless a payment is already in the same or a later status.
+
+        Args:
+            updates (Iterable[PaymentUpdate]): At most one update per payment, see `latest_updates`
+        """
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                'id': uuid7(),
+                'provider_payment_id': update.provider_payment_id,
+                'status': update.status,
+                'paid': update.paid,
+                'amount': update.amount,
+                'currency': update.currency,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for update in updates
+        ]
+        if not rows:
+            return
+        insert = UPSERT_DIALECTS[self._dialect_name()]
+        stmt = insert(Payment).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['provider_payment_id'],
+            set_={
+                'status': stmt.excluded.status,
+                'paid': stmt.excluded.paid,
+                'amount': stmt.excluded.amount,
+                'currency': stmt.excluded.currency,
+                'updated_at': now,
+            },
+            where=case(STATUS_RANK, value=Payment.status, else_=-1)
+            < case(STATUS_RANK, value=stmt.excluded.status, else_=-1),
+        )
+        await self._session.execute(stmt)
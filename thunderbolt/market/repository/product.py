@@ -1,14 +1,39 @@
 import uuid
 
-from typing import Annotated
+from enum import Enum
+from datetime import datetime
+from decimal import Decimal
+from dataclasses import dataclass
+from typing import Annotated, Optional
 from fastapi import Depends
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from thunderbolt.core.base import AbstractRepository
 from thunderbolt.core.session import get_session
-from thunderbolt.models import Product
+from thunderbolt.core.pagination import Page, build_page, clamp_page_size, decode_cursor, estimate_count
+from thunderbolt.models import Product, ShopDetails
+
+
+class ProductSort(str, Enum):
+    """
+    Orders of the product catalogue.
+    """
+    PRICE_ASC = 'price'
+    PRICE_DESC = '-price'
+    NEWEST = 'newest'
+
+
+@dataclass(slots=True, frozen=True)
+class ProductFilter:
+    """
+    Filters of the product catalogue, None matches everything.
+    """
+    shop_id: Optional[uuid.UUID] = None
+    currency_id: Optional[uuid.UUID] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
 
 
 class ProductRepository(AbstractRepository):
@@ -18,6 +43,7 @@ class ProductRepository(AbstractRepository):
     This class encapsulates the database access for the Product model. It provides
     functions for adding, getting, and deleting product records.
     """
+    model = Product
 
     def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
         """
@@ -64,7 +90,7 @@ class ProductRepository(AbstractRepository):
 
     async def get_all_by_user(self, user_id: uuid.UUID) -> list[Product]:
         """
-        Get all Products for a specific User from the database.
+        Get all Products sold by a specific User from the database.
 
         Args:
             user_id (uuid.UUID): UUID of the User
@@ -72,7 +98,11 @@ class ProductRepository(AbstractRepository):
         Returns:
             List[Product]: List of Product objects
         """
-        stmt = select(Product).where(Product.user_id == user_id)
+        stmt = (
+            select(Product)
+            .join(ShopDetails, Product.shop_id == ShopDetails.id)
+            .where(ShopDetails.seller_id == user_id)
+        )
         result = await self._session.execute(stmt)
         return result.scalars().all()
 
@@ -86,11 +116,89 @@ class ProductRepository(AbstractRepository):
         Returns:
             List[Product]: List of Product objects
         """
-        stmt = select(Product).where(Product.shop_id == shop_id)
+        stmt = (
+            select(Product)
+            .where(Product.shop_id == shop_id)
+            .order_by(Product.created_at, Product.id)
+        )
         result = await self._session.execute(stmt)
         return result.scalars().all()
 
 
+    def _filter(self, stmt: Select, filters: ProductFilter) -> Select:
+        if filters.shop_id is not None:
+            stmt = stmt.where(Product.shop_id == filters.shop_id)
+        if filters.currency_id is not None:
+            stmt = stmt.where(Product.currency_id == filters.currency_id)
+        if filters.min_price is not None:
+            stmt = stmt.where(Product.price >= filters.min_price)
+        if filters.max_price is not None:
+            stmt = stmt.where(Product.price <= filters.max_price)
+        return stmt
+
+    async def browse(
+        self,
+        filters: ProductFilter,
+        sort: ProductSort = ProductSort.NEWEST,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[Product]:
+        """
+        Get a page of the product catalogue.
+
+        Every page is a single range scan of the ``(shop_id, price, id)``,
+        ``(shop_id, created_at, id)``, ``(price, id)`` or ``(created_at, id)``
+        index, depending on the shop filter and the order. The currency
+        filter is checked on the rows of the scan.
+
+        Args:
+            filters (ProductFilter): Filters of the catalogue
+            sort (ProductSort): Order of the catalogue
+            cursor (Optional[str]): Cursor of the page, None for the first page
+            limit (Optional[int]): Page size, bounded by `settings.PAGE_SIZE_MAX`
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+
+        Returns:
+            Page[Product]: Page of Product objects
+        """
+        limit = clamp_page_size(limit)
+        if sort is ProductSort.NEWEST:
+            column, type_ = Product.created_at, datetime
+        else:
+            column, type_ = Product.price, Decimal
+        descending = sort is not ProductSort.PRICE_ASC
+
+        stmt = self._filter(select(Product), filters).limit(limit + 1)
+        if descending:
+            stmt = stmt.order_by(column.desc(), Product.id.desc())
+        else:
+            stmt = stmt.order_by(column, Product.id)
+        if cursor:
+            value, product_id = decode_cursor(cursor, type_, uuid.UUID)
+            position = tuple_(column, Product.id)
+            after = tuple_(value, product_id)
+            stmt = stmt.where(position < after if descending else position > after)
+
+        result = await self._session.execute(stmt)
+        products = result.scalars().all()
+        return build_page(products, limit, key=lambda product: (getattr(product, column.key), product.id))
+
+    async def estimate_count(self, filters: ProductFilter) -> int:
+        """
+        Estimate the number of Products matching catalogue filters.
+
+        On Postgres this is the planner estimate, no rows are counted.
+
+        Args:
+            filters (ProductFilter): Filters of the catalogue
+
+        Returns:
+            int: Estimated number of Products
+        """
+        return await estimate_count(self._session, self._filter(select(Product.id), filters))
+
     async def get_all(self) -> list[Product]:
         """
         Get all Products from the database.
@@ -18,6 +18,7 @@ class ShopDetailsRepository(AbstractRepository):
     This class encapsulates the database access for the ShopDetails model. It provides
     functions for adding, getting, and deleting ShopDetails records.
     """
+    model = ShopDetails
 
     def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
         """
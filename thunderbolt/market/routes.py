@@ -1,12 +1,41 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from decimal import Decimal
+from ipaddress import ip_address, ip_network
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from thunderbolt.models import User
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.pagination import InvalidCursorError
+from thunderbolt.core.serialization import orjson_response
+from thunderbolt.core.payments.notifications import (
+    NotificationQueue,
+    NotificationQueueUnavailable,
+    get_notification_queue,
+)
+from thunderbolt.core.payments.yookassa.schema import Notification
+from thunderbolt.users.dependencies import get_user_by_token
 
 # TODO: add __init__ dude
 from .repository.shop import ShopDetailsRepository
-from .repository.product import ProductRepository
+from .repository.product import ProductFilter, ProductRepository, ProductSort
+from .services import CartService
+
+from .schema import (
+    ShopDetails,
+    Product,
+    ProductPageResponse,
+    CartItemsRemove,
+    CartItemsUpdate,
+    CartResponse,
+)
 
-from .schema import ShopDetails, Product
+
+settings = get_settings()
+
+NOTIFICATION_NETWORKS = [ip_network(network) for network in settings.YOOKASSA_NOTIFICATION_IPS]
 
 
 market_router = APIRouter(
@@ -51,4 +80,189 @@ async def get_products_by_shop(
     products = await product_repo.get_all_products_by_shop_id(shop_id)
     if not products:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Products not found")
-    return products
+    return orjson_response(list[Product], products)
+
+
+@market_router.get("/products", response_model=ProductPageResponse)
+async def browse_products(
+    product_repo: Annotated[ProductRepository, Depends(ProductRepository)],
+    shop_id: Optional[uuid.UUID] = None,
+    currency_id: Optional[uuid.UUID] = None,
+    min_price: Annotated[Optional[Decimal], Query(ge=0)] = None,
+    max_price: Annotated[Optional[Decimal], Query(ge=0)] = None,
+    sort: ProductSort = ProductSort.NEWEST,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.PAGE_SIZE_MAX)] = settings.PAGE_SIZE_DEFAULT,
+):
+    """
+    Get a page of the product catalogue.
+
+    Args:
+        product_repo (ProductRepository): The product repository to be used.
+        shop_id (Optional[uuid.UUID]): Only list products of this shop.
+        currency_id (Optional[uuid.UUID]): Only list products priced in this currency.
+        min_price (Optional[Decimal]): Lowest price, inclusive.
+        max_price (Optional[Decimal]): Highest price, inclusive.
+        sort (ProductSort): Order of the products.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The page size.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        ProductPageResponse: The requested page of products.
+    """
+    filters = ProductFilter(shop_id, currency_id, min_price, max_price)
+    try:
+        page = await product_repo.browse(filters, sort, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    total_estimate = await product_repo.estimate_count(filters)
+    return orjson_response(ProductPageResponse, {
+        'items': page.items,
+        'next_cursor': page.next_cursor,
+        'total_estimate': total_estimate,
+    })
+
+
+async def _cart_response(cart_service: CartService, user_id: uuid.UUID):
+    lines, totals = await cart_service.get_cart(user_id)
+    return orjson_response(CartResponse, {
+        'lines': [line._asdict() for line in lines],
+        'totals': [total._asdict() for total in totals],
+    })
+
+
+@market_router.get("/cart", response_model=CartResponse)
+async def get_cart(
+    user: Annotated[User, Depends(get_user_by_token)],
+    cart_service: Annotated[CartService, Depends(CartService)],
+):
+    """
+    Get the cart of the current user, priced by the database.
+
+    Args:
+        user (User): The current user.
+        cart_service (CartService): The cart service to be used.
+
+    Returns:
+        CartResponse: Lines of the cart and totals by currency.
+    """
+    return await _cart_response(cart_service, user.id)
+
+
+@market_router.post("/cart/items", response_model=CartResponse)
+async def add_cart_items(
+    items: CartItemsUpdate,
+    user: Annotated[User, Depends(get_user_by_token)],
+    cart_service: Annotated[CartService, Depends(CartService)],
+):
+    """
+    Add products to the cart of the current user.
+
+    Args:
+        items (CartItemsUpdate): Products and quantities to add.
+        user (User): The current user.
+        cart_service (CartService): The cart service to be used.
+
+    Raises:
+        HTTPException: If a product does not exist.
+
+    Returns:
+        CartResponse: The updated cart.
+    """
+    await cart_service.add_items(user.id, items.items)
+    return await _cart_response(cart_service, user.id)
+
+
+@market_router.put("/cart/items", response_model=CartResponse)
+async def set_cart_items(
+    items: CartItemsUpdate,
+    user: Annotated[User, Depends(get_user_by_token)],
+    cart_service: Annotated[CartService, Depends(CartService)],
+):
+    """
+    Set the quantities of products in the cart of the current user, 0 removes a product.
+
+    Args:
+        items (CartItemsUpdate): Products and quantities to set.
+        user (User): The current user.
+        cart_service (CartService): The cart service to be used.
+
+    Raises:
+        HTTPException: If a product does not exist.
+
+    Returns:
+        CartResponse: The updated cart.
+    """
+    await cart_service.set_quantities(user.id, items.items)
+    return await _cart_response(cart_service, user.id)
+
+
+@market_router.delete("/cart/items", response_model=CartResponse)
+async def remove_cart_items(
+    items: CartItemsRemove,
+    user: Annotated[User, Depends(get_user_by_token)],
+    cart_service: Annotated[CartService, Depends(CartService)],
+):
+    """
+    Remove products from the cart of the current user.
+
+    Args:
+        items (CartItemsRemove): Products to remove.
+        user (User): The current user.
+        cart_service (CartService): The cart service to be used.
+
+    Returns:
+        CartResponse: The updated cart.
+    """
+    await cart_service.remove_items(user.id, items.product_ids)
+    return await _cart_response(cart_service, user.id)
+
+
+@market_router.post("/payments/notifications", status_code=status.HTTP_200_OK)
+async def receive_payment_notification(
+    notification: Notification,
+    request: Request,
+    queue: Annotated[NotificationQueue, Depends(get_notification_queue)],
+):
+    """
+    Receive a payment status notification from YooKassa.
+
+    The notification is only queued, it is applied to the payment by the
+    notification workers of `thunderbolt.worker`. Only senders in
+    `settings.YOOKASSA_NOTIFICATION_IPS` are accepted. Behind a reverse proxy
+    the sender is taken from X-Forwarded-For, so the proxy must be listed in
+    `settings.SERVER_FORWARDED_ALLOW_IPS`.
+
+    Args:
+        notification (Notification): The notification.
+        request (Request): The request, to check where it comes from.
+        queue (NotificationQueue): The notification queue.
+
+    Raises:
+        HTTPException: If the sender is not allowed or the queue is unavailable,
+            the provider then retries later.
+
+    Returns:
+        Response: An empty response.
+    """
+    try:
+        sender = ip_address(request.client.host) if request.client else None
+    except ValueError:
+        sender = None
+    if sender is None or not any(sender in network for network in NOTIFICATION_NETWORKS):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sender not allowed")
+    if notification.event.startswith('payment.'):
+        try:
+            await queue.enqueue(notification)
+        except NotificationQueueUnavailable:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Notification queue is unavailable",
+            )
+    return Response(status_code=status.HTTP_200_OK)
@@ -1,8 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from typing import Optional
 from decimal import Decimal
 
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+
 
 class ShopDetailsBase(BaseModel):
     seller_id: UUID
@@ -34,3 +39,39 @@ class Product(ProductBase):
 
     class Config:
         orm_mode = True
+
+class ProductPageResponse(BaseModel):
+    items: list[Product] = Field(description='Products of the page')
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, null on the last page',
+        default=None,
+    )
+    total_estimate: int = Field(description='Estimated number of products matching the filters')
+
+class CartItemQuantity(BaseModel):
+    product_id: UUID
+    quantity: int = Field(ge=0, le=10000)
+
+class CartItemsUpdate(BaseModel):
+    items: list[CartItemQuantity] = Field(min_items=1, max_items=settings.CART_MAX_ITEMS)
+
+class CartItemsRemove(BaseModel):
+    product_ids: list[UUID] = Field(min_items=1, max_items=settings.CART_MAX_ITEMS)
+
+class CartLine(BaseModel):
+    product_id: UUID
+    name: str
+    price: Decimal
+    currency_id: UUID
+    quantity: int
+    subtotal: Decimal
+
+class CartTotal(BaseModel):
+    currency_id: UUID
+    currency: str
+    total: Decimal
+    quantity: int
+
+class CartResponse(BaseModel):
+    lines: list[CartLine] = Field(description='Products in the cart, in the order they were added')
+    totals: list[CartTotal] = Field(description='Totals of the cart, one per currency')
@@ -0,0 +1,190 @@
+import uuid
+import asyncio
+import logging
+
+from typing import Annotated, Iterable, Optional
+from fastapi import Depends, HTTPException, status
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thunderbolt.core.session import get_session
+from thunderbolt.core.settings import get_settings
+from thunderbolt.core.payments.notifications import NotificationQueue, latest_updates
+
+from .repository.cart import CartLine, CartRepository, CartTotal
+from .repository.hot_cart import HotCartStore, HotCartUnavailableError, get_hot_cart_store, write_back
+from .repository.payment import PaymentRepository
+from .schema import CartItemQuantity
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class CartService:
+    """
+    Service class for carts
+
+    Every change of a cart is one statement whatever the number of products it
+    touches, and reads price the cart in the database. With a hot cart store,
+    see `thunderbolt.market.repository.hot_cart`, changes go to Redis and the
+    cart is written back to the database before it is read.
+    """
+
+    def __init__(
+        self,
+        cart_repository: Annotated[CartRepository, Depends(CartRepository)],
+        session: Annotated[AsyncSession, Depends(get_session)],
+        hot_carts: Annotated[Optional[HotCartStore], Depends(get_hot_cart_store)],
+    ) -> None:
+        self.cart_repository: CartRepository = cart_repository
+        self.session: AsyncSession = session
+        self.hot_carts: Optional[HotCartStore] = hot_carts
+
+    async def _validate_products(self, product_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Validate that the products exist.
+
+        Raises:
+            HTTPException: A product does not exist
+        """
+        product_ids = set(product_ids)
+        missing = product_ids - await self.cart_repository.get_existing_products(product_ids)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Products not found: {', '.join(sorted(map(str, missing)))}",
+            )
+
+    async def _warm(self, user_id: uuid.UUID) -> None:
+        if not await self.hot_carts.is_hot(user_id):
+            await self.hot_carts.warm(user_id, await self.cart_repository.get_quantities(user_id))
+
+    def _unavailable(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Cart is temporarily unavailable",
+        )
+
+    async def add_items(self, user_id: uuid.UUID, items: list[CartItemQuantity]) -> None:
+        """
+        Add products to a cart, on top of the quantities already in it.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+            items (list[CartItemQuantity]): Products and quantities, repeated products are summed.
+        """
+        quantities: dict[uuid.UUID, int] = {}
+        for item in items:
+            if item.quantity > 0:
+                quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        if not quantities:
+            return
+        await self._validate_products(quantities)
+
+        if self.hot_carts is None:
+            await self.cart_repository.add_items(user_id, quantities)
+            await self.session.commit()
+            return
+        try:
+            await self._warm(user_id)
+            await self.hot_carts.add_items(user_id, quantities)
+        except HotCartUnavailableError as e:
+            raise self._unavailable() from e
+
+    async def set_quantities(self, user_id: uuid.UUID, items: list[CartItemQuantity]) -> None:
+        """
+        Set the quantities of products in a cart, a quantity of 0 removes the product.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+            items (list[CartItemQuantity]): Products and quantities, the last of a repeated product wins.
+        """
+        quantities = {item.product_id: item.quantity for item in items}
+        await self._validate_products(key for key, value in quantities.items() if value > 0)
+
+        if self.hot_carts is None:
+            await self.cart_repository.set_quantities(user_id, quantities)
+            await self.session.commit()
+            return
+        try:
+            await self._warm(user_id)
+            await self.hot_carts.set_quantities(user_id, quantities)
+        except HotCartUnavailableError as e:
+            raise self._unavailable() from e
+
+    async def remove_items(self, user_id: uuid.UUID, product_ids: list[uuid.UUID]) -> None:
+        """
+        Remove products from a cart.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+            product_ids (list[uuid.UUID]): UUIDs of the Products.
+        """
+        if self.hot_carts is None:
+            await self.cart_repository.remove_items(user_id, product_ids)
+            await self.session.commit()
+            return
+        try:
+            await self._warm(user_id)
+            await self.hot_carts.remove_items(user_id, product_ids)
+        except HotCartUnavailableError as e:
+            raise self._unavailable() from e
+
+    async def get_cart(self, user_id: uuid.UUID) -> tuple[list[CartLine], list[CartTotal]]:
+        """
+        Get the priced lines and the totals of a cart.
+
+        A hot cart with pending changes is written back first, so the cart
+        is always priced by the database.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User.
+
+        Returns:
+            tuple[list[CartLine], list[CartTotal]]: Lines of the cart and totals by currency.
+        """
+        if self.hot_carts is not None:
+            try:
+                if await self.hot_carts.take_dirty(user_id):
+                    await write_back(self.hot_carts, self.session, [user_id])
+            except HotCartUnavailableError as e:
+                raise self._unavailable() from e
+        lines = await self.cart_repository.get_lines(user_id)
+        totals = await self.cart_repository.get_totals(user_id) if lines else []
+        return lines, totals
+
+
+async def apply_payment_notifications(queue: NotificationQueue, session_factory, consumer: str) -> None:
+    """
+    Apply queued payment notifications in batches, until cancelled.
+
+    Every batch is applied in one transaction and acknowledged once committed.
+    A batch that fails is left pending and claimed again later.
+
+    Args:
+        queue (NotificationQueue): The queue.
+        session_factory: Callable returning a new AsyncSession.
+        consumer (str): Name of this worker in the consumer group.
+    """
+    while True:
+        try:
+            await queue.ensure_group()
+            while True:
+                batch = await queue.read(
+                    consumer,
+                    settings.PAYMENT_NOTIFICATION_BATCH,
+                    settings.PAYMENT_NOTIFICATION_BLOCK,
+                )
+                if not batch:
+                    continue
+                updates = latest_updates(update for _, update in batch if update is not None)
+                async with session_factory() as session:
+                    await PaymentRepository(session).apply_updates(updates)
+                    await session.commit()
+                await queue.ack([entry_id for entry_id, _ in batch])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Applying payment notifications failed, retrying: %s", e)
+            await asyncio.sleep(settings.PAYMENT_NOTIFICATION_RETRY_INTERVAL)
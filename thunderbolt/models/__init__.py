@@ -1,9 +1,11 @@
 
 from .group import Group
-from .market import ShopDetails, Product, Currency
+from .market import ShopDetails, Product, ProductCart, Currency
+from .payment import Payment
 from .user import User
 from .base import ThunderboltModel
-from .forum import Topic, Thread, Post
+from .forum import Tag, Topic, Thread, Post, PostTags
+from .job import Job
 
 __all__ = (
     'ThunderboltModel',
@@ -11,8 +13,13 @@ __all__ = (
     'Group',
     'ShopDetails',
     'Product',
+    'ProductCart',
     'Currency',
+    'Payment',
     'Topic',
     'Thread',
     'Post',
+    'Tag',
+    'PostTags',
+    'Job',
 )
\ No newline at end of file
@@ -1,8 +1,7 @@
-import uuid
-
 from sqlalchemy import *
 from sqlalchemy.orm import declarative_base
 
+from thunderbolt.core.ids import uuid7
 from thunderbolt.core.settings import get_settings
 
 
@@ -13,7 +12,9 @@ settings = get_settings()
 class ThunderboltModel(Base):
     __abstract__ = True
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    # Time ordered, see `thunderbolt.core.ids`. The primary key index is the
+    # only index of the column
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, nullable=False)
 
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
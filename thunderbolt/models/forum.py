@@ -13,8 +13,16 @@ class Tag(ThunderboltModel):
     
     """
     __tablename__ = 'tag'
+    __table_args__ = (
+        Index('ix_tag_name', 'name', unique=True),
+        Index('ix_tag_post_count_id', 'post_count', 'id'),
+    )
 
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+
+    # Materialized summary, refreshed in the background by the
+    # `forum.refresh_tag_counts` job
+    post_count = Column(Integer, nullable=False, default=0, server_default='0')
 
     def __repr__(self):
         return f'<Tag {self.name}>'
@@ -32,6 +40,11 @@ class Topic(ThunderboltModel):
     title = Column(String(50), nullable=False)
     description = Column(Text, nullable=True)
 
+    # Denormalized activity, maintained by PostRepository
+    post_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
+    last_post_id = Column(UUID(as_uuid=True), nullable=True)
+
     def __repr__(self):
         return f'<Topic {self.title}>'
 
@@ -44,6 +57,11 @@ class Thread(ThunderboltModel):
 
     """
     __tablename__ = 'thread'
+    __table_args__ = (
+        Index('ix_thread_topic_id_created_at_id', 'topic_id', 'created_at', 'id'),
+        Index('ix_thread_topic_id_last_post_at_id', 'topic_id', 'last_post_at', 'id'),
+        Index('ix_thread_last_post_at_id', 'last_post_at', 'id'),
+    )
 
     topic_id = Column(UUID(as_uuid=True), ForeignKey('topic.id'), nullable=False)
     topic = relationship('Topic', backref='threads')
@@ -51,6 +69,15 @@ class Thread(ThunderboltModel):
     title = Column(String(50), nullable=False)
     description = Column(Text, nullable=True)
 
+    # On Postgres a generated, GIN indexed `search_vector` column is derived
+    # from title and description, it is not mapped (see SearchRepository)
+
+    # Denormalized activity, maintained by PostRepository. `last_post_at` holds
+    # the creation time while the thread has no posts, so it is never null.
+    post_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_post_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), server_default=func.now())
+    last_post_id = Column(UUID(as_uuid=True), nullable=True)
+
     def __repr__(self):
         return f'<Thread {self.title}>'
 
@@ -62,6 +89,10 @@ class Post(ThunderboltModel):
     The Post model represents a post that can be discussed in the forum.
     """
     __tablename__ = 'post'
+    __table_args__ = (
+        Index('ix_post_thread_id_created_at_id', 'thread_id', 'created_at', 'id'),
+        Index('ix_post_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     thread_id = Column(UUID(as_uuid=True), ForeignKey('thread.id'), nullable=False)
     thread = relationship('Thread', backref='posts')
@@ -72,6 +103,9 @@ class Post(ThunderboltModel):
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
 
+    # On Postgres a generated, GIN indexed `search_vector` column is derived
+    # from title and content, it is not mapped (see SearchRepository)
+
     def __repr__(self):
         return f'<Post {self.content}>'
 
@@ -83,7 +117,12 @@ class PostTags(ThunderboltModel):
     The PostTags model represents a tag that is applied to a post.
     """
     __tablename__ = 'post_tags'
-    
+    __table_args__ = (
+        # Tag pages scan the first, post deletions the second
+        Index('ix_post_tags_tag_id_post_id', 'tag_id', 'post_id', unique=True),
+        Index('ix_post_tags_post_id_tag_id', 'post_id', 'tag_id'),
+    )
+
     post_id = Column(UUID(as_uuid=True), ForeignKey('post.id'), nullable=False)
     tag_id = Column(UUID(as_uuid=True), ForeignKey('tag.id'), nullable=False)
 
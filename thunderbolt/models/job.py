@@ -0,0 +1,31 @@
+from sqlalchemy import *
+
+from .base import ThunderboltModel
+
+
+class Job(ThunderboltModel):
+    """
+    Job model
+
+    The Job model represents a background job in the outbox, written in the
+    transaction of the change it follows up on and run by the job worker, see
+    `thunderbolt.core.jobs`. Jobs are deleted once done, failed jobs are
+    retried until `max_attempts` and then kept with the `dead` status.
+
+    """
+    __tablename__ = 'job'
+    __table_args__ = (
+        # Claim order of the worker
+        Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
+
+    name = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default='pending', server_default='pending')
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f'<Job {self.name} {self.status}>'
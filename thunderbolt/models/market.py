@@ -3,8 +3,6 @@ from sqlalchemy import *
 
 from .base import ThunderboltModel
 
-from thunderbolt.core.payments import Priceable
-
 
 class Currency(ThunderboltModel):
     """
@@ -28,6 +26,9 @@ class ShopDetails(ThunderboltModel):
     
     """
     __tablename__ = 'shop_details'
+    __table_args__ = (
+        Index('ix_shop_details_seller_id', 'seller_id'),
+    )
 
     seller_id = Column(UUID(as_uuid=True), ForeignKey('user.id'), nullable=False)
     name = Column(String(255), nullable=False)
@@ -37,13 +38,21 @@ class ShopDetails(ThunderboltModel):
         return f'<ShopDetails {self.seller_name}>'
 
 
-class Product(ThunderboltModel, Priceable):
+class Product(ThunderboltModel):
     """
     Product model
     
     The Product model represents a product that is for sale in the marketplace.
     """
     __tablename__ = 'product'
+    __table_args__ = (
+        Index('ix_product_shop_id_created_at_id', 'shop_id', 'created_at', 'id'),
+        # Catalogue orders, see ProductRepository.browse
+        Index('ix_product_shop_id_price_id', 'shop_id', 'price', 'id'),
+        Index('ix_product_price_id', 'price', 'id'),
+        Index('ix_product_created_at_id', 'created_at', 'id'),
+        Index('ix_product_currency_id', 'currency_id'),
+    )
 
     shop_id = Column(UUID(as_uuid=True), ForeignKey('shop_details.id'), nullable=False)
     name = Column(String(255), nullable=False)
@@ -64,9 +73,15 @@ class ProductCart(ThunderboltModel):
     The ProductCart model represents a product that is in a user's cart.
     """
     __tablename__ = 'product_cart'
+    __table_args__ = (
+        # Conflict target of the cart upserts, see CartRepository
+        Index('ix_product_cart_user_id_product_id', 'user_id', 'product_id', unique=True),
+        CheckConstraint('quantity > 0', name='ck_product_cart_quantity_positive'),
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey('user.id'), nullable=False)
     product_id = Column(UUID(as_uuid=True), ForeignKey('product.id'), nullable=False)
+    quantity = Column(Integer, nullable=False, default=1, server_default='1')
 
     def __repr__(self):
         return f'<ProductCart {self.user_id} {self.product_id}>'
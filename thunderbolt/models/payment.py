@@ -0,0 +1,27 @@
+from sqlalchemy import *
+
+from .base import ThunderboltModel
+
+
+class Payment(ThunderboltModel):
+    """
+    Payment model
+
+    The Payment model holds the last known state of a payment created with the
+    payment provider, as reported by its notifications.
+
+    """
+    __tablename__ = 'payment'
+    __table_args__ = (
+        # Conflict target of the status upserts, see PaymentRepository
+        Index('ix_payment_provider_payment_id', 'provider_payment_id', unique=True),
+    )
+
+    provider_payment_id = Column(String(64), nullable=False)
+    status = Column(String(32), nullable=False)
+    paid = Column(Boolean, nullable=False, default=False)
+    amount = Column(DECIMAL, nullable=False)
+    currency = Column(String(3), nullable=False)
+
+    def __repr__(self):
+        return f'<Payment {self.provider_payment_id} {self.status}>'
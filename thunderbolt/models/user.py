@@ -3,6 +3,7 @@ from sqlalchemy import *
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from thunderbolt.core.settings import get_settings
+from thunderbolt.core.hashing import get_password_hasher
 
 from .base import ThunderboltModel
 
@@ -30,6 +31,9 @@ class User(ThunderboltModel):
     group_id = Column(UUID(as_uuid=True), ForeignKey('group.id'), nullable=True)
     admin_group_id = Column(UUID(as_uuid=True), ForeignKey('admin_group.id'), nullable=True)
 
+    # Bumped to revoke every token issued to the user
+    token_version = Column(Integer, nullable=False, default=0, server_default='0')
+
     @property
     def password(self) -> str:
         """
@@ -54,6 +58,18 @@ class User(ThunderboltModel):
             salt_length=settings.SALT_LENGTH
         )
 
+    async def set_password(self, password: str) -> None:
+        """
+        Set the password for the user without blocking the event loop.
+
+        Args:
+            password (str): The password to be hashed and stored.
+
+        Raises:
+            HasherOverloadedError: Too many password hashing calls are pending.
+        """
+        self.hashed_password = await get_password_hasher().hash(password)
+
     def is_admin(self) -> bool:
         """
         Check if the user is an admin.
@@ -69,6 +85,18 @@ class User(ThunderboltModel):
         """
         return check_password_hash(self.hashed_password, password)
 
+    async def verify_password(self, password: str) -> bool:
+        """
+        Check the password for the user without blocking the event loop.
+
+        Args:
+            password (str): The password to be checked.
+
+        Raises:
+            HasherOverloadedError: Too many password hashing calls are pending.
+        """
+        return await get_password_hasher().verify(self.hashed_password, password)
+
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -0,0 +1,60 @@
+
+"""
+Production server entry point.
+
+Runs the application under uvicorn with the worker count, event loop, HTTP
+parser, socket backlog, keep-alive and graceful shutdown timeouts taken from
+settings:
+
+    python -m thunderbolt.server
+
+Every worker imports the application on its own and warms up on startup (see
+`thunderbolt.main.lifespan`), so no database connection is ever shared between
+processes.
+"""
+
+import sys
+import uvicorn
+
+from pathlib import Path
+
+# Add the thunderbolt package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from thunderbolt.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def get_server_options() -> dict:
+    """
+    Build `uvicorn.run` keyword arguments from settings.
+
+    Returns:
+        dict: uvicorn options.
+    """
+    return {
+        'host': settings.SERVER_HOST,
+        'port': settings.SERVER_PORT,
+        'workers': settings.SERVER_WORKERS,
+        'loop': settings.SERVER_LOOP,
+        'http': settings.SERVER_HTTP,
+        'backlog': settings.SERVER_BACKLOG,
+        'timeout_keep_alive': settings.SERVER_KEEP_ALIVE,
+        'timeout_graceful_shutdown': settings.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+        'limit_concurrency': settings.SERVER_LIMIT_CONCURRENCY,
+        'limit_max_requests': settings.SERVER_LIMIT_MAX_REQUESTS,
+        'proxy_headers': True,
+        'forwarded_allow_ips': settings.SERVER_FORWARDED_ALLOW_IPS,
+        'server_header': False,
+        'access_log': settings.SERVER_ACCESS_LOG,
+    }
+
+
+def main():
+    uvicorn.run('thunderbolt.main:app', **get_server_options())
+
+
+if __name__ == '__main__':
+    main()
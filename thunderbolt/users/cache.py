@@ -0,0 +1,68 @@
+
+"""
+Per-worker cache of User snapshots for stateless authentication.
+
+A snapshot is a detached copy of the User row, so it is safe to share between
+requests but must not be added to a session. Entries live for
+`settings.AUTH_USER_CACHE_TTL` seconds, which bounds how long a revoked token
+can still be accepted by a worker that did not perform the revocation.
+"""
+
+import uuid
+
+from typing import Optional
+
+from thunderbolt.core.cache import LocalCache, entity_to_dict, entity_from_dict
+from thunderbolt.core.settings import get_settings
+from thunderbolt.models import User
+
+
+settings = get_settings()
+
+
+class UserSnapshotCache:
+    """
+    Short TTL LRU of User snapshots keyed by user id.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        self._ttl = ttl or settings.AUTH_USER_CACHE_TTL
+        self._cache = LocalCache(max_entries or settings.AUTH_USER_CACHE_MAX_ENTRIES)
+
+    def get(self, user_id: uuid.UUID) -> Optional[User]:
+        """
+        Get a User snapshot.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            Optional[User]: Detached User object, None on a miss
+        """
+        return self._cache.get(user_id)
+
+    def put(self, user: User) -> User:
+        """
+        Store a snapshot of a User.
+
+        Args:
+            user (User): User object, possibly attached to a session
+
+        Returns:
+            User: The stored detached snapshot
+        """
+        snapshot = entity_from_dict(User, entity_to_dict(user))
+        self._cache.set(user.id, snapshot, self._ttl)
+        return snapshot
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """
+        Drop the snapshot of a User.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+        """
+        self._cache.delete(user_id)
+
+
+user_snapshots = UserSnapshotCache()
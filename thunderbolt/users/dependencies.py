@@ -34,3 +34,30 @@ async def get_user_by_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     return user
+
+
+async def get_persistent_user_by_token(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    user_service: Annotated[UserService, Depends()]
+) -> User:
+    """
+    Get a session bound user by token.
+
+    Unlike `get_user_by_token` this always loads the user from the database,
+    so use it for handlers that modify the user itself.
+
+    Args:
+        token (str): The JWT token.
+        user_service (UserService): The user service.
+
+    Returns:
+        User: The user.
+    """
+    user = await user_service.get_user_by_token(token, persistent=True)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
@@ -3,7 +3,7 @@ import uuid
 from typing import Annotated
 from fastapi import Depends
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from thunderbolt.core.session import get_session
@@ -18,6 +18,7 @@ class UserRepository(AbstractRepository):
     This class encapsulates the database access for the User model. It provides
     functions for adding, getting, and deleting user records.
     """
+    model = User
 
     def __init__(self, session: Annotated[AsyncSession, Depends(get_session)]):
         """
@@ -62,6 +63,30 @@ class UserRepository(AbstractRepository):
         result = await self._session.execute(stmt)
         return result.scalars().first()
 
+    async def increment_token_version(self, user_id: uuid.UUID) -> int:
+        """
+        Increment the token version of a User in a single statement.
+
+        The increment is computed by the primary from the current row, so it
+        can't be based on a stale read from a replica or lost to a concurrent
+        revocation.
+
+        Args:
+            user_id (uuid.UUID): UUID of the User
+
+        Returns:
+            int: The new token version
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one()
+
     async def get_by_username(self, username: str) -> User:
         """
         Get a User from the database by username.
@@ -4,6 +4,9 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
+from thunderbolt.core.hashing import HasherOverloadedError
+from thunderbolt.models import User
+from thunderbolt.users.dependencies import get_persistent_user_by_token
 from thunderbolt.users.schema import BearerToken
 from thunderbolt.users.services import UserService
 
@@ -25,9 +28,41 @@ async def login(
         user_data (OAuth2PasswordRequestForm): The user data.
         user_service (UserService): The user service.
 
+    Raises:
+        HTTPException: If the password hasher is overloaded.
+        HTTPException: If the credentials are invalid.
+
     Returns:
         BearerToken: The bearer token.
     """
-    user = await user_service.auth_user(user_data)
+    try:
+        user = await user_service.auth_user(user_data)
+    except HasherOverloadedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": "1"},
+        )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     access_token = user_service.create_token(user)
     return access_token
+
+
+@auth_router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(
+    user: Annotated[User, Depends(get_persistent_user_by_token)],
+    user_service: Annotated[UserService, Depends()],
+) -> None:
+    """
+    Revoke every token issued to the current user
+
+    Args:
+        user (User): The user making the request.
+        user_service (UserService): The user service.
+    """
+    await user_service.revoke_tokens(user)
@@ -4,8 +4,9 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from thunderbolt.models import User
-from thunderbolt.users.dependencies import get_user_by_token
-from thunderbolt.users.schema import UserPersonalInfo, UserPersonalInfoResponse
+from thunderbolt.users.dependencies import get_persistent_user_by_token
+from thunderbolt.core.hashing import HasherOverloadedError
+from thunderbolt.users.schema import UserPersonalInfo, UserPersonalInfoResponse, UserDataCreate
 from thunderbolt.users.repository import UserRepository
 from thunderbolt.users.services import UserService
 
@@ -47,26 +48,36 @@ async def get_user(
 
 @user_router.post("/", response_model=UserPersonalInfoResponse)
 async def create_user(
-    user_data: UserPersonalInfo,
+    user_data: UserDataCreate,
     user_service: Annotated[UserService, Depends(UserService)],
 ) -> UserPersonalInfoResponse:
     """
     Create a new user.
     
     Args:
-        user_data (UserPersonalInfo): User data to be created.
+        user_data (UserDataCreate): User data to be created.
         user_service (UserService): The user service to be used.
+
+    Raises:
+        HTTPException: If the password hasher is overloaded.
     
     Returns:
         UserPersonalInfoResponse: The created user.
     """
-    return await user_service.create_new_user(user_data)
+    try:
+        return await user_service.create_new_user(user_data)
+    except HasherOverloadedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": "1"},
+        )
 
 
 @user_router.put("/", response_model=UserPersonalInfoResponse)
 async def update_user(
     user_data: UserPersonalInfo,
-    user: Annotated[User, Depends(get_user_by_token)],
+    user: Annotated[User, Depends(get_persistent_user_by_token)],
     user_service: Annotated[UserService, Depends(UserService)],
 ) -> UserPersonalInfoResponse:
     """
@@ -83,14 +94,14 @@ async def update_user(
     Returns:
         User: updated user.
     """
-    return await user_service.update_user(user_data, user)
+    return await user_service.update_user(user, user_data)
 
 
 @user_router.delete("/{user_id}")
 async def delete_user(
     user_id: str,
-    user: Annotated[User, Depends(get_user_by_token)],
-    user_repo: Annotated[UserRepository, Depends(UserRepository)],
+    user: Annotated[User, Depends(get_persistent_user_by_token)],
+    user_service: Annotated[UserService, Depends(UserService)],
 ) -> None:
     """
     Delete a user.
@@ -98,7 +109,7 @@ async def delete_user(
     Args:
         user_id (str): The id of the user to be deleted.
         user (User): The user making the request.
-        user_repo (UserRepository): The user repository to be used.
+        user_service (UserService): The user service to be used.
     
     Raises:
         HTTPException: If the user is not authorized to delete the requested user.
@@ -106,10 +117,10 @@ async def delete_user(
     Returns:
         None
     """
-    if user_id != user.id:
+    if user_id != str(user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this user",
         )
     
-    await user_repo.delete(user_id)
+    await user_service.delete_user(user)
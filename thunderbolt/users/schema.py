@@ -8,8 +8,8 @@ from pydantic import BaseModel, Field
 
 
 class BearerToken(BaseModel):
-    token: str = Field(description="The bearer token to be used for authorization")
-    type: str = Field(description="The type of the token, should be 'bearer'", default="bearer")
+    access_token: str = Field(description="The bearer token to be used for authorization")
+    token_type: str = Field(description="The type of the token, should be 'bearer'", default="bearer")
 
 
 class UserPersonalInfo(BaseModel):
@@ -21,6 +21,10 @@ class UserPersonalInfo(BaseModel):
     birthday: Optional[date] = Field(description="Birthday of the user", default=None)
 
 
+class UserDataCreate(UserPersonalInfo):
+    password: str = Field(description="The password of the user")
+
+
 class UserPersonalInfoResponse(UserPersonalInfo):
     id: UUID = Field(description="The uuid of the user")
 
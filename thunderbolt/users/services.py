@@ -1,15 +1,25 @@
+import time
+import uuid
 
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from thunderbolt.models import User
 from thunderbolt.core.security import create_token, decode_token
+from thunderbolt.core.session import get_session, use_primary
+from thunderbolt.core.settings import get_settings
 
+from .cache import user_snapshots
 from .repository import UserRepository
-from .schema import BearerToken, UserPersonalInfo
+from .schema import BearerToken, UserPersonalInfo, UserDataCreate
+
+
+settings = get_settings()
 
 
 class UserService:
@@ -23,9 +33,11 @@ class UserService:
 
     def __init__(
         self, 
-        user_repository: Annotated[UserRepository, Depends(UserRepository)]
+        user_repository: Annotated[UserRepository, Depends(UserRepository)],
+        session: Annotated[AsyncSession, Depends(get_session)],
     ) -> None:
         self.user_repository: UserRepository = user_repository
+        self.session: AsyncSession = session
 
     def _validate_gender(self, gender: str) -> None:
         """
@@ -51,13 +63,16 @@ class UserService:
             username (str): The username of the user to be authenticated.
             password (str): The password of the user to be authenticated.
 
+        Raises:
+            HasherOverloadedError: If too many password checks are pending.
+
         Returns:
             User: The authenticated user.
         """
         user = await self.user_repository.get_by_username(user_data.username)
         if not user:
             return False
-        if not user.check_password(user_data.password):
+        if not await user.verify_password(user_data.password):
             return False
         return user
 
@@ -65,50 +80,104 @@ class UserService:
         """
         Create a JWT token for a user.
 
+        The token carries the claims handlers need, so authenticated requests
+        don't have to load the user from the database.
+
         Args:
             user (User): The user to create a token for.
 
         Returns:
-            str: The JWT token.
+            BearerToken: The bearer token.
         """
-        payload = {"sub": str(user.id)}
+        issued_at = int(time.time())
+        payload = {
+            "sub": str(user.id),
+            "username": user.username,
+            "admin": user.is_admin(),
+            "ver": user.token_version or 0,
+            "iat": issued_at,
+            "exp": issued_at + settings.JWT_EXPIRE_SECONDS,
+        }
         token = create_token(payload)
         return BearerToken(access_token=token, token_type="bearer")
 
-    async def get_user_by_token(self, token: str) -> User:
+    async def get_user_by_token(self, token: str, persistent: bool = False) -> Optional[User]:
         """
         Get a user by token.
 
+        With `settings.AUTH_MODE` set to 'stateless' the user is served from a
+        per-worker snapshot cache and the database is only hit on a cache miss.
+        A token is rejected when its version differs from the user's
+        `token_version`.
+
         Args:
             token (str): The JWT token.
+            persistent (bool): Load a session bound User that can be modified.
 
         Returns:
-            User: The user.
+            Optional[User]: The user, None if the token is invalid or revoked.
         """
         payload = decode_token(token)
-        username = payload.get("sub")
-        user = await self.user_repository.get_by_username(username)
+        if not payload:
+            return None
+        try:
+            user_id = uuid.UUID(payload.get("sub"))
+        except (TypeError, ValueError):
+            return None
+
+        user = None
+        if persistent:
+            # The user is about to be modified, a lagging replica could
+            # still accept a revoked token
+            use_primary(self.session)
+        elif settings.AUTH_MODE == 'stateless':
+            user = user_snapshots.get(user_id)
+        if user is None:
+            user = await self.user_repository.get(user_id)
+            if user is not None and not persistent:
+                user = user_snapshots.put(user)
+
+        if user is None or (user.token_version or 0) != payload.get("ver", 0):
+            return None
         return user
 
-    async def create_new_user(self, user_data: UserPersonalInfo) -> User:
+    async def revoke_tokens(self, user: User) -> None:
+        """
+        Revoke every token issued to a user.
+
+        The version is incremented on the primary and committed before the
+        snapshot is invalidated, so a cache miss afterwards loads the new one.
+
+        Args:
+            user (User): The user whose tokens are revoked.
+        """
+        user_id = user.id
+        token_version = await self.user_repository.increment_token_version(user_id)
+        await self.session.commit()
+        set_committed_value(user, 'token_version', token_version)
+        user_snapshots.invalidate(user_id)
+
+    async def create_new_user(self, user_data: UserDataCreate) -> User:
         """
         Create a new user.
 
         Args:
-            user_data (UserPersonalInfo): The user data.
+            user_data (UserDataCreate): The user data.
 
         Raises:
             HTTPException: If the username already exists.
             HTTPException: If the email already exists.
+            HasherOverloadedError: If too many password hashing calls are pending.
 
         Returns:
             User: The created user.
         """
         self._validate_gender(user_data.gender)
 
-        user = User(**user_data.dict())
+        user = User(**user_data.dict(exclude={'password'}))
+        await user.set_password(user_data.password)
         try:
-            user = await self.user_repository(user)
+            await self.user_repository.add(user)
         except IntegrityError as e:
             exception_string = str(e)
             if 'username' in exception_string:
@@ -140,8 +209,10 @@ class UserService:
         for field, value in user_dict.items():
             setattr(user, field, value)
         
-        user = await self.user_repository.update(user)
+        await self.user_repository.update(user)
+        user_snapshots.invalidate(user.id)
         return user
 
     async def delete_user(self, user: User) -> None:
         await self.user_repository.delete(user)
+        user_snapshots.invalidate(user.id)
@@ -0,0 +1,114 @@
+"""
+Background job worker.
+
+Runs the jobs of the outbox, see `thunderbolt.core.jobs`, and applies the
+queued payment notifications, see `thunderbolt.core.payments.notifications`:
+
+    python -m thunderbolt.worker
+    python -m thunderbolt.worker --concurrency 4 --batch-size 100
+    python -m thunderbolt.worker --once
+    python -m thunderbolt.worker --requeue-dead
+    python -m thunderbolt.worker --purge-dead
+
+Every worker task claims its own batches, start as many processes and tasks
+as the jobs need. Each process also runs `settings.PAYMENT_NOTIFICATION_WORKERS`
+notification consumers. `--once` runs the due jobs and exits, e.g. from cron,
+without consuming notifications. `--requeue-dead` and `--purge-dead` retry or
+delete the jobs that ran out of attempts and exit.
+"""
+
+import os
+import sys
+import socket
+import asyncio
+import argparse
+import importlib
+import logging
+
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add the thunderbolt package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from thunderbolt.core.jobs import JOBS, purge_dead_jobs, requeue_dead_jobs, run_worker
+from thunderbolt.core.payments.notifications import close_notification_queue, get_notification_queue
+from thunderbolt.core.session import SessionLocal, get_engines
+from thunderbolt.core.settings import get_settings
+from thunderbolt.market.services import apply_payment_notifications
+
+
+settings = get_settings()
+
+# Modules registering jobs
+JOB_MODULES = (
+    'thunderbolt.forum.jobs',
+)
+
+
+async def run(concurrency: int, batch_size: Optional[int], once: bool) -> int:
+    notification_workers = [] if once else [
+        asyncio.create_task(apply_payment_notifications(
+            get_notification_queue(), SessionLocal, f'{socket.gethostname()}-{os.getpid()}-{i}',
+        ))
+        for i in range(settings.PAYMENT_NOTIFICATION_WORKERS)
+    ]
+    try:
+        counts = await asyncio.gather(*(
+            run_worker(SessionLocal, batch_size=batch_size, once=once)
+            for _ in range(concurrency)
+        ))
+        return sum(counts)
+    finally:
+        for worker in notification_workers:
+            worker.cancel()
+        await asyncio.gather(*notification_workers, return_exceptions=True)
+        await close_notification_queue()
+        for engine in get_engines():
+            await engine.dispose()
+
+
+async def manage_dead(action: Callable[[AsyncSession], Awaitable[int]]) -> int:
+    try:
+        async with SessionLocal() as session:
+            count = await action(session)
+            await session.commit()
+        return count
+    finally:
+        for engine in get_engines():
+            await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m thunderbolt.worker', description='Run background jobs.')
+    parser.add_argument('--concurrency', type=int, default=1, help='concurrent worker tasks')
+    parser.add_argument('--batch-size', type=int, default=None, help='jobs claimed per batch')
+    parser.add_argument('--once', action='store_true', help='run the due jobs and exit')
+    dead = parser.add_mutually_exclusive_group()
+    dead.add_argument('--requeue-dead', action='store_true', help='run the dead jobs again and exit')
+    dead.add_argument('--purge-dead', action='store_true', help='delete the dead jobs and exit')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if args.requeue_dead or args.purge_dead:
+        count = asyncio.run(manage_dead(requeue_dead_jobs if args.requeue_dead else purge_dead_jobs))
+        print(f'{"Requeued" if args.requeue_dead else "Purged"} {count} dead jobs', file=sys.stderr)
+        return 0
+
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+    print(f'Running jobs: {", ".join(sorted(JOBS))}', file=sys.stderr)
+
+    try:
+        count = asyncio.run(run(args.concurrency, args.batch_size, args.once))
+    except KeyboardInterrupt:
+        return 0
+    if args.once:
+        print(f'Ran {count} jobs', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())